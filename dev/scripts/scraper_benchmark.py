@@ -0,0 +1,287 @@
+"""
+Benchmarks the recipe import path against the stored HTML pages in tests/data/html: the full `RecipeScraper`,
+each parsing strategy on its own, and the cleaner functions, per page and in aggregate. Each stage is timed over
+a number of rounds and run once more under tracemalloc to record its peak memory.
+
+    # save a baseline before a change...
+    python dev/scripts/scraper_benchmark.py --save baseline.json
+    # ...and compare against it afterwards; exits with 1 if any stage got slower than the threshold
+    python dev/scripts/scraper_benchmark.py --compare baseline.json
+
+Timings are only comparable between runs on the same machine.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from mealie.core.settings.static import APP_VERSION
+from mealie.lang.providers import local_provider
+from mealie.services.scraper import cleaner, recipe_scraper
+from mealie.services.scraper.recipe_scraper import RecipeScraper
+from mealie.services.scraper.scraped_document import ScrapedDocument
+from mealie.services.scraper.scraper_strategies import (
+    ABCScraperStrategy,
+    RecipeScraperOpenGraph,
+    RecipeScraperPackage,
+)
+
+CORPUS_DIR = Path(__file__).parents[2] / "tests" / "data" / "html"
+
+STRATEGIES: list[type[ABCScraperStrategy]] = [RecipeScraperPackage, RecipeScraperOpenGraph]
+"""the strategies that parse the page locally; the OpenAI strategy is left out, since it calls an external API"""
+
+TIME_FIELDS = ["totalTime", "prepTime", "cookTime", "performTime"]
+
+MIN_REGRESSION_MS = 1.0
+"""differences smaller than this are treated as noise, however large they are relative to the baseline"""
+
+console = Console()
+
+
+@dataclass(slots=True)
+class StageResult:
+    median_ms: float
+    min_ms: float
+    peak_kib: float
+
+
+def measure(fn: Callable[[], Any], rounds: int) -> StageResult | None:
+    """Times `fn`, or returns `None` if it fails on this page"""
+    try:
+        fn()  # warm up lazy imports and caches, so they aren't counted against the first page
+    except Exception as e:
+        console.print(f"  [yellow]skipped: {e.__class__.__name__}: {e}[/yellow]")
+        return None
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # tracemalloc slows everything down, so memory is measured in a separate, untimed run
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return StageResult(
+        median_ms=round(statistics.median(timings), 3),
+        min_ms=round(min(timings), 3),
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def page_stages(url: str, html: str) -> dict[str, Callable[[], Any]]:
+    """The stages to benchmark for a page; cleaner stages are skipped when the page has nothing to clean"""
+    translator = local_provider()
+
+    def run_scraper():
+        return asyncio.run(RecipeScraper(translator).scrape(url, html))
+
+    def run_strategy(strategy: type[ABCScraperStrategy]):
+        # every strategy gets its own document, so each one pays for parsing the page like it would on its own
+        return lambda: asyncio.run(strategy(url, translator, raw_html=html).parse())
+
+    stages: dict[str, Callable[[], Any]] = {"scraper": run_scraper}
+    stages |= {f"strategy:{strategy.__name__}": run_strategy(strategy) for strategy in STRATEGIES}
+
+    parsed = asyncio.run(RecipeScraperPackage(url, translator, raw_html=html).parse())
+    if parsed and (recipe := parsed[0]) is not None:
+        stages["clean"] = lambda: cleaner.clean(recipe.model_copy(deep=True), translator)
+
+    # the cleaners are given what the recipe-scrapers strategy gives them: the scraper's own instructions
+    # and the durations from the page's schema
+    try:
+        scraper = ScrapedDocument(url, html).recipe_scraper()
+        instructions = scraper.instructions()
+        schema: dict[str, Any] = scraper.schema.data or {}
+    except Exception:
+        instructions, schema = None, {}
+
+    if instructions:
+        stages["clean_instructions"] = lambda: cleaner.clean_instructions(instructions)
+
+    if times := [schema[field] for field in TIME_FIELDS if schema.get(field)]:
+        stages["clean_time"] = lambda: [cleaner.clean_time(value, translator) for value in times]
+
+    return stages
+
+
+def aggregate(pages: dict[str, dict[str, StageResult]]) -> dict[str, dict[str, float]]:
+    stages: dict[str, list[StageResult]] = {}
+    for results in pages.values():
+        for stage, result in results.items():
+            stages.setdefault(stage, []).append(result)
+
+    summary = {}
+    for stage, results in stages.items():
+        total_ms = sum(result.median_ms for result in results)
+        summary[stage] = {
+            "pages": len(results),
+            "total_median_ms": round(total_ms, 3),
+            "pages_per_second": round(len(results) / (total_ms / 1000), 2) if total_ms else 0,
+            "max_peak_kib": max(result.peak_kib for result in results),
+        }
+
+    return summary
+
+
+def run(corpus: Path, rounds: int, pattern: str) -> dict[str, Any]:
+    # parse in this process, so the timings measure parsing and cleaning rather than handing pages to a pool
+    recipe_scraper.get_scraper_pool = lambda: None
+    # pages that don't parse with every strategy log errors, and printing them would skew the timings
+    logging.disable(logging.CRITICAL)
+
+    pages: dict[str, dict[str, StageResult]] = {}
+    for path in sorted(corpus.glob(pattern)):
+        url = f"https://example.com/{path.stem}"
+        html = path.read_text(encoding="utf-8")
+
+        console.print(f"benchmarking [cyan]{path.name}[/cyan]")
+        results = {stage: measure(fn, rounds) for stage, fn in page_stages(url, html).items()}
+        pages[path.name] = {stage: result for stage, result in results.items() if result is not None}
+
+    return {
+        "meta": {
+            "mealie_version": APP_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rounds": rounds,
+            "date": datetime.now(UTC).isoformat(),
+        },
+        "pages": {
+            page: {stage: asdict(result) for stage, result in results.items()} for page, results in pages.items()
+        },
+        "aggregate": aggregate(pages),
+    }
+
+
+def print_results(results: dict[str, Any]) -> None:
+    pages = Table(title="Per page")
+    pages.add_column("Page", style="cyan")
+    pages.add_column("Stage")
+    pages.add_column("Median (ms)", justify="right", style="magenta")
+    pages.add_column("Min (ms)", justify="right")
+    pages.add_column("Peak (KiB)", justify="right")
+
+    for page, page_results in results["pages"].items():
+        for i, (stage, result) in enumerate(page_results.items()):
+            pages.add_row(
+                page if i == 0 else "",
+                stage,
+                f"{result['median_ms']:.2f}",
+                f"{result['min_ms']:.2f}",
+                f"{result['peak_kib']:.0f}",
+            )
+
+        pages.add_section()
+
+    summary = Table(title="Aggregate")
+    summary.add_column("Stage", style="cyan")
+    summary.add_column("Pages", justify="right")
+    summary.add_column("Total (ms)", justify="right", style="magenta")
+    summary.add_column("Pages/s", justify="right", style="green")
+    summary.add_column("Max peak (KiB)", justify="right")
+
+    for stage, result in results["aggregate"].items():
+        summary.add_row(
+            stage,
+            str(result["pages"]),
+            f"{result['total_median_ms']:.1f}",
+            f"{result['pages_per_second']:.1f}",
+            f"{result['max_peak_kib']:.0f}",
+        )
+
+    console.print(pages)
+    console.print(summary)
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Prints how each stage changed from the baseline, and returns the stages that regressed"""
+    table = Table(title=f"Compared to baseline from {baseline['meta']['date']}")
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    table.add_column("Baseline (ms)", justify="right")
+    table.add_column("Current (ms)", justify="right")
+    table.add_column("Change", justify="right")
+
+    def check(name: str, before: float, after: float) -> bool:
+        change = (after - before) / before if before else 0
+        regressed = change > threshold and after - before > MIN_REGRESSION_MS
+        style = "red" if regressed else "green" if change < -threshold else ""
+        table.add_row(
+            name, f"{before:.1f}", f"{after:.1f}", f"[{style}]{change:+.0%}[/{style}]" if style else f"{change:+.0%}"
+        )
+        return regressed
+
+    # totals only include the pages that were benchmarked both times, so a different --pattern still compares
+    totals: dict[str, list[float]] = {}
+    for page, page_results in results["pages"].items():
+        for stage, result in page_results.items():
+            if before := baseline["pages"].get(page, {}).get(stage):
+                total = totals.setdefault(stage, [0.0, 0.0])
+                total[0] += before["median_ms"]
+                total[1] += result["median_ms"]
+
+    regressions = []
+    for stage, (before_ms, after_ms) in totals.items():
+        if check(f"{stage} (all pages)", before_ms, after_ms):
+            regressions.append(f"{stage} (all pages)")
+
+    for page, page_results in results["pages"].items():
+        for stage, result in page_results.items():
+            before = baseline["pages"].get(page, {}).get(stage)
+            if before and check(f"{stage} ({page})", before["median_ms"], result["median_ms"]):
+                regressions.append(f"{stage} ({page})")
+
+    console.print(table)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR, help="directory of recipe pages to benchmark")
+    parser.add_argument("--pattern", default="*.html", help="glob of the pages to benchmark within the corpus")
+    parser.add_argument("--rounds", type=int, default=5, help="number of timed runs of each stage")
+    parser.add_argument("--save", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="compare the results to a JSON file written with --save")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="relative slowdown reported as a regression (default: 0.2)"
+    )
+    args = parser.parse_args()
+
+    results = run(args.corpus, max(1, args.rounds), args.pattern)
+    print_results(results)
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+        console.print(f"saved results to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            console.print(f"[red]{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}[/red]")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 import { useOnline, useIdle } from "@vueuse/core";
-import type { ShoppingListOut } from "~/lib/api/types/household";
+import type { ShoppingListChange, ShoppingListItemOut, ShoppingListOut } from "~/lib/api/types/household";
 import { useShoppingListItemActions } from "~/composables/use-shopping-list-item-actions";
 
 /**
@@ -61,6 +61,20 @@ export function useShoppingListData(listId: string, shoppingList: Ref<ShoppingLi
       return;
     }
 
+    // while the change feed is connected it keeps the list up to date, so we only refresh occasionally
+    // or when the feed couldn't apply a change itself
+    const frequency = feedComplete ? feedFallbackFrequency : pollFrequency;
+    if (feedConnected && !refreshNeeded && Date.now() - lastRefresh < frequency) {
+      return;
+    }
+
+    await refreshNow(updateListItemOrder);
+  }
+
+  async function refreshNow(updateListItemOrder: () => void) {
+    lastRefresh = Date.now();
+    refreshNeeded = false;
+
     try {
       await refresh(updateListItemOrder);
 
@@ -92,8 +106,105 @@ export function useShoppingListData(listId: string, shoppingList: Ref<ShoppingLi
   let attempts = 0;
   let pollTimer: ReturnType<typeof setInterval>;
 
+  // when subscribed to the list's change feed, fall back to polling only occasionally; with several
+  // server workers the feed only carries changes made through ours, so we keep polling as often as before
+  const feedFallbackFrequency = 60000;
+  let feedComplete = false;
+  let feedConnected = false;
+  let hasConnected = false;
+  let refreshNeeded = false;
+  let lastRefresh = 0;
+  let feed: EventSource | null = null;
+
+  function isNewer(item: ShoppingListItemOut, existing: ShoppingListItemOut) {
+    if (!item.updatedAt || !existing.updatedAt) {
+      return true;
+    }
+
+    return new Date(item.updatedAt) >= new Date(existing.updatedAt);
+  }
+
+  /**
+   * Applies the items pushed by the change feed to the loaded list, without reloading it.
+   * Returns false if the change can't be applied, and the list needs to be reloaded instead.
+   */
+  function applyChange(change: ShoppingListChange) {
+    if (!shoppingList.value || !change.items?.length) {
+      // list-level changes (e.g. recipes or label settings) don't include what changed
+      return false;
+    }
+
+    const items = [...(shoppingList.value.listItems || [])];
+    for (const item of change.items) {
+      const index = items.findIndex(existing => existing.id === item.id);
+
+      // items moved to another list are sent as updates, so they're removed like deleted ones
+      if (change.type === "deleted" || item.shoppingListId !== listId) {
+        if (index !== -1) {
+          items.splice(index, 1);
+        }
+      }
+      else if (index === -1) {
+        items.push(item);
+      }
+      else if (isNewer(item, items[index])) {
+        items[index] = item;
+      }
+    }
+
+    shoppingList.value.listItems = items;
+    return true;
+  }
+
+  function subscribeToChanges(updateListItemOrder: () => void) {
+    if (typeof EventSource === "undefined") {
+      return;
+    }
+
+    feed = new EventSource(`/api/households/shopping/lists/${listId}/feed`, { withCredentials: true });
+    const reload = () => {
+      if (loadingCounter.value) {
+        // we're busy, so let the next poll reload the list
+        refreshNeeded = true;
+        return;
+      }
+
+      refreshNow(updateListItemOrder);
+    };
+
+    feed.addEventListener("ready", (event: MessageEvent) => {
+      feedConnected = true;
+      feedComplete = JSON.parse(event.data).complete === true;
+
+      // the list is loaded when the page opens, so only catch up on changes missed while reconnecting
+      if (hasConnected) {
+        reload();
+      }
+      hasConnected = true;
+    });
+
+    feed.addEventListener("change", (event: MessageEvent) => {
+      // changes are applied as they arrive, including the ones this client made
+      if (!applyChange(JSON.parse(event.data) as ShoppingListChange)) {
+        reload();
+        return;
+      }
+
+      updateListItemOrder();
+    });
+
+    // we fell behind and missed changes, so the whole list has to be reloaded
+    feed.addEventListener("reset", reload);
+
+    // the browser reconnects on its own; until it does, polling takes over
+    feed.onerror = () => {
+      feedConnected = false;
+    };
+  }
+
   function startPolling(updateListItemOrder: () => void) {
     pollForChanges(updateListItemOrder); // populate initial list
+    subscribeToChanges(updateListItemOrder);
 
     pollTimer = setInterval(() => {
       pollForChanges(updateListItemOrder);
@@ -104,6 +215,14 @@ export function useShoppingListData(listId: string, shoppingList: Ref<ShoppingLi
     if (pollTimer) {
       clearInterval(pollTimer);
     }
+
+    if (feed) {
+      feed.close();
+      feed = null;
+      feedConnected = false;
+      hasConnected = false;
+      feedComplete = false;
+    }
   }
 
   return {
@@ -0,0 +1,19 @@
+import { BaseAPI } from "../base/base-clients";
+import type { ScheduledJobOut, ScheduledJobRunOut } from "~/lib/api/types/admin";
+
+const prefix = "/api";
+
+const routes = {
+  jobs: `${prefix}/admin/scheduler/jobs`,
+  jobRuns: (name: string) => `${prefix}/admin/scheduler/jobs/${name}/runs`,
+};
+
+export class AdminSchedulerApi extends BaseAPI {
+  async getJobs() {
+    return await this.requests.get<ScheduledJobOut[]>(routes.jobs);
+  }
+
+  async getJobRuns(name: string) {
+    return await this.requests.get<ScheduledJobRunOut[]>(routes.jobRuns(name));
+  }
+}
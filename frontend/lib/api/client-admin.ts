@@ -4,6 +4,7 @@ import { AdminHouseholdsApi } from "./admin/admin-households";
 import { AdminGroupsApi } from "./admin/admin-groups";
 import { AdminBackupsApi } from "./admin/admin-backups";
 import { AdminMaintenanceApi } from "./admin/admin-maintenance";
+import { AdminSchedulerApi } from "./admin/admin-scheduler";
 import { AdminAnalyticsApi } from "./admin/admin-analytics";
 import { AdminDebugAPI } from "./admin/admin-debug";
 import type { ApiRequestInstance } from "~/lib/api/types/non-generated";
@@ -15,6 +16,7 @@ export class AdminAPI {
   public groups: AdminGroupsApi;
   public backups: AdminBackupsApi;
   public maintenance: AdminMaintenanceApi;
+  public scheduler: AdminSchedulerApi;
   public analytics: AdminAnalyticsApi;
   public debug: AdminDebugAPI;
 
@@ -25,6 +27,7 @@ export class AdminAPI {
     this.groups = new AdminGroupsApi(requests);
     this.backups = new AdminBackupsApi(requests);
     this.maintenance = new AdminMaintenanceApi(requests);
+    this.scheduler = new AdminSchedulerApi(requests);
     this.analytics = new AdminAnalyticsApi(requests);
     this.debug = new AdminDebugAPI(requests);
 
@@ -5,6 +5,8 @@
 /* Do not modify it by hand - just update the pydantic models and then re-run the script
 */
 
+export type ScheduledJobStatus = "success" | "failed";
+
 export interface AdminAboutInfo {
   production: boolean;
   version: string;
@@ -259,6 +261,30 @@ export interface RecipeImport {
   exception?: string | null;
   slug?: string | null;
 }
+export interface ScheduledJobOut {
+  name: string;
+  schedule: string;
+  running?: boolean;
+  lockedBy?: string | null;
+  lastStartedAt?: string | null;
+  lastFinishedAt?: string | null;
+  lastDurationMs?: number | null;
+  lastStatus?: ScheduledJobStatus | null;
+  lastError?: string | null;
+  runCount?: number;
+  failureCount?: number;
+  averageDurationMs?: number | null;
+  maxDurationMs?: number | null;
+}
+export interface ScheduledJobRunOut {
+  jobName: string;
+  worker: string;
+  startedAt: string;
+  finishedAt: string;
+  durationMs: number;
+  status: ScheduledJobStatus;
+  error?: string | null;
+}
 export interface SettingsImport {
   name: string;
   status: boolean;
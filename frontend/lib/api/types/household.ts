@@ -6,6 +6,7 @@
 */
 
 export type GroupRecipeActionType = "link" | "post";
+export type ShoppingListChangeType = "created" | "updated" | "deleted";
 export type WebhookType = "mealplan";
 
 export interface CreateGroupRecipeAction {
@@ -525,6 +526,18 @@ export interface ShoppingListAddRecipeParamsBulk {
   recipeIngredients?: RecipeIngredient[] | null;
   recipeId: string;
 }
+export interface ShoppingListChange {
+  shoppingListId: string;
+  type: ShoppingListChangeType;
+  items?: ShoppingListItemOut[];
+}
+export interface ShoppingListChangesOut {
+  version: number;
+  reset?: boolean;
+  shoppingList: ShoppingListSummary;
+  items?: ShoppingListItemOut[];
+  deletedItemIds?: string[];
+}
 export interface ShoppingListCreate {
   name?: string | null;
   extras?: {
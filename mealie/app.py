@@ -21,9 +21,12 @@ from mealie.core.config import get_app_settings
 from mealie.core.root_logger import get_logger
 from mealie.core.settings.static import APP_VERSION
 from mealie.routes import router, spa, utility_routes
-from mealie.routes.handlers import register_debug_handler
+from mealie.routes.handlers import register_busy_handler, register_debug_handler
 from mealie.routes.media import media_router
+from mealie.services.event_bus_service.event_outbox import get_event_outbox_worker
+from mealie.services.recipe.image_processor import get_image_processor
 from mealie.services.scheduler import SchedulerRegistry, SchedulerService, tasks
+from mealie.services.scraper.scraper_pool import get_scraper_pool
 
 settings = get_app_settings()
 
@@ -66,6 +69,7 @@ async def lifespan_fn(_: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("end: database initialization")
 
     await start_scheduler()
+    get_event_outbox_worker().start()
 
     logger.info("-----SYSTEM STARTUP-----")
     logger.info("------APP SETTINGS------")
@@ -93,6 +97,13 @@ async def lifespan_fn(_: FastAPI) -> AsyncGenerator[None, None]:
 
     yield
 
+    get_event_outbox_worker().stop()
+    if scraper_pool := get_scraper_pool():
+        scraper_pool.shutdown()
+
+    if image_processor := get_image_processor():
+        image_processor.shutdown()
+
     logger.info("-----SYSTEM SHUTDOWN----- \n")
 
 
@@ -119,6 +130,7 @@ if not settings.PRODUCTION:
         allow_headers=["*"],
     )
 
+register_busy_handler(app)
 register_debug_handler(app)
 
 
@@ -130,6 +142,8 @@ async def start_scheduler():
         tasks.purge_group_data_exports,
         tasks.create_mealplan_timeline_events,
         tasks.delete_old_checked_list_items,
+        tasks.purge_event_outbox,
+        tasks.purge_shopping_list_tombstones,
     )
 
     SchedulerRegistry.register_minutely(
@@ -140,6 +154,11 @@ async def start_scheduler():
         tasks.locked_user_reset,
     )
 
+    if settings.RECIPE_REFRESH_ENABLED:
+        SchedulerRegistry.register_hourly(
+            tasks.refresh_imported_recipes,
+        )
+
     SchedulerRegistry.print_jobs()
 
     await SchedulerService.start()
@@ -0,0 +1,23 @@
+from functools import lru_cache
+
+from mealie.core.config import get_app_dirs, get_app_settings
+from mealie.pkgs.cache import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+
+
+@lru_cache
+def get_cache(namespace: str, max_entries: int = 500, default_timeout: float = 300) -> CacheBackend:
+    """
+    Returns the shared cache for a namespace, backed by the store configured with `CACHE_BACKEND`.
+    Repeated calls with the same arguments return the same instance.
+    """
+    settings = get_app_settings()
+
+    if settings.CACHE_BACKEND_TYPE == "sqlite":
+        return SQLiteCacheBackend(
+            get_app_dirs().CACHE_DIR / "cache.db",
+            namespace=namespace,
+            max_entries=max_entries,
+            default_timeout=default_timeout,
+        )
+
+    return MemoryCacheBackend(max_entries=max_entries, default_timeout=default_timeout)
@@ -14,6 +14,7 @@ from sqlalchemy.orm.session import Session
 
 from mealie.core import root_logger
 from mealie.core.config import get_app_dirs, get_app_settings
+from mealie.core.security.token_cache import get_token_cache
 from mealie.db.db_setup import generate_session
 from mealie.repos.all_repositories import get_repositories
 from mealie.schema.user import PrivateUser, TokenData
@@ -139,15 +140,23 @@ async def get_admin_user(current_user: PrivateUser = Depends(get_current_user))
 
 
 def validate_long_live_token(session: Session, client_token: str, user_id: str) -> PrivateUser:
+    token_cache = get_token_cache()
+    if cached_user := token_cache.get(client_token):
+        if str(cached_user.id) == str(user_id):
+            return cached_user
+
     repos = get_repositories(session, group_id=None, household_id=None)
 
     token = repos.api_tokens.multi_query({"token": client_token, "user_id": user_id})
 
     try:
-        return token[0].user
+        user = token[0].user
     except IndexError as e:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED) from e
 
+    token_cache.set(client_token, user)
+    return user
+
 
 def validate_file_token(token: str | None = None) -> Path:
     """
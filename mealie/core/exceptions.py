@@ -62,4 +62,12 @@ def mealie_registered_exceptions(t: Translator) -> dict:
 class UserLockedOut(Exception): ...
 
 
+class PasswordHasherBusy(Exception):
+    """
+    This exception is raised when the password hashing pool is saturated and cannot accept more work.
+    """
+
+    pass
+
+
 class MissingClaimException(Exception): ...
@@ -1,9 +1,22 @@
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from typing import Protocol
 
 import bcrypt
 
 from mealie.core.config import get_app_settings
+from mealie.core.exceptions import PasswordHasherBusy
+from mealie.schema.admin.about import HasherStatistics
+
+MAX_BLOCKED_REQUESTS = 10
+"""
+A hash blocks the request thread that asked for it, and sync routes share AnyIO's 40 threads, so at most
+this many requests are let into the pool, however large SECURITY_HASHER_MAX_QUEUE is
+"""
 
 
 class Hasher(Protocol):
@@ -12,6 +25,71 @@ class Hasher(Protocol):
     def verify(self, password: str, hashed: str) -> bool: ...
 
 
+class HasherPool:
+    """
+    A bounded worker pool for password hashing. bcrypt releases the GIL while it works, so a small
+    dedicated thread pool keeps expensive hashes off the shared request threadpool. When every worker
+    is busy and `max_queue` calls are already waiting, new calls are rejected immediately with
+    `PasswordHasherBusy` rather than queueing behind a burst of logins.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hasher")
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_duration = 0.0
+
+    def run[T](self, fn: Callable[..., T], *args) -> T:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy()
+
+        with self._lock:
+            self._in_flight += 1
+
+        submitted_at = time.perf_counter()
+
+        def _timed() -> T:
+            started_at = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._completed += 1
+                    self._total_wait += started_at - submitted_at
+                    self._total_duration += finished_at - started_at
+
+        try:
+            return self._executor.submit(_timed).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def statistics(self) -> HasherStatistics:
+        with self._lock:
+            completed = self._completed
+            return HasherStatistics(
+                workers=self.workers,
+                max_queue=self.max_queue,
+                in_flight=self._in_flight,
+                completed=completed,
+                rejected=self._rejected,
+                average_wait_ms=(self._total_wait / completed * 1000) if completed else 0,
+                average_duration_ms=(self._total_duration / completed * 1000) if completed else 0,
+            )
+
+
 class FakeHasher:
     def hash(self, password: str) -> str:
         return password
@@ -24,16 +102,31 @@ class BcryptHasher:
     def _get_password_bytes(self, password: str) -> bytes:
         return password.encode("utf-8")[:72]
 
-    def hash(self, password: str) -> str:
+    def _hash(self, password: str) -> str:
         password_bytes = self._get_password_bytes(password)
         hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
         return hashed.decode("utf-8")
 
-    def verify(self, password: str, hashed: str) -> bool:
+    def _verify(self, password: str, hashed: str) -> bool:
         password_bytes = self._get_password_bytes(password)
         hashed_bytes = hashed.encode("utf-8")
         return bcrypt.checkpw(password_bytes, hashed_bytes)
 
+    def hash(self, password: str) -> str:
+        return get_hasher_pool().run(self._hash, password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return get_hasher_pool().run(self._verify, password, hashed)
+
+
+@lru_cache(maxsize=1)
+def get_hasher_pool() -> HasherPool:
+    settings = get_app_settings()
+
+    workers = min(settings.SECURITY_HASHER_WORKERS or min(4, os.cpu_count() or 1), MAX_BLOCKED_REQUESTS)
+    max_queue = min(settings.SECURITY_HASHER_MAX_QUEUE, MAX_BLOCKED_REQUESTS - workers)
+    return HasherPool(workers, max_queue)
+
 
 @lru_cache(maxsize=1)
 def get_hasher() -> Hasher:
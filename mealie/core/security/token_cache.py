@@ -0,0 +1,83 @@
+import hashlib
+from functools import lru_cache
+from uuid import uuid4
+
+from pydantic import UUID4
+
+from mealie.core.cache import get_cache
+from mealie.core.config import get_app_settings
+from mealie.pkgs.cache import CacheBackend
+from mealie.schema.user.user import PrivateUser
+
+
+class LongLiveTokenCache:
+    """
+    Cache of validated long-lived API tokens. Tokens are stored as a SHA-256 digest so the raw token
+    is never kept longer than the request that carries it.
+
+    Each user has a generation marker stored alongside their tokens; invalidating a user replaces the
+    marker, which orphans every cached token for that user without having to enumerate them. This keeps
+    invalidation O(1) and lets it work with any cache backend, including ones shared between workers.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend.default_timeout > 0 and self.backend.max_entries > 0
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return "token:" + hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _user_key(user_id: UUID4 | str) -> str:
+        return f"user:{user_id}"
+
+    def get(self, token: str) -> PrivateUser | None:
+        if not self.enabled:
+            return None
+
+        entry: tuple[str, PrivateUser] | None = self.backend.get(self._token_key(token))
+        if entry is None:
+            return None
+
+        generation, user = entry
+        if generation != self.backend.get(self._user_key(user.id)):
+            return None
+
+        # callers are free to mutate the user they receive, so never hand out the cached instance
+        return user.model_copy(deep=True)
+
+    def set(self, token: str, user: PrivateUser) -> None:
+        if not self.enabled:
+            return
+
+        # the marker is re-set so it never expires before the entries that depend on it
+        user_key = self._user_key(user.id)
+        generation = self.backend.get(user_key) or uuid4().hex
+        self.backend.set(user_key, generation)
+
+        self.backend.set(self._token_key(token), (generation, user.model_copy(deep=True)))
+
+    def invalidate_token(self, token: str) -> None:
+        self.backend.delete(self._token_key(token))
+
+    def invalidate_user(self, user_id: UUID4 | str) -> None:
+        self.backend.delete(self._user_key(user_id))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+@lru_cache(maxsize=1)
+def get_token_cache() -> LongLiveTokenCache:
+    settings = get_app_settings()
+    return LongLiveTokenCache(
+        get_cache(
+            "api_tokens",
+            max_entries=settings.SECURITY_API_TOKEN_CACHE_SIZE,
+            default_timeout=settings.SECURITY_API_TOKEN_CACHE_TTL,
+        )
+    )
@@ -142,6 +142,9 @@ class AppSettings(AppLoggingSettings):
     DAILY_SCHEDULE_TIME: str = "23:45"
     """Local server time, in HH:MM format. See `DAILY_SCHEDULE_TIME_UTC` for the parsed UTC equivalent"""
 
+    SCHEDULER_MAX_CONCURRENT_JOBS: int = 4
+    """Maximum number of scheduled jobs run at the same time by a Mealie worker"""
+
     @property
     def logger(self) -> logging.Logger:
         # Avoid a circular import by importing here instead of at the file's top-level.
@@ -182,6 +185,23 @@ class AppSettings(AppLoggingSettings):
     SECURITY_USER_LOCKOUT_TIME: int = 24
     "time in hours"
 
+    SECURITY_API_TOKEN_CACHE_TTL: int = 60
+    """
+    time in seconds that a validated API token is trusted without re-checking the database.
+    With the in-memory cache backend this also bounds how long a revoked token remains usable on other workers.
+    Set to 0 to disable
+    """
+    SECURITY_API_TOKEN_CACHE_SIZE: int = 1000
+    """maximum number of API tokens kept in the validation cache"""
+
+    SECURITY_HASHER_WORKERS: int = 0
+    """number of threads dedicated to password hashing. Set to 0 to use up to 4, based on available CPUs"""
+    SECURITY_HASHER_MAX_QUEUE: int = 4
+    """
+    number of password hashing requests allowed to wait for a free worker, up to 10 including the workers.
+    Requests beyond this limit are rejected with a 503 instead of tying up the API
+    """
+
     @field_validator("BASE_URL")
     @classmethod
     def remove_trailing_slash(cls, v: str) -> str:
@@ -449,6 +469,132 @@ class AppSettings(AppLoggingSettings):
     def WORKERS(self) -> int:
         return max(1, self.WORKER_PER_CORE * self.UVICORN_WORKERS)
 
+    # ===============================================
+    # Caching
+
+    CACHE_BACKEND: str | None = None  # Options: 'memory', 'sqlite'
+    """
+    Where shared caches (OIDC state, API tokens) are stored. 'sqlite' keeps them in a file in the data directory
+    so every worker sees the same entries. Defaults to 'sqlite' when running more than one worker, otherwise 'memory'
+    """
+
+    @property
+    def CACHE_BACKEND_TYPE(self) -> str:
+        if self.CACHE_BACKEND:
+            return self.CACHE_BACKEND.lower()
+
+        return "sqlite" if self.WORKERS > 1 else "memory"
+
+    # ===============================================
+    # Event Delivery
+
+    EVENT_OUTBOX_WORKERS: int = 4
+    """Maximum number of notifications and webhooks delivered concurrently, per Mealie worker"""
+
+    EVENT_OUTBOX_BATCH_SIZE: int = 50
+    """Maximum number of pending deliveries claimed from the outbox at once"""
+
+    EVENT_OUTBOX_POLL_INTERVAL: float = 5
+    """Seconds between outbox polls when no new events are published by this worker"""
+
+    EVENT_OUTBOX_MAX_ATTEMPTS: int = 8
+    """Number of failed delivery attempts before an event is moved to the dead-letter state"""
+
+    EVENT_OUTBOX_RETRY_DELAY: int = 30
+    """Seconds to wait after the first failed delivery; each following retry waits twice as long, up to an hour"""
+
+    EVENT_OUTBOX_MAX_PER_DESTINATION: int = 2
+    """Maximum number of concurrent deliveries to a single host, per Mealie worker"""
+
+    # ===============================================
+    # Recipe Scraping
+
+    SCRAPER_MAX_CONCURRENCY: int = 10
+    """Maximum number of recipe URLs fetched at once during a bulk import"""
+
+    SCRAPER_MAX_PER_DOMAIN: int = 2
+    """Maximum number of recipe URLs fetched at once from a single site during a bulk import"""
+
+    SCRAPER_DOMAIN_DELAY: float = 1
+    """Minimum number of seconds between the start of two requests to the same site during a bulk import"""
+
+    SCRAPER_CACHE_TTL: int = 86400
+    """
+    Seconds a fetched recipe page is reused without contacting the site. Older pages are revalidated with the
+    site using their ETag or Last-Modified header. Set to 0 to disable the cache
+    """
+
+    SCRAPER_CACHE_MAX_SIZE: int = 100
+    """Maximum size of the fetched recipe page cache, in megabytes"""
+
+    SCRAPER_MAX_PAGE_SIZE: int = 10
+    """Maximum size of a recipe page, in megabytes; only the start of larger pages is scraped"""
+
+    SCRAPER_STOP_AT_RECIPE: bool = True
+    """
+    Stop downloading a page once it has sent a complete JSON-LD recipe, instead of downloading the whole page.
+    The rest of the page is only downloaded if the recipe has to be scraped some other way
+    """
+
+    SCRAPER_USER_AGENT_TTL: int = 604800
+    """
+    Seconds to remember which user agent each site accepted or rejected, so later requests to the site start with
+    one that works. Set to 0 to try every user agent in order each time
+    """
+
+    SCRAPER_WORKERS: int = 0
+    """Number of processes dedicated to parsing recipe pages. Set to 0 to use up to 4, based on available CPUs"""
+
+    SCRAPER_PARSE_TIMEOUT: float = 30
+    """Maximum number of seconds spent parsing a single recipe page before it's abandoned. Set to 0 to disable"""
+
+    RECIPE_REFRESH_ENABLED: bool = False
+    """
+    Periodically check the source of each imported recipe, and update recipes whose source changed
+    and that haven't been edited since they were imported
+    """
+
+    RECIPE_REFRESH_INTERVAL: int = 7
+    """Days between checks of the same recipe's source"""
+
+    RECIPE_REFRESH_BATCH_SIZE: int = 200
+    """Maximum number of recipes checked each hour"""
+
+    # ===============================================
+    # Image Processing
+
+    IMAGE_PROCESSING_WORKERS: int = 0
+    """Number of processes dedicated to converting uploaded images. Set to 0 to use up to 2, based on available CPUs"""
+
+    IMAGE_PROCESSING_QUEUE_SIZE: int = 16
+    """Maximum number of uploaded images waiting to be converted; further uploads are converted as they're uploaded"""
+
+    # ===============================================
+    # Media
+
+    MEDIA_SENDFILE: str | None = None  # Options: 'x-accel-redirect', 'x-sendfile'
+    """Let a fronting web server send recipe images and assets, using nginx's X-Accel-Redirect or X-Sendfile"""
+
+    MEDIA_SENDFILE_PREFIX: str = "/_mealie_data"
+    """The internal web server location that serves the data directory, used with X-Accel-Redirect"""
+
+    @field_validator("MEDIA_SENDFILE")
+    @classmethod
+    def validate_media_sendfile(cls, v: str | None) -> str | None:
+        if not v:
+            return None
+
+        v = v.lower()
+        if v not in {"x-accel-redirect", "x-sendfile"}:
+            raise ValueError("MEDIA_SENDFILE must be 'x-accel-redirect' or 'x-sendfile'")
+
+        return v
+
+    @field_validator("MEDIA_SENDFILE_PREFIX")
+    @classmethod
+    def remove_media_prefix_trailing_slash(cls, v: str) -> str:
+        return v.rstrip("/")
+
     model_config = SettingsConfigDict(arbitrary_types_allowed=True, extra="allow", env_nested_delimiter="__")
 
     # ===============================================
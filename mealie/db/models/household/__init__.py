@@ -1,5 +1,5 @@
 from .cookbook import CookBook
-from .events import GroupEventNotifierModel, GroupEventNotifierOptionsModel
+from .events import EventOutboxModel, GroupEventNotifierModel, GroupEventNotifierOptionsModel
 from .household import Household
 from .household_to_recipe import HouseholdToRecipe
 from .invite_tokens import GroupInviteToken
@@ -11,6 +11,7 @@ from .shopping_list import (
     ShoppingListExtras,
     ShoppingListItem,
     ShoppingListItemRecipeReference,
+    ShoppingListItemTombstone,
     ShoppingListMultiPurposeLabel,
     ShoppingListRecipeReference,
 )
@@ -18,6 +19,7 @@ from .webhooks import GroupWebhooksModel
 
 __all__ = [
     "CookBook",
+    "EventOutboxModel",
     "GroupEventNotifierModel",
     "GroupEventNotifierOptionsModel",
     "GroupInviteToken",
@@ -31,6 +33,7 @@ __all__ = [
     "ShoppingListExtras",
     "ShoppingListItem",
     "ShoppingListItemRecipeReference",
+    "ShoppingListItemTombstone",
     "ShoppingListMultiPurposeLabel",
     "ShoppingListRecipeReference",
     "GroupWebhooksModel",
@@ -1,10 +1,12 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, ForeignKey, String, orm
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, orm
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .._model_base import BaseMixins, SqlAlchemyBase
 from .._model_utils.auto_init import auto_init
+from .._model_utils.datetime import NaiveDateTime, get_utc_now
 from .._model_utils.guid import GUID
 
 if TYPE_CHECKING:
@@ -79,3 +81,36 @@ class GroupEventNotifierModel(SqlAlchemyBase, BaseMixins):
     @auto_init()
     def __init__(self, **_) -> None:
         pass
+
+
+class EventOutboxModel(SqlAlchemyBase):
+    """
+    A single pending delivery of an event to one destination (an Apprise URL or a webhook URL).
+
+    Rows are written alongside the change that triggered the event and drained by the event outbox
+    worker, which leases rows through `locked_by`/`locked_until` so several processes can share the table.
+    The group and household ids are intentionally not foreign keys so pending deliveries never block
+    deleting a group or household.
+    """
+
+    __tablename__ = "event_outbox"
+    __table_args__ = (Index("ix_event_outbox_status_next_attempt_at", "status", "next_attempt_at"),)
+
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+    group_id: Mapped[GUID] = mapped_column(GUID, nullable=False, index=True)
+    household_id: Mapped[GUID | None] = mapped_column(GUID, index=True)
+
+    event_id: Mapped[GUID] = mapped_column(GUID, nullable=False)
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    destination_type: Mapped[str] = mapped_column(String, nullable=False)
+    destination: Mapped[str] = mapped_column(String, nullable=False)
+    destination_key: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[str] = mapped_column(String, nullable=False)
+
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(NaiveDateTime, nullable=False, default=get_utc_now)
+    locked_until: Mapped[datetime | None] = mapped_column(NaiveDateTime)
+    locked_by: Mapped[str | None] = mapped_column(String)
+    delivered_at: Mapped[datetime | None] = mapped_column(NaiveDateTime)
+    last_error: Mapped[str | None] = mapped_column(String)
@@ -1,9 +1,22 @@
-from contextvars import ContextVar
+from collections import defaultdict
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Optional
 
 from pydantic import ConfigDict
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String, UniqueConstraint, event, orm
+from sqlalchemy import (
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+    insert,
+    inspect,
+    orm,
+    update,
+)
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.ext.orderinglist import ordering_list
 from sqlalchemy.orm import Mapped, mapped_column
@@ -13,6 +26,7 @@ from mealie.db.models.recipe.api_extras import ShoppingListExtras, ShoppingListI
 
 from .._model_base import BaseMixins, SqlAlchemyBase
 from .._model_utils.auto_init import auto_init
+from .._model_utils.datetime import NaiveDateTime
 from .._model_utils.guid import GUID
 from ..recipe.ingredient import IngredientFoodModel, IngredientUnitModel
 
@@ -48,6 +62,7 @@ class ShoppingListItemRecipeReference(BaseMixins, SqlAlchemyBase):
 
 class ShoppingListItem(SqlAlchemyBase, BaseMixins):
     __tablename__ = "shopping_list_items"
+    __table_args__ = (Index("ix_shopping_list_items_shopping_list_id_version", "shopping_list_id", "version"),)
 
     # Id's
     id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
@@ -65,6 +80,9 @@ class ShoppingListItem(SqlAlchemyBase, BaseMixins):
     quantity: Mapped[float | None] = mapped_column(Float, default=1)
     note: Mapped[str | None] = mapped_column(String)
 
+    # the version of the shopping list when this item was last changed
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     extras: Mapped[list[ShoppingListItemExtras]] = orm.relationship(
         "ShoppingListItemExtras", cascade="all, delete-orphan"
     )
@@ -154,6 +172,13 @@ class ShoppingList(SqlAlchemyBase, BaseMixins):
     user: Mapped["User"] = orm.relationship("User", back_populates="shopping_lists")
 
     name: Mapped[str | None] = mapped_column(String)
+
+    # incremented whenever the list or its items change, so clients can sync only what changed since
+    # the version they last saw; tombstones up to `pruned_version` (created before `pruned_at`) have been purged
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    pruned_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    pruned_at: Mapped[datetime | None] = mapped_column(NaiveDateTime)
+
     list_items: Mapped[list[ShoppingListItem]] = orm.relationship(
         ShoppingListItem,
         cascade="all, delete, delete-orphan",
@@ -171,6 +196,9 @@ class ShoppingList(SqlAlchemyBase, BaseMixins):
         collection_class=ordering_list("position"),
     )
     extras: Mapped[list[ShoppingListExtras]] = orm.relationship("ShoppingListExtras", cascade="all, delete-orphan")
+    item_tombstones: Mapped[list["ShoppingListItemTombstone"]] = orm.relationship(
+        "ShoppingListItemTombstone", cascade="all, delete, delete-orphan"
+    )
     model_config = ConfigDict(exclude={"id", "list_items"})
 
     @api_extras
@@ -179,58 +207,137 @@ class ShoppingList(SqlAlchemyBase, BaseMixins):
         pass
 
 
+class ShoppingListItemTombstone(SqlAlchemyBase):
+    """Records a deleted shopping list item, so clients syncing changes know to remove it"""
+
+    __tablename__ = "shopping_list_item_tombstones"
+    __table_args__ = (
+        Index("ix_shopping_list_item_tombstones_shopping_list_id_version", "shopping_list_id", "version"),
+    )
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+
+    shopping_list_id: Mapped[GUID] = mapped_column(GUID, ForeignKey("shopping_lists.id"), nullable=False)
+    shopping_list_item_id: Mapped[GUID] = mapped_column(GUID, nullable=False)
+
+    # the version of the shopping list when the item was deleted
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class SessionBuffer:
     def __init__(self) -> None:
         self.shopping_list_ids: set[GUID] = set()
+        self.changed_item_ids: dict[GUID, set[GUID]] = defaultdict(set)
+        self.deleted_item_ids: dict[GUID, set[GUID]] = defaultdict(set)
 
     def add(self, shopping_list_id: GUID) -> None:
         self.shopping_list_ids.add(shopping_list_id)
 
-    def pop(self) -> GUID | None:
-        try:
-            return self.shopping_list_ids.pop()
-        except KeyError:
-            return None
+    def add_changed_item(self, shopping_list_id: GUID, item_id: GUID) -> None:
+        self.add(shopping_list_id)
+        self.changed_item_ids[shopping_list_id].add(item_id)
+
+    def add_deleted_item(self, shopping_list_id: GUID, item_id: GUID) -> None:
+        self.add(shopping_list_id)
+        self.deleted_item_ids[shopping_list_id].add(item_id)
 
     def clear(self) -> None:
         self.shopping_list_ids.clear()
+        self.changed_item_ids.clear()
+        self.deleted_item_ids.clear()
 
 
-session_buffer_context = ContextVar("session_buffer", default=SessionBuffer())  # noqa: B039
+def get_session_buffer(session: orm.Session) -> SessionBuffer:
+    return session.info.setdefault("shopping_list_buffer", SessionBuffer())
 
 
 @event.listens_for(ShoppingListItem, "after_insert")
 @event.listens_for(ShoppingListItem, "after_update")
+def buffer_shopping_list_item_changes(_, connection, target: ShoppingListItem):
+    """Adds the item to the session buffer so its shopping list's version can be updated later"""
+
+    if not (session := orm.object_session(target)):
+        return
+
+    session_buffer = get_session_buffer(session)
+    if target.shopping_list_id:
+        session_buffer.add_changed_item(target.shopping_list_id, target.id)
+
+    # an item moved to another list is deleted from the list it was on
+    for previous_shopping_list_id in inspect(target).attrs.shopping_list_id.history.deleted:
+        if previous_shopping_list_id and previous_shopping_list_id != target.shopping_list_id:
+            session_buffer.add_deleted_item(previous_shopping_list_id, target.id)
+
+
 @event.listens_for(ShoppingListItem, "after_delete")
-def buffer_shopping_list_updates(_, connection, target: ShoppingListItem):
-    """Adds the shopping list id to the session buffer so its `updated_at` property can be updated later"""
+def buffer_shopping_list_item_deletes(_, connection, target: ShoppingListItem):
+    """Adds the item to the session buffer so a tombstone is written for it later"""
+
+    if target.shopping_list_id and (session := orm.object_session(target)):
+        get_session_buffer(session).add_deleted_item(target.shopping_list_id, target.id)
+
 
-    session_buffer = session_buffer_context.get()
-    session_buffer.add(target.shopping_list_id)
+@event.listens_for(ShoppingList, "after_update")
+@event.listens_for(ShoppingListRecipeReference, "after_insert")
+@event.listens_for(ShoppingListRecipeReference, "after_update")
+@event.listens_for(ShoppingListRecipeReference, "after_delete")
+@event.listens_for(ShoppingListMultiPurposeLabel, "after_insert")
+@event.listens_for(ShoppingListMultiPurposeLabel, "after_update")
+@event.listens_for(ShoppingListMultiPurposeLabel, "after_delete")
+def buffer_shopping_list_changes(
+    _, connection, target: ShoppingList | ShoppingListRecipeReference | ShoppingListMultiPurposeLabel
+):
+    """Adds the shopping list id to the session buffer so its version can be updated later"""
+
+    shopping_list_id = target.id if isinstance(target, ShoppingList) else target.shopping_list_id
+    if shopping_list_id and (session := orm.object_session(target)):
+        get_session_buffer(session).add(shopping_list_id)
 
 
 @event.listens_for(orm.Session, "after_flush")
 def update_shopping_lists(session: orm.Session, _):
-    """Pulls all pending shopping list updates from the buffer and updates their `updated_at` property"""
-
-    session_buffer = session_buffer_context.get()
-    if not session_buffer.shopping_list_ids:
+    """
+    Pulls all pending shopping list updates from the buffer, increments each list's version and updates
+    its `updated_at` property, then stamps changed items with the new version and writes tombstones for
+    deleted items
+    """
+
+    session_buffer = session.info.get("shopping_list_buffer")
+    if not session_buffer or not session_buffer.shopping_list_ids:
         return
 
-    local_session = orm.Session(bind=session.connection())
+    # these are plain SQL statements, so they don't trigger another flush or any of the listeners above
+    connection = session.connection()
     try:
-        local_session.begin()
-        while True:
-            shopping_list_id = session_buffer.pop()
-            if not shopping_list_id:
-                break
-
-            shopping_list = local_session.query(ShoppingList).filter(ShoppingList.id == shopping_list_id).first()
-            if not shopping_list:
+        for shopping_list_id in session_buffer.shopping_list_ids:
+            result = connection.execute(
+                update(ShoppingList)
+                .where(ShoppingList.id == shopping_list_id)
+                .values(version=ShoppingList.version + 1, update_at=datetime.now(UTC))
+                .returning(ShoppingList.version)
+            )
+            if (version := result.scalar_one_or_none()) is None:
+                # the list itself was deleted
                 continue
 
-            shopping_list.updated_at = datetime.now(UTC)
-        local_session.commit()
-    except Exception:
-        local_session.rollback()
-        raise
+            if item_ids := session_buffer.changed_item_ids.get(shopping_list_id):
+                connection.execute(
+                    update(ShoppingListItem).where(ShoppingListItem.id.in_(item_ids)).values(version=version)
+                )
+            if item_ids := session_buffer.deleted_item_ids.get(shopping_list_id):
+                connection.execute(
+                    insert(ShoppingListItemTombstone),
+                    [
+                        {"shopping_list_id": shopping_list_id, "shopping_list_item_id": item_id, "version": version}
+                        for item_id in item_ids
+                    ],
+                )
+    finally:
+        session_buffer.clear()
+
+
+@event.listens_for(orm.Session, "after_rollback")
+def clear_shopping_list_updates(session: orm.Session):
+    """Discards pending shopping list updates from a failed flush"""
+
+    if session_buffer := session.info.get("shopping_list_buffer"):
+        session_buffer.clear()
@@ -1,7 +1,7 @@
 from datetime import UTC, datetime, time
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, ForeignKey, String, Time, orm
+from sqlalchemy import Boolean, ForeignKey, Index, String, Time, orm
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .._model_base import BaseMixins, SqlAlchemyBase
@@ -15,6 +15,10 @@ if TYPE_CHECKING:
 
 class GroupWebhooksModel(SqlAlchemyBase, BaseMixins):
     __tablename__ = "webhook_urls"
+    __table_args__ = (
+        # the scheduler looks up due webhooks across all households by their scheduled time
+        Index("ix_webhook_urls_enabled_scheduled_time", "enabled", "scheduled_time"),
+    )
     id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
 
     group: Mapped[Optional["Group"]] = orm.relationship("Group", back_populates="webhooks", single_parent=True)
@@ -27,6 +27,7 @@ from .instruction import RecipeInstruction
 from .note import Note
 from .nutrition import Nutrition
 from .recipe_timeline import RecipeTimelineEvent
+from .refresh_state import RecipeRefreshStateModel
 from .settings import RecipeSettings
 from .shared import RecipeShareTokenModel
 from .tag import recipes_to_tags
@@ -138,6 +139,9 @@ class RecipeModel(SqlAlchemyBase, BaseMixins):
     tags: Mapped[list["Tag"]] = orm.relationship("Tag", secondary=recipes_to_tags, back_populates="recipes")
     notes: Mapped[list[Note]] = orm.relationship("Note", cascade="all, delete-orphan")
     org_url: Mapped[str | None] = mapped_column(sa.String)
+    refresh_state: Mapped[RecipeRefreshStateModel | None] = orm.relationship(
+        RecipeRefreshStateModel, uselist=False, cascade="all, delete-orphan"
+    )
     extras: Mapped[list[ApiExtras]] = orm.relationship("ApiExtras", cascade="all, delete-orphan")
 
     # Time Stamp Properties
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._model_base import SqlAlchemyBase
+from .._model_utils.datetime import NaiveDateTime
+from .._model_utils.guid import GUID
+
+
+class RecipeRefreshStateModel(SqlAlchemyBase):
+    """
+    What was last seen at an imported recipe's `org_url`: the validators used to ask the site whether the page
+    changed, and a hash of the recipe content parsed from it, so a changed page only updates the recipe when the
+    recipe itself changed.
+    """
+
+    __tablename__ = "recipe_refresh_states"
+
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+    recipe_id: Mapped[GUID] = mapped_column(GUID, sa.ForeignKey("recipes.id"), nullable=False, unique=True)
+
+    etag: Mapped[str | None] = mapped_column(sa.String)
+    last_modified: Mapped[str | None] = mapped_column(sa.String)
+    content_hash: Mapped[str | None] = mapped_column(sa.String)
+
+    checked_at: Mapped[datetime | None] = mapped_column(NaiveDateTime, index=True)
+    changed_at: Mapped[datetime | None] = mapped_column(NaiveDateTime)
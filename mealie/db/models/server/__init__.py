@@ -1 +1,2 @@
+from .scheduler import *
 from .task import *
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from sqlalchemy import Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._model_base import SqlAlchemyBase
+from .._model_utils.datetime import NaiveDateTime
+from .._model_utils.guid import GUID
+
+
+class ScheduledJobModel(SqlAlchemyBase):
+    """
+    The state of a scheduled job, shared by every process running the scheduler.
+
+    A process leases a job through `locked_by`/`locked_until` before running it, so a job never runs
+    twice at once and only one process runs it each period. The lease expires on its own if the
+    process holding it dies.
+    """
+
+    __tablename__ = "scheduled_jobs"
+
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+    name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    schedule: Mapped[str] = mapped_column(String, nullable=False)
+
+    locked_by: Mapped[str | None] = mapped_column(String)
+    locked_until: Mapped[datetime | None] = mapped_column(NaiveDateTime)
+
+    last_started_at: Mapped[datetime | None] = mapped_column(NaiveDateTime)
+    last_finished_at: Mapped[datetime | None] = mapped_column(NaiveDateTime)
+    last_duration_ms: Mapped[float | None] = mapped_column(Float)
+    last_status: Mapped[str | None] = mapped_column(String)
+    last_error: Mapped[str | None] = mapped_column(String)
+
+    run_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failure_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ScheduledJobRunModel(SqlAlchemyBase):
+    """A single run of a scheduled job; only the most recent runs of each job are kept"""
+
+    __tablename__ = "scheduled_job_runs"
+    __table_args__ = (Index("ix_scheduled_job_runs_job_name_started_at", "job_name", "started_at"),)
+
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+    job_name: Mapped[str] = mapped_column(String, nullable=False)
+    worker: Mapped[str] = mapped_column(String, nullable=False)
+
+    started_at: Mapped[datetime] = mapped_column(NaiveDateTime, nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(NaiveDateTime, nullable=False)
+    duration_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    error: Mapped[str | None] = mapped_column(String)
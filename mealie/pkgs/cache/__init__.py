@@ -1 +1,8 @@
+from .backends import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
 from .cache_key import *
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+]
@@ -0,0 +1,226 @@
+import abc
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+class CacheBackend(abc.ABC):
+    """
+    A bounded key/value cache with per-entry expiration. Timeouts are given in seconds; `None` uses the
+    backend's default timeout and `0` stores the entry without an expiration. Expirations are stored as
+    wall-clock timestamps so they remain meaningful to every process sharing a backend.
+    """
+
+    def __init__(self, max_entries: int = 500, default_timeout: float = 300) -> None:
+        self.max_entries = max_entries
+        self.default_timeout = default_timeout
+
+    def _normalize_timeout(self, timeout: float | None) -> float:
+        if timeout is None:
+            timeout = self.default_timeout
+        if timeout > 0:
+            timeout = time.time() + timeout
+        return timeout
+
+    @staticmethod
+    def _is_expired(expires: float, now: float) -> bool:
+        return expires != 0 and expires <= now
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Any:
+        """Returns the cached value, or `None` if the key is missing or expired"""
+        ...
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None: ...
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> bool:
+        """Removes the key, returning `True` if it was present"""
+        ...
+
+    @abc.abstractmethod
+    def has(self, key: str) -> bool: ...
+
+    @abc.abstractmethod
+    def clear(self) -> None: ...
+
+    @abc.abstractmethod
+    def __len__(self) -> int: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache. Every operation is O(1): entries are kept in access order, so eviction
+    always removes the least recently used entry, and expired entries are dropped lazily when read
+    or when they reach the front of the eviction order.
+    """
+
+    def __init__(self, max_entries: int = 500, default_timeout: float = 300) -> None:
+        super().__init__(max_entries, default_timeout)
+        self._cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._cache:
+            oldest_key = next(iter(self._cache))
+            expires, _ = self._cache[oldest_key]
+            if len(self._cache) <= self.max_entries and not self._is_expired(expires, now):
+                break
+            del self._cache[oldest_key]
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            try:
+                expires, value = self._cache[key]
+            except KeyError:
+                return None
+
+            if self._is_expired(expires, time.time()):
+                del self._cache[key]
+                return None
+
+            self._cache.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        expires = self._normalize_timeout(timeout)
+        with self._lock:
+            self._cache[key] = (expires, value)
+            self._cache.move_to_end(key)
+            self._evict(time.time())
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._cache.pop(key, None) is not None
+
+    def has(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    LRU cache stored in a SQLite file, so every worker process pointed at the same file shares entries.
+    Several namespaces can share one file; each namespace is bounded independently. Values are pickled,
+    so the file must only ever be writable by Mealie itself.
+    """
+
+    _TOUCH_INTERVAL = 1.0
+    """entries read within this many seconds of their last access aren't re-written to keep reads cheap"""
+
+    def __init__(
+        self, path: Path, namespace: str = "default", max_entries: int = 500, default_timeout: float = 300
+    ) -> None:
+        super().__init__(max_entries, default_timeout)
+        self.path = path
+        self.namespace = namespace
+        self._local = threading.local()
+        self._writes_since_trim = 0
+
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # connections are per thread, and a new thread may find the file removed since the cache was created
+            self._create_schema(conn)
+            self._local.conn = conn
+
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (namespace, accessed)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache (namespace, expires)")
+
+    def get(self, key: str) -> Any:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires, accessed FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, expires, accessed = row
+        now = time.time()
+        if self._is_expired(expires, now):
+            self.delete(key)
+            return None
+
+        if now - accessed > self._TOUCH_INTERVAL:
+            conn.execute("UPDATE cache SET accessed = ? WHERE namespace = ? AND key = ?", (now, self.namespace, key))
+
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        expires = self._normalize_timeout(timeout)
+        now = time.time()
+
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, key, pickle.dumps(value), expires, now),
+        )
+
+        # trimming has to walk the access index, so it's batched rather than run on every write;
+        # a namespace may briefly exceed max_entries by up to 10%
+        self._writes_since_trim += 1
+        if self._writes_since_trim >= max(1, self.max_entries // 10):
+            self._writes_since_trim = 0
+            self.trim()
+
+    def trim(self) -> None:
+        """Removes expired entries, then the least recently used entries beyond `max_entries`"""
+        conn = self._connection()
+        conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires != 0 AND expires <= ?", (self.namespace, time.time())
+        )
+        conn.execute(
+            """
+            DELETE FROM cache WHERE namespace = ? AND key IN (
+                SELECT key FROM cache WHERE namespace = ? ORDER BY accessed DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.namespace, self.namespace, self.max_entries),
+        )
+
+    def delete(self, key: str) -> bool:
+        cursor = self._connection().execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+        return cursor.rowcount > 0
+
+    def has(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def __len__(self) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)).fetchone()
+        return row[0]
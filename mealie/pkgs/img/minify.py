@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from io import BytesIO
 from logging import Logger
 from pathlib import Path
+from uuid import uuid4
 
-from PIL import Image, ImageOps
+from PIL import Image, ImageOps, features
 from pillow_heif import register_heif_opener
 
 register_heif_opener()
@@ -19,6 +22,7 @@ class ImageFormat:
 
 JPG = ImageFormat(".jpg", "JPEG", ["RGB"])
 WEBP = ImageFormat(".webp", "WEBP", ["RGB", "RGBA"])
+AVIF = ImageFormat(".avif", "AVIF", ["RGB", "RGBA"])
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".heic", ".avif"}
 
 
@@ -27,6 +31,11 @@ def get_format(image: Path) -> str:
     return img.format
 
 
+def is_supported(image_format: ImageFormat) -> bool:
+    """Whether Pillow was built with support for saving images in this format"""
+    return features.check(image_format.format.lower())
+
+
 def sizeof_fmt(file_path: Path, decimal_places=2):
     if not file_path.exists():
         return "(File Not Found)"
@@ -69,6 +78,11 @@ class ABCMinifier(ABC):
 
 
 class PillowMinifier(ABCMinifier):
+    min_size = (800, 800)
+    """the largest size of the "small" image, used for recipe cards on high density screens"""
+    tiny_size = (300, 300)
+    quality = 70
+
     @staticmethod
     def _convert_image(
         image_file: Path, image_format: ImageFormat, dest: Path | None = None, quality: int = 100
@@ -97,7 +111,18 @@ class PillowMinifier(ABCMinifier):
         return PillowMinifier._convert_image(image_file, WEBP, dest, quality)
 
     @staticmethod
-    def crop_center(pil_img: Image, crop_width=300, crop_height=300):
+    def is_image(image_file: Path | bytes) -> bool:
+        """Checks that Pillow can read `image_file` as an image, without decoding the whole image"""
+        try:
+            with Image.open(image_file if isinstance(image_file, Path) else BytesIO(image_file)) as img:
+                img.verify()
+        except Exception:
+            return False
+
+        return True
+
+    @staticmethod
+    def crop_center(pil_img: Image.Image, crop_width=300, crop_height=300):
         img_width, img_height = pil_img.size
         return pil_img.crop(
             (
@@ -108,7 +133,71 @@ class PillowMinifier(ABCMinifier):
             )
         )
 
+    @staticmethod
+    def _open(image_file: Path, draft_size: tuple[int, int] | None = None) -> Image.Image:
+        """
+        Decodes an image, upright and in a mode that can be saved as WebP. JPEGs can be decoded at 1/2, 1/4 or
+        1/8 scale, which is much faster than decoding the full image and shrinking it, so when `draft_size`
+        is given they're decoded at the smallest scale that's still at least that size.
+        """
+
+        img = Image.open(image_file)
+        if draft_size and img.format == JPG.format:
+            img.draft(JPG.modes[0], draft_size)
+
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in WEBP.modes:
+            img = img.convert(WEBP.modes[0])
+
+        return img
+
+    @staticmethod
+    def resize_to_fit(img: Image.Image, size: tuple[int, int]) -> Image.Image:
+        """Shrinks an image to fit within `size`, keeping its aspect ratio. Smaller images are returned as-is"""
+        if img.width <= size[0] and img.height <= size[1]:
+            return img
+
+        scale = min(size[0] / img.width, size[1] / img.height)
+        new_size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+
+        # `reducing_gap` shrinks the image by an integer factor with `reduce` first, then resamples the rest
+        return img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+    @staticmethod
+    def resize_to_fill(img: Image.Image, size: tuple[int, int]) -> Image.Image:
+        """Shrinks an image to cover `size`, then crops it to `size` around its center"""
+        scale = max(size[0] / img.width, size[1] / img.height)
+        if scale < 1:
+            new_size = (max(size[0], round(img.width * scale)), max(size[1], round(img.height * scale)))
+            img = img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+        return PillowMinifier.crop_center(img, min(size[0], img.width), min(size[1], img.height))
+
+    def _save(self, img: Image.Image, dest: Path, image_format: ImageFormat = WEBP) -> None:
+        """Saves an image variant, replacing `dest` only once it's complete so it's never served half written"""
+        tmp = dest.with_name(f".{dest.stem}-{uuid4().hex}{dest.suffix}")
+        try:
+            img.save(tmp, image_format.format, quality=self.quality)
+            tmp.replace(dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def resize(self, image_file: Path, dest: Path, width: int | None = None, image_format: ImageFormat = WEBP) -> Path:
+        """Writes a copy of an image that's no wider than `width`, in `image_format`"""
+        img = PillowMinifier._open(image_file)
+        if width:
+            img = PillowMinifier.resize_to_fit(img, (width, img.height))
+
+        self._save(img, dest, image_format)
+        return dest
+
     def minify(self, image_file: Path, force=True):
+        """
+        Writes the WebP variants of an image next to it: `original.webp` at full size, `min-original.webp`
+        sized for recipe cards, and `tiny-original.webp` cropped to a small square. The image is decoded once,
+        each variant is resized from it, and the variants are encoded in parallel.
+        """
+
         if not image_file.exists():
             raise FileNotFoundError(f"{image_file.name} does not exist")
 
@@ -120,33 +209,50 @@ class PillowMinifier(ABCMinifier):
             self._logger.info(f"{image_file.name} already minified")
             return
 
-        success = False
-
-        if self._opts.original:
-            if not force and org_dest.exists():
+        # the size of each variant that's written, or None for the full image
+        variants: dict[Path, tuple[int, int] | None] = {}
+        for enabled, dest, size in [
+            (self._opts.original, org_dest, None),
+            (self._opts.miniature, min_dest, self.min_size),
+            (self._opts.tiny, tiny_dest, self.tiny_size),
+        ]:
+            if not enabled:
+                continue
+            if not force and dest.exists():
                 self._logger.info(f"{image_file.name} already minified")
-            else:
-                PillowMinifier.to_webp(image_file, org_dest, quality=70)
-                success = True
+                continue
 
-        if self._opts.miniature:
-            if not force and min_dest.exists():
-                self._logger.info(f"{image_file.name} already minified")
-            else:
-                PillowMinifier.to_webp(image_file, min_dest, quality=70)
-                self._logger.info(f"{image_file.name} minified")
-                success = True
+            variants[dest] = size
 
-        if self._opts.tiny:
-            if not force and tiny_dest.exists():
-                self._logger.info(f"{image_file.name} already minified")
+        if not variants:
+            return
+
+        draft_size = None
+        if None not in variants.values():
+            draft_size = (
+                max(size[0] for size in variants.values() if size),
+                max(size[1] for size in variants.values() if size),
+            )
+
+        img = PillowMinifier._open(image_file, draft_size)
+        images: dict[Path, Image.Image] = {}
+        for dest, size in variants.items():
+            if size is None:
+                images[dest] = img
             else:
-                img = Image.open(image_file)
-                img = ImageOps.exif_transpose(img)
-                tiny_image = PillowMinifier.crop_center(img)
-                tiny_image.save(tiny_dest, WEBP.format, quality=70)
-                self._logger.info("Tiny image saved")
-                success = True
-
-        if self._purge and success:
+                resize = PillowMinifier.resize_to_fill if dest == tiny_dest else PillowMinifier.resize_to_fit
+                variant = resize(img, size)
+
+                # saving stores the save options on the image, so each thread needs an image of its own
+                images[dest] = variant.copy() if variant is img else variant
+
+        # Pillow releases the GIL while encoding, so the variants are encoded at the same time
+        with ThreadPoolExecutor(max_workers=len(images)) as executor:
+            futures = [executor.submit(self._save, variant, dest) for dest, variant in images.items()]
+            for future in futures:
+                future.result()
+
+        self._logger.info(f"{image_file.name} minified")
+
+        if self._purge:
             self.purge(image_file)
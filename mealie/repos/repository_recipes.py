@@ -147,9 +147,9 @@ class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
 
         return results
 
-    def update_image(self, slug: str, _: str | None = None) -> int:
+    def update_image(self, slug: str, _: str | None = None, key: str | None = None) -> int | str:
         entry: RecipeModel = self._query_one(match_value=slug)
-        entry.image = randint(0, 255)
+        entry.image = key if key is not None else randint(0, 255)
         self.session.commit()
 
         return entry.image
@@ -1,7 +1,16 @@
+from datetime import UTC, datetime
+
 from pydantic import UUID4
+from sqlalchemy import select
 
-from mealie.db.models.household.shopping_list import ShoppingList
-from mealie.schema.household.group_shopping_list import ShoppingListOut, ShoppingListUpdate
+from mealie.db.models.household.shopping_list import ShoppingList, ShoppingListItem, ShoppingListItemTombstone
+from mealie.schema.household.group_shopping_list import (
+    ShoppingListChangesOut,
+    ShoppingListItemOut,
+    ShoppingListOut,
+    ShoppingListSummary,
+    ShoppingListUpdate,
+)
 
 from .repository_generic import HouseholdRepositoryGeneric
 
@@ -9,3 +18,51 @@ from .repository_generic import HouseholdRepositoryGeneric
 class RepositoryShoppingList(HouseholdRepositoryGeneric[ShoppingListOut, ShoppingList]):
     def update(self, item_id: UUID4, data: ShoppingListUpdate) -> ShoppingListOut:  # type: ignore
         return super().update(item_id, data)
+
+    def get_changes(self, shopping_list_id: UUID4, since: int | datetime) -> ShoppingListChangesOut | None:
+        """
+        Fetches the items changed or deleted since a list version or, less precisely, since a point in time.
+        If tombstones from that far back have been purged, every item is returned instead.
+        """
+
+        stmt = (
+            self._query(override_schema=ShoppingListSummary)
+            .filter_by(**self._filter_builder(id=shopping_list_id))
+            .execution_options(populate_existing=True)
+        )
+        shopping_list = self.session.execute(stmt).unique().scalars().one_or_none()
+        if not shopping_list:
+            return None
+
+        # the list's version is read before its items, so anything that changes in between is sent again next time
+        version = shopping_list.version
+        if isinstance(since, datetime):
+            since = since if since.tzinfo else since.replace(tzinfo=UTC)
+            reset = shopping_list.pruned_at is not None and since < shopping_list.pruned_at
+            item_filter = ShoppingListItem.update_at > since
+            tombstone_filter = ShoppingListItemTombstone.created_at > since
+        else:
+            reset = since <= 0 or since < shopping_list.pruned_version
+            item_filter = ShoppingListItem.version > since
+            tombstone_filter = ShoppingListItemTombstone.version > since
+
+        items_stmt = select(ShoppingListItem).where(ShoppingListItem.shopping_list_id == shopping_list_id)
+        if not reset:
+            items_stmt = items_stmt.where(item_filter)
+
+        items = self.session.execute(items_stmt.options(*ShoppingListItemOut.loader_options())).unique().scalars()
+
+        deleted_item_ids: list[UUID4] = []
+        if not reset:
+            tombstones_stmt = select(ShoppingListItemTombstone.shopping_list_item_id).where(
+                ShoppingListItemTombstone.shopping_list_id == shopping_list_id, tombstone_filter
+            )
+            deleted_item_ids = list(self.session.execute(tombstones_stmt).scalars())
+
+        return ShoppingListChangesOut(
+            version=version,
+            reset=reset,
+            shopping_list=ShoppingListSummary.model_validate(shopping_list),
+            items=[ShoppingListItemOut.model_validate(item) for item in items],
+            deleted_item_ids=deleted_item_ids,
+        )
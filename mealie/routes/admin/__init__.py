@@ -5,10 +5,12 @@ from . import (
     admin_backups,
     admin_debug,
     admin_email,
+    admin_events,
     admin_maintenance,
     admin_management_groups,
     admin_management_households,
     admin_management_users,
+    admin_scheduler,
 )
 
 router = AdminAPIRouter(prefix="/admin")
@@ -18,6 +20,8 @@ router.include_router(admin_management_users.router, tags=["Admin: Manage Users"
 router.include_router(admin_management_households.router, tags=["Admin: Manage Households"])
 router.include_router(admin_management_groups.router, tags=["Admin: Manage Groups"])
 router.include_router(admin_email.router, tags=["Admin: Email"])
+router.include_router(admin_events.router, tags=["Admin: Events"])
+router.include_router(admin_scheduler.router, tags=["Admin: Scheduler"])
 router.include_router(admin_backups.router, tags=["Admin: Backups"])
 router.include_router(admin_maintenance.router, tags=["Admin: Maintenance"])
 router.include_router(admin_debug.router, tags=["Admin: Debug"])
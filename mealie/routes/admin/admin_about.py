@@ -2,9 +2,10 @@ from fastapi import APIRouter
 from recipe_scrapers import __version__ as recipe_scraper_version
 
 from mealie.core.release_checker import get_latest_version
+from mealie.core.security.hasher import get_hasher_pool
 from mealie.core.settings.static import APP_VERSION
 from mealie.routes._base import BaseAdminController, controller
-from mealie.schema.admin.about import AdminAboutInfo, AppStatistics, CheckAppConfig
+from mealie.schema.admin.about import AdminAboutInfo, AppStatistics, CheckAppConfig, HasherStatistics
 
 router = APIRouter(prefix="/about")
 
@@ -51,6 +52,11 @@ class AdminAboutController(BaseAdminController):
             total_groups=self.repos.groups.count_all(),
         )
 
+    @router.get("/statistics/hasher", response_model=HasherStatistics)
+    def get_hasher_statistics(self):
+        """Get the current load on the password hashing pool"""
+        return get_hasher_pool().statistics()
+
     @router.get("/check", response_model=CheckAppConfig)
     def check_app_config(self):
         settings = self.settings
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import UUID4
+
+from mealie.routes._base import BaseAdminController, controller
+from mealie.schema.admin.event_outbox import EventOutboxEntry, EventOutboxStatus, EventOutboxSummary
+from mealie.schema.response import ErrorResponse, SuccessResponse
+from mealie.services.event_bus_service.event_outbox import EventOutboxRepository, get_event_outbox_worker
+
+router = APIRouter(prefix="/events")
+
+
+@controller(router)
+class AdminEventOutboxController(BaseAdminController):
+    @property
+    def outbox(self) -> EventOutboxRepository:
+        return EventOutboxRepository(self.session)
+
+    @router.get("/outbox", response_model=EventOutboxSummary)
+    def get_outbox_summary(self):
+        """Get the depth of the event outbox and recent delivery latency"""
+        return self.outbox.summary()
+
+    @router.get("/outbox/entries", response_model=list[EventOutboxEntry])
+    def get_outbox_entries(
+        self,
+        status: EventOutboxStatus = EventOutboxStatus.dead,
+        limit: int = Query(100, ge=1, le=1000),
+    ):
+        """Get the most recent deliveries with the given status; defaults to dead-lettered deliveries"""
+        return self.outbox.get_entries(status, limit)
+
+    @router.post("/outbox/{item_id}/retry", response_model=SuccessResponse)
+    def retry_outbox_entry(self, item_id: UUID4):
+        """Move a dead-lettered delivery back into the queue"""
+        if not self.outbox.retry(item_id):
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND, ErrorResponse.respond("No dead-lettered delivery found with that id")
+            )
+
+        get_event_outbox_worker().notify()
+        return SuccessResponse.respond("Delivery queued for retry")
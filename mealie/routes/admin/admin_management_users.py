@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import UUID4
 
 from mealie.core import security
+from mealie.core.security.token_cache import get_token_cache
 from mealie.routes._base import BaseAdminController, controller
 from mealie.routes._base.mixins import HttpRepo
 from mealie.schema.response.pagination import PaginationQuery
@@ -67,11 +68,15 @@ class AdminUserManagementRoutes(BaseAdminController):
         if self.user.id == item_id and self.user.admin != data.admin:
             raise HTTPException(status_code=403, detail=ErrorResponse.respond("you cannot demote yourself"))
 
-        return self.mixins.update_one(data, item_id)
+        user = self.mixins.update_one(data, item_id)
+        get_token_cache().invalidate_user(item_id)
+        return user
 
     @router.delete("/{item_id}", response_model=UserOut)
     def delete_one(self, item_id: UUID4):
-        return self.mixins.delete_one(item_id)
+        user = self.mixins.delete_one(item_id)
+        get_token_cache().invalidate_user(item_id)
+        return user
 
     @router.post("/password-reset-token", response_model=PasswordResetToken, status_code=201)
     def generate_token(self, email: ForgotPassword):
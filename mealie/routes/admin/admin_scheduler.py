@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Query, status
+
+from mealie.routes._base import BaseAdminController, controller
+from mealie.schema.admin.scheduler import ScheduledJobOut, ScheduledJobRunOut
+from mealie.schema.response import ErrorResponse
+from mealie.services.scheduler.job_runner import MAX_RUN_HISTORY, ScheduledJobRepository
+
+router = APIRouter(prefix="/scheduler")
+
+
+@controller(router)
+class AdminSchedulerController(BaseAdminController):
+    @property
+    def jobs(self) -> ScheduledJobRepository:
+        return ScheduledJobRepository(self.session)
+
+    @router.get("/jobs", response_model=list[ScheduledJobOut])
+    def get_scheduled_jobs(self):
+        """Get every scheduled job with the outcome and duration of its last run"""
+        return self.jobs.get_jobs()
+
+    @router.get("/jobs/{name}/runs", response_model=list[ScheduledJobRunOut])
+    def get_scheduled_job_runs(self, name: str, limit: int = Query(MAX_RUN_HISTORY, ge=1, le=MAX_RUN_HISTORY)):
+        """Get the most recent runs of a scheduled job"""
+        runs = self.jobs.get_runs(name, limit)
+        if runs is None:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND, ErrorResponse.respond("No scheduled job found with that name")
+            )
+
+        return runs
@@ -9,6 +9,7 @@ from sqlalchemy.orm.session import Session
 from starlette.datastructures import URLPath
 
 from mealie.core import root_logger, security
+from mealie.core.cache import get_cache
 from mealie.core.config import get_app_settings
 from mealie.core.dependencies import get_current_user
 from mealie.core.exceptions import MissingClaimException, UserLockedOut
@@ -29,7 +30,7 @@ logger = root_logger.get_logger("auth")
 
 settings = get_app_settings()
 if settings.OIDC_READY:
-    oauth = OAuth(cache=AuthCache())
+    oauth = OAuth(cache=AuthCache(backend=get_cache("oidc")))
     scope = None
     if settings.OIDC_SCOPES_OVERRIDE:
         scope = settings.OIDC_SCOPES_OVERRIDE
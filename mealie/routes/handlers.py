@@ -3,6 +3,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
 from mealie.core.config import get_app_settings
+from mealie.core.exceptions import PasswordHasherBusy
 from mealie.core.root_logger import get_logger
 
 logger = get_logger()
@@ -15,6 +16,20 @@ def log_wrapper(request: Request, e):
     logger.error("End 422 Error".center(60, "-"))
 
 
+def register_busy_handler(app: FastAPI):
+    @app.exception_handler(PasswordHasherBusy)
+    async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+        logger.warning(f"Password hasher is saturated, rejecting {request.method} {request.url.path}")
+        content = {"status_code": status.HTTP_503_SERVICE_UNAVAILABLE, "message": "Server is busy", "data": None}
+        return JSONResponse(
+            content=content,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+
+    return password_hasher_busy_handler
+
+
 def register_debug_handler(app: FastAPI):
     settings = get_app_settings()
 
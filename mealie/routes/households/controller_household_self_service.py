@@ -2,6 +2,7 @@ from functools import cached_property
 
 from fastapi import Depends, HTTPException, status
 
+from mealie.core.security.token_cache import get_token_cache
 from mealie.routes._base.base_controllers import BaseUserController
 from mealie.routes._base.controller import controller
 from mealie.routes._base.routers import UserAPIRouter
@@ -84,7 +85,9 @@ class HouseholdSelfServiceController(BaseUserController):
         target_user.can_manage_household = permissions.can_manage_household
         target_user.can_organize = permissions.can_organize
 
-        return self.repos.users.update(permissions.user_id, target_user)
+        user = self.repos.users.update(permissions.user_id, target_user)
+        get_token_cache().invalidate_user(permissions.user_id)
+        return user
 
     @router.get("/statistics", response_model=HouseholdStatistics)
     def get_statistics(self):
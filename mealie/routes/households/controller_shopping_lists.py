@@ -1,7 +1,9 @@
 from collections.abc import Callable
+from datetime import datetime
 from functools import cached_property
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 
 from mealie.routes._base.base_controllers import BaseCrudController
@@ -10,6 +12,9 @@ from mealie.routes._base.mixins import HttpRepo
 from mealie.schema.household.group_shopping_list import (
     ShoppingListAddRecipeParams,
     ShoppingListAddRecipeParamsBulk,
+    ShoppingListChange,
+    ShoppingListChangesOut,
+    ShoppingListChangeType,
     ShoppingListCreate,
     ShoppingListItemCreate,
     ShoppingListItemOut,
@@ -26,19 +31,21 @@ from mealie.schema.household.group_shopping_list import (
     ShoppingListUpdate,
 )
 from mealie.schema.response.pagination import PaginationQuery
-from mealie.schema.response.responses import SuccessResponse
+from mealie.schema.response.responses import ErrorResponse, SuccessResponse
 from mealie.services.event_bus_service.event_types import (
     EventOperation,
     EventShoppingListData,
     EventShoppingListItemBulkData,
     EventTypes,
 )
+from mealie.services.household_services.shopping_list_feed import get_shopping_list_feed
 from mealie.services.household_services.shopping_lists import ShoppingListService
 
 item_router = APIRouter(prefix="/households/shopping/items", tags=["Households: Shopping List Items"])
 
 
 def publish_list_item_events(publisher: Callable, items_collection: ShoppingListItemsCollectionOut) -> None:
+    feed = get_shopping_list_feed()
     items_by_list_id: dict[UUID4, list[ShoppingListItemOut]]
     if items_collection.created_items:
         items_by_list_id = {}
@@ -57,6 +64,9 @@ def publish_list_item_events(publisher: Callable, items_collection: ShoppingList
                 group_id=items[0].group_id,
                 household_id=items[0].household_id,
             )
+            feed.publish(
+                ShoppingListChange(shopping_list_id=shopping_list_id, type=ShoppingListChangeType.created, items=items)
+            )
 
     if items_collection.updated_items:
         items_by_list_id = {}
@@ -75,6 +85,9 @@ def publish_list_item_events(publisher: Callable, items_collection: ShoppingList
                 group_id=items[0].group_id,
                 household_id=items[0].household_id,
             )
+            feed.publish(
+                ShoppingListChange(shopping_list_id=shopping_list_id, type=ShoppingListChangeType.updated, items=items)
+            )
 
     if items_collection.deleted_items:
         items_by_list_id = {}
@@ -93,6 +106,9 @@ def publish_list_item_events(publisher: Callable, items_collection: ShoppingList
                 group_id=items[0].group_id,
                 household_id=items[0].household_id,
             )
+            feed.publish(
+                ShoppingListChange(shopping_list_id=shopping_list_id, type=ShoppingListChangeType.deleted, items=items)
+            )
 
 
 @controller(item_router)
@@ -201,6 +217,39 @@ class ShoppingListController(BaseCrudController):
     def get_one(self, item_id: UUID4):
         return self.mixins.get_one(item_id)
 
+    @router.get("/{item_id}/feed", response_class=StreamingResponse)
+    def get_change_feed(self, item_id: UUID4):
+        """
+        Streams changes to the shopping list as Server-Sent Events, so clients don't need to poll for them.
+        `change` events contain a `ShoppingListChange`; a `reset` event means changes were missed and the
+        list should be reloaded. The first `ready` event says whether the feed is `complete`; when Mealie runs
+        several workers it isn't, and clients should keep polling.
+        """
+
+        # make sure the list exists and belongs to this household
+        self.mixins.get_one(item_id)
+
+        # the stream can stay open for hours, so don't hold on to a database connection while it does
+        self.session.close()
+
+        return StreamingResponse(
+            get_shopping_list_feed().stream(item_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @router.get("/{item_id}/changes", response_model=ShoppingListChangesOut)
+    def get_changes(self, item_id: UUID4, since: int | datetime = 0):
+        """
+        Returns the list's metadata and only the items changed or deleted since `since`, which is either
+        the `version` returned by the previous call or a timestamp. Use `0` to fetch the whole list.
+        """
+        changes = self.repo.get_changes(item_id, since)
+        if not changes:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, detail=ErrorResponse.respond(message="Not found."))
+
+        return changes
+
     @router.put("/{item_id}", response_model=ShoppingListOut)
     def update_one(self, item_id: UUID4, data: ShoppingListUpdate):
         shopping_list = self.mixins.update_one(data, item_id)
@@ -211,6 +260,9 @@ class ShoppingListController(BaseCrudController):
             household_id=shopping_list.household_id,
             message=self.t("notifications.generic-updated", name=shopping_list.name),
         )
+        get_shopping_list_feed().publish(
+            ShoppingListChange(shopping_list_id=shopping_list.id, type=ShoppingListChangeType.updated)
+        )
 
         return shopping_list
 
@@ -225,6 +277,9 @@ class ShoppingListController(BaseCrudController):
                 household_id=shopping_list.household_id,
                 message=self.t("notifications.generic-deleted", name=shopping_list.name),
             )
+            get_shopping_list_feed().publish(
+                ShoppingListChange(shopping_list_id=shopping_list.id, type=ShoppingListChangeType.deleted)
+            )
 
         return shopping_list
 
@@ -250,6 +305,9 @@ class ShoppingListController(BaseCrudController):
             household_id=updated_list.household_id,
             message=self.t("notifications.generic-updated", name=updated_list.name),
         )
+        get_shopping_list_feed().publish(
+            ShoppingListChange(shopping_list_id=updated_list.id, type=ShoppingListChangeType.updated)
+        )
 
         return updated_list
 
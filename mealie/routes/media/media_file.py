@@ -0,0 +1,95 @@
+import os
+import stat
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, status
+from starlette.responses import FileResponse, Response
+
+from mealie.core.config import get_app_dirs, get_app_settings
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+"""for URLs that change whenever the file does, like image URLs with a `version`"""
+
+CACHE_REVALIDATE = "no-cache"
+"""for URLs that always point to the latest file; clients may keep it, but check its ETag before using it"""
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """
+    A strong ETag for a file. Media files are replaced rather than written in place, so a file
+    with new contents always has a new modification time
+    """
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    # If-None-Match uses the weak comparison, so a weak tag for the same file still matches
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def sendfile_headers(path: Path) -> dict[str, str] | None:
+    """
+    The headers that hand `path` over to a fronting web server, or `None` if
+    Mealie should send the file itself
+    """
+    settings = get_app_settings()
+
+    match settings.MEDIA_SENDFILE:
+        case "x-sendfile":
+            return {"x-sendfile": str(path.resolve())}
+        case "x-accel-redirect":
+            try:
+                relative = path.resolve().relative_to(get_app_dirs().DATA_DIR.resolve())
+            except ValueError:
+                # the web server can only serve files from the data directory
+                return None
+
+            return {"x-accel-redirect": f"{settings.MEDIA_SENDFILE_PREFIX}/{quote(relative.as_posix())}"}
+        case _:
+            return None
+
+
+def media_file_response(
+    request: Request,
+    path: Path,
+    *,
+    media_type: str | None = None,
+    filename: str | None = None,
+    cache_control: str = CACHE_REVALIDATE,
+) -> Response:
+    """
+    Returns `path` with an ETag and `cache_control`, or a 304 if the client already has it. With
+    `MEDIA_SENDFILE` set, the file is left for the fronting web server to send
+    """
+    try:
+        stat_result = path.stat()
+    except OSError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND) from e
+
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status.HTTP_404_NOT_FOUND)
+
+    headers = {"etag": file_etag(stat_result), "cache-control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), headers["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response = FileResponse(
+        path,
+        stat_result=stat_result,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="attachment",
+    )
+
+    if sendfile := sendfile_headers(path):
+        # the web server sends the body, but keeps the headers set here, like the content type and cache control
+        headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+        return Response(headers=headers | sendfile)
+
+    return response
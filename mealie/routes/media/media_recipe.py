@@ -1,11 +1,16 @@
+import asyncio
 from enum import Enum
+from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from pydantic import UUID4
-from starlette.responses import FileResponse
+from starlette.responses import Response
 
 from mealie.schema.recipe import Recipe
 from mealie.schema.recipe.recipe_timeline_events import RecipeTimelineEventOut
+from mealie.services.recipe.image_variants import MEDIA_TYPES, ImageVariantFormat, get_image_variant, get_variant_dir
+
+from .media_file import CACHE_IMMUTABLE, CACHE_REVALIDATE, media_file_response
 
 router = APIRouter(prefix="/recipes")
 
@@ -16,44 +21,63 @@ class ImageType(str, Enum):
     tiny = "tiny-original.webp"
 
 
+async def _image_response(
+    request: Request, image: Path, variant_dir: Path, name: str, w: int | None, fmt: ImageVariantFormat | None
+) -> Response:
+    if not image.exists():
+        raise HTTPException(status.HTTP_404_NOT_FOUND)
+
+    if w is not None or fmt is not None:
+        # resizing and encoding hold the CPU, so they're kept off the event loop
+        image = await asyncio.to_thread(get_image_variant, image, variant_dir, name, w, fmt)
+
+    # the frontend adds the image's cache key as `version`, so a versioned URL never points to a different image
+    cache_control = CACHE_IMMUTABLE if request.query_params.get("version") else CACHE_REVALIDATE
+    return media_file_response(request, image, media_type=MEDIA_TYPES[image.suffix], cache_control=cache_control)
+
+
 @router.get("/{recipe_id}/images/{file_name}")
-async def get_recipe_img(recipe_id: str, file_name: ImageType = ImageType.original):
+async def get_recipe_img(
+    request: Request,
+    recipe_id: str,
+    file_name: ImageType = ImageType.original,
+    w: int | None = Query(None, gt=0, description="resize the image to at most this width, rounded up"),
+    fmt: ImageVariantFormat | None = None,
+):
     """
     Takes in a recipe id, returns the static image. This route is proxied in the docker image
-    and should not hit the API in production
+    and should not hit the API in production, unless the image is resized (`w`) or converted (`fmt`)
     """
     recipe_image = Recipe.directory_from_id(recipe_id).joinpath("images", file_name.value)
+    name = Path(file_name.value).stem
 
-    if recipe_image.exists():
-        return FileResponse(recipe_image, media_type="image/webp")
-    else:
-        raise HTTPException(status.HTTP_404_NOT_FOUND)
+    return await _image_response(request, recipe_image, get_variant_dir(recipe_id), name, w, fmt)
 
 
 @router.get("/{recipe_id}/images/timeline/{timeline_event_id}/{file_name}")
 async def get_recipe_timeline_event_img(
-    recipe_id: str, timeline_event_id: str, file_name: ImageType = ImageType.original
+    request: Request,
+    recipe_id: str,
+    timeline_event_id: str,
+    file_name: ImageType = ImageType.original,
+    w: int | None = Query(None, gt=0, description="resize the image to at most this width, rounded up"),
+    fmt: ImageVariantFormat | None = None,
 ):
     """
     Takes in a recipe id and event timeline id, returns the static image. This route is proxied in the docker image
-    and should not hit the API in production
+    and should not hit the API in production, unless the image is resized (`w`) or converted (`fmt`)
     """
     timeline_event_image = RecipeTimelineEventOut.image_dir_from_id(recipe_id, timeline_event_id).joinpath(
         file_name.value
     )
+    name = f"timeline-{timeline_event_id}-{Path(file_name.value).stem}"
 
-    if timeline_event_image.exists():
-        return FileResponse(timeline_event_image, media_type="image/webp")
-    else:
-        raise HTTPException(status.HTTP_404_NOT_FOUND)
+    return await _image_response(request, timeline_event_image, get_variant_dir(recipe_id), name, w, fmt)
 
 
 @router.get("/{recipe_id}/assets/{file_name}")
-async def get_recipe_asset(recipe_id: UUID4, file_name: str):
+async def get_recipe_asset(request: Request, recipe_id: UUID4, file_name: str):
     """Returns a recipe asset"""
     file = Recipe.directory_from_id(recipe_id).joinpath("assets", file_name)
 
-    try:
-        return FileResponse(file, content_disposition_type="attachment", filename=file_name)
-    except Exception as e:
-        raise HTTPException(status.HTTP_404_NOT_FOUND) from e
+    return media_file_response(request, file, filename=file_name)
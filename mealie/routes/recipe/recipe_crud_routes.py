@@ -23,6 +23,7 @@
 # Original source: https://github.com/mealie-recipes/mealie
 
 from collections import defaultdict
+from functools import partial
 from shutil import copyfileobj
 from uuid import UUID
 
@@ -83,6 +84,7 @@ from mealie.services.event_bus_service.event_types import (
     EventRecipeData,
     EventTypes,
 )
+from mealie.services.recipe.image_processor import update_recipe_image_key
 from mealie.services.recipe.recipe_data_service import (
     InvalidDomainError,
     NotAnImageError,
@@ -672,9 +674,10 @@ class RecipeController(BaseRecipeController):
     async def scrape_image_url(self, slug: str, url: ScrapeRecipe):
         recipe = self.mixins.get_one(slug)
         data_service = RecipeDataService(recipe.id)
+        key = cache.new_key(4)
 
         try:
-            await data_service.scrape_image(url.url)
+            await data_service.scrape_image(url.url, on_done=partial(update_recipe_image_key, recipe.id, key))
         except NotAnImageError as e:
             raise HTTPException(
                 status_code=400,
@@ -686,11 +689,10 @@ class RecipeController(BaseRecipeController):
                 detail=ErrorResponse.respond("Url is not from an allowed domain"),
             ) from e
 
-        recipe.image = cache.cache_key.new_key()
-
+        # the recipe is given this key once the image has been processed, so clients can wait for it
         return {
             **SuccessResponse.respond(message=self.t("recipe.image-updated")),
-            "image": recipe.image
+            "image": key
         }
 
     @router.put("/{slug}/image", response_model=UpdateImageResponse, tags=["Recipe: Images and Assets"])
@@ -1,9 +1,10 @@
 import shutil
 from functools import cached_property
 
-from fastapi import Depends, File, Form, HTTPException
+from fastapi import Depends, File, Form, HTTPException, status
 from pydantic import UUID4
 
+from mealie.pkgs import img
 from mealie.repos.all_repositories import get_repositories
 from mealie.routes._base import BaseCrudController, controller
 from mealie.routes._base.mixins import HttpRepo
@@ -18,6 +19,7 @@ from mealie.schema.recipe.recipe_timeline_events import (
 )
 from mealie.schema.recipe.request_helpers import UpdateImageResponse
 from mealie.schema.response.pagination import PaginationQuery
+from mealie.schema.response.responses import ErrorResponse
 from mealie.services import urls
 from mealie.services.event_bus_service.event_types import EventOperation, EventRecipeTimelineEventData, EventTypes
 from mealie.services.recipe.recipe_data_service import RecipeDataService
@@ -139,6 +141,11 @@ class RecipeTimelineEventsController(BaseCrudController):
     @router.put("/{item_id}/image", response_model=UpdateImageResponse)
     def update_event_image(self, item_id: UUID4, image: bytes = File(...), extension: str = Form(...)):
         event = self.mixins.get_one(item_id)
+        if not img.PillowMinifier.is_image(image):
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, ErrorResponse.respond("Invalid image"))
+
+        # the event is marked as having an image as soon as this returns, so the image is processed right away
+        # rather than in the image processor, where clients could request it before it's ready
         data_service = RecipeDataService(event.recipe_id)
         data_service.write_image(image, extension, event.image_dir)
 
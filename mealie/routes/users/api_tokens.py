@@ -3,6 +3,7 @@ from datetime import timedelta
 from fastapi import HTTPException, status
 
 from mealie.core.security import create_access_token
+from mealie.core.security.token_cache import get_token_cache
 from mealie.routes._base import BaseUserController, controller
 from mealie.routes._base.routers import UserAPIRouter
 from mealie.schema.user import (
@@ -44,6 +45,8 @@ class UserApiTokensController(BaseUserController):
         new_token_in_db = self.repos.api_tokens.create(token_model)
 
         if new_token_in_db:
+            # cached copies of this user carry a stale token list
+            get_token_cache().invalidate_user(self.user.id)
             return new_token_in_db
 
     @router.delete("/api-tokens/{token_id}", response_model=DeleteTokenResponse)
@@ -56,6 +59,8 @@ class UserApiTokensController(BaseUserController):
 
         if token.user.email == self.user.email:
             deleted_token = self.repos.api_tokens.delete(token_id)
+            get_token_cache().invalidate_token(token.token)
+            get_token_cache().invalidate_user(self.user.id)
             return DeleteTokenResponse(token_delete=deleted_token.name)
         else:
             raise HTTPException(status.HTTP_403_FORBIDDEN)
@@ -3,6 +3,7 @@ from pydantic import UUID4
 
 from mealie.core.security import hash_password
 from mealie.core.security.providers.credentials_provider import CredentialsProvider
+from mealie.core.security.token_cache import get_token_cache
 from mealie.db.models.users.users import AuthMethod
 from mealie.routes._base import BaseUserController, controller
 from mealie.routes._base.routers import UserAPIRouter
@@ -60,6 +61,7 @@ class UserController(BaseUserController):
                 ErrorResponse.respond("Failed to update password"),
             ) from e
 
+        get_token_cache().invalidate_user(self.user.id)
         return SuccessResponse.respond(self.t("user.password-updated"))
 
     @user_router.put("/{item_id}")
@@ -74,4 +76,5 @@ class UserController(BaseUserController):
                 ErrorResponse.respond("Failed to update user"),
             ) from e
 
+        get_token_cache().invalidate_user(item_id)
         return SuccessResponse.respond(self.t("user.user-updated"))
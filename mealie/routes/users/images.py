@@ -9,6 +9,7 @@ from mealie.pkgs import cache, img
 from mealie.routes._base import BaseUserController, controller
 from mealie.routes._base.routers import UserAPIRouter
 from mealie.routes.users._helpers import assert_user_change_allowed
+from mealie.schema.response.responses import ErrorResponse
 from mealie.schema.user import PrivateUser
 
 router = UserAPIRouter(prefix="", tags=["Users: Images"])
@@ -33,6 +34,11 @@ class UserImageController(BaseUserController):
             with temp_img.open("wb") as buffer:
                 shutil.copyfileobj(profile.file, buffer)
 
+            if not img.PillowMinifier.is_image(temp_img):
+                raise HTTPException(status.HTTP_400_BAD_REQUEST, ErrorResponse.respond("Invalid image"))
+
+            # profile images are small, so they're converted right away rather than in the image processor;
+            # clients refetch the image as soon as the request returns
             image = img.PillowMinifier.to_webp(temp_img)
             dest = PrivateUser.get_directory(id) / "profile.webp"
 
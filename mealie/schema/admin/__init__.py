@@ -1,8 +1,17 @@
 # This file is auto-generated by gen_schema_exports.py
-from .about import AdminAboutInfo, AppInfo, AppStartupInfo, AppStatistics, AppTheme, CheckAppConfig
+from .about import (
+    AdminAboutInfo,
+    AppInfo,
+    AppStartupInfo,
+    AppStatistics,
+    AppTheme,
+    CheckAppConfig,
+    HasherStatistics,
+)
 from .backup import AllBackups, BackupFile, BackupOptions, CreateBackup, ImportJob
 from .debug import DebugResponse
 from .email import EmailReady, EmailSuccess, EmailTest
+from .event_outbox import EventOutboxDestinationType, EventOutboxEntry, EventOutboxStatus, EventOutboxSummary
 from .maintenance import MaintenanceLogs, MaintenanceStorageDetails, MaintenanceSummary
 from .migration import ChowdownURL, MigrationFile, MigrationImport, Migrations
 from .restore import (
@@ -15,6 +24,7 @@ from .restore import (
     SettingsImport,
     UserImport,
 )
+from .scheduler import ScheduledJobOut, ScheduledJobRunOut, ScheduledJobStatus
 from .settings import CustomPageBase, CustomPageOut
 
 __all__ = [
@@ -25,6 +35,9 @@ __all__ = [
     "MigrationFile",
     "MigrationImport",
     "Migrations",
+    "ScheduledJobOut",
+    "ScheduledJobRunOut",
+    "ScheduledJobStatus",
     "CustomPageBase",
     "CustomPageOut",
     "CommentImport",
@@ -46,8 +59,13 @@ __all__ = [
     "AppStatistics",
     "AppTheme",
     "CheckAppConfig",
+    "HasherStatistics",
     "EmailReady",
     "EmailSuccess",
     "EmailTest",
+    "EventOutboxDestinationType",
+    "EventOutboxEntry",
+    "EventOutboxStatus",
+    "EventOutboxSummary",
     "DebugResponse",
 ]
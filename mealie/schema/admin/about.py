@@ -10,6 +10,16 @@ class AppStatistics(MealieModel):
     untagged_recipes: int
 
 
+class HasherStatistics(MealieModel):
+    workers: int
+    max_queue: int
+    in_flight: int
+    completed: int
+    rejected: int
+    average_wait_ms: float
+    average_duration_ms: float
+
+
 class AppInfo(MealieModel):
     production: bool
     version: str
@@ -0,0 +1,48 @@
+import enum
+from datetime import datetime
+
+from pydantic import UUID4, ConfigDict
+
+from mealie.schema._mealie import MealieModel
+
+
+class EventOutboxStatus(str, enum.Enum):
+    pending = "pending"
+    delivered = "delivered"
+    dead = "dead"
+
+
+class EventOutboxDestinationType(str, enum.Enum):
+    apprise = "apprise"
+    webhook = "webhook"
+
+
+class EventOutboxSummary(MealieModel):
+    pending: int
+    in_progress: int
+    delivered: int
+    dead: int
+    oldest_pending_seconds: float | None = None
+    """age of the oldest delivery that is still waiting to be sent"""
+    average_latency_ms: float | None = None
+    """average time from publishing to delivery over the last hour"""
+    max_latency_ms: float | None = None
+
+
+class EventOutboxEntry(MealieModel):
+    id: UUID4
+    group_id: UUID4
+    household_id: UUID4 | None = None
+    event_id: UUID4
+    event_type: str
+    destination_type: EventOutboxDestinationType
+    destination_key: str
+    """the scheme and host of the destination; full URLs are never exposed as they often contain credentials"""
+    status: EventOutboxStatus
+    attempts: int
+    next_attempt_at: datetime
+    delivered_at: datetime | None = None
+    last_error: str | None = None
+    created_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
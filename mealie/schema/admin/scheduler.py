@@ -0,0 +1,43 @@
+import enum
+from datetime import datetime
+
+from pydantic import ConfigDict
+
+from mealie.schema._mealie import MealieModel
+
+
+class ScheduledJobStatus(str, enum.Enum):
+    success = "success"
+    failed = "failed"
+
+
+class ScheduledJobOut(MealieModel):
+    name: str
+    schedule: str
+    running: bool = False
+    """whether a Mealie worker currently holds the job's lease"""
+    locked_by: str | None = None
+    last_started_at: datetime | None = None
+    last_finished_at: datetime | None = None
+    last_duration_ms: float | None = None
+    last_status: ScheduledJobStatus | None = None
+    last_error: str | None = None
+    run_count: int = 0
+    failure_count: int = 0
+    average_duration_ms: float | None = None
+    """average duration of the job's recorded runs"""
+    max_duration_ms: float | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ScheduledJobRunOut(MealieModel):
+    job_name: str
+    worker: str
+    started_at: datetime
+    finished_at: datetime
+    duration_ms: float
+    status: ScheduledJobStatus
+    error: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -21,6 +21,9 @@ from .group_recipe_action import (
 from .group_shopping_list import (
     ShoppingListAddRecipeParams,
     ShoppingListAddRecipeParamsBulk,
+    ShoppingListChange,
+    ShoppingListChangesOut,
+    ShoppingListChangeType,
     ShoppingListCreate,
     ShoppingListItemBase,
     ShoppingListItemCreate,
@@ -115,6 +118,9 @@ __all__ = [
     "SaveInviteToken",
     "ShoppingListAddRecipeParams",
     "ShoppingListAddRecipeParamsBulk",
+    "ShoppingListChange",
+    "ShoppingListChangesOut",
+    "ShoppingListChangeType",
     "ShoppingListCreate",
     "ShoppingListItemBase",
     "ShoppingListItemCreate",
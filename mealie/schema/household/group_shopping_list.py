@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import Enum
 from uuid import UUID
 
 from pydantic import UUID4, ConfigDict, field_validator, model_validator
@@ -151,6 +152,22 @@ class ShoppingListItemsCollectionOut(MealieModel):
     deleted_items: list[ShoppingListItemOut] = []
 
 
+class ShoppingListChangeType(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+
+
+class ShoppingListChange(MealieModel):
+    """A change to a shopping list, pushed to clients subscribed to the list's change feed"""
+
+    shopping_list_id: UUID4
+    type: ShoppingListChangeType
+
+    # items are only included for item changes; list-level changes (e.g. renaming the list) don't have any
+    items: list[ShoppingListItemOut] = []
+
+
 class ShoppingListMultiPurposeLabelCreate(MealieModel):
     shopping_list_id: UUID4
     label_id: UUID4
@@ -285,6 +302,21 @@ class ShoppingListOut(ShoppingListUpdate):
         ]
 
 
+class ShoppingListChangesOut(MealieModel):
+    """The changes to a shopping list since a version (or time) the client last synced"""
+
+    # the list's current version, which clients pass as `since` on their next sync
+    version: int
+
+    # if the changes since the requested version are no longer known, every item is returned
+    # and clients should replace their copy of the list
+    reset: bool = False
+
+    shopping_list: ShoppingListSummary
+    items: list[ShoppingListItemOut] = []
+    deleted_item_ids: list[UUID4] = []
+
+
 class ShoppingListAddRecipeParams(MealieModel):
     recipe_increment_quantity: float = 1
     recipe_ingredients: list[RecipeIngredient] | None = None
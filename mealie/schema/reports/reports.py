@@ -17,6 +17,7 @@ class ReportCategory(str, enum.Enum):
     migration = "migration"
     bulk_import = "bulk_import"
     ai_image_generation = "ai_image_generation"
+    recipe_refresh = "recipe_refresh"
 
 
 class ReportSummaryStatus(str, enum.Enum):
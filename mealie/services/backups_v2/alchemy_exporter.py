@@ -56,7 +56,25 @@ class AlchemyExporter(BaseService):
     engine: base.Engine
     meta: MetaData
 
-    look_for_datetime = {"created_at", "update_at", "date_updated", "timestamp", "expires_at", "locked_at", "last_made"}
+    look_for_datetime = {
+        "created_at",
+        "update_at",
+        "date_updated",
+        "timestamp",
+        "expires_at",
+        "locked_at",
+        "last_made",
+        "next_attempt_at",
+        "locked_until",
+        "delivered_at",
+        "pruned_at",
+        "last_started_at",
+        "last_finished_at",
+        "started_at",
+        "finished_at",
+        "checked_at",
+        "changed_at",
+    }
     look_for_date = {"date_added", "date"}
     look_for_time = {"scheduled_time"}
 
@@ -35,7 +35,7 @@ class BackupV2(BaseService):
         # sourcery skip: merge-nested-ifs, reintroduce-else, remove-redundant-continue
         exclude = {"mealie.db", "mealie.log", ".secret"}
         exclude_ext = {".zip"}
-        exclude_dirs = {"backups", ".temp"}
+        exclude_dirs = {"backups", ".temp", ".cache"}
 
         timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y.%m.%d.%H.%M.%S")
 
@@ -52,7 +52,8 @@ class BackupV2(BaseService):
                     continue
 
                 if data_file.is_file() and data_file.suffix not in exclude_ext:
-                    if data_file.parent.name in exclude_dirs:
+                    # caches can be nested, like .cache/scraped-html/index.db
+                    if exclude_dirs.intersection(data_file.relative_to(self.directories.DATA_DIR).parts[:-1]):
                         continue
 
                     zip_file.write(data_file, f"data/{data_file.relative_to(self.directories.DATA_DIR)}")
@@ -61,7 +62,8 @@ class BackupV2(BaseService):
 
     def _copy_data(self, data_path: Path) -> None:
         for f in data_path.iterdir():
-            if f.is_file():
+            # older backups include the cache, but it's in use and is rebuilt as needed
+            if f.is_file() or f.name == ".cache":
                 continue
 
             shutil.rmtree(self.directories.DATA_DIR / f.name)
@@ -1,34 +1,40 @@
 import contextlib
 import json
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from collections.abc import Generator
 from datetime import UTC, datetime
 from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import UUID4
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, select
 from sqlalchemy.orm.session import Session
 
 from mealie.db.db_setup import session_context
 from mealie.db.models.household.webhooks import GroupWebhooksModel
 from mealie.repos.repository_factory import AllRepositories
+from mealie.schema.admin.event_outbox import EventOutboxDestinationType
 from mealie.schema.household.group_events import GroupEventNotifierPrivate
 from mealie.schema.household.webhook import ReadWebhook
 
 from .event_types import Event, EventDocumentType, EventTypes, EventWebhookData
 from .publisher import ApprisePublisher, PublisherLike, WebhookPublisher
+from .subscriber_cache import get_subscriber_cache
 
 
 class EventListenerBase(ABC):
+    destination_type: EventOutboxDestinationType
     _session: Session | None = None
     _repos: AllRepositories | None = None
 
-    def __init__(self, group_id: UUID4, household_id: UUID4, publisher: PublisherLike) -> None:
+    def __init__(
+        self, group_id: UUID4, household_id: UUID4, publisher: PublisherLike, session: Session | None = None
+    ) -> None:
         self.group_id = group_id
         self.household_id = household_id
         self.publisher = publisher
-        self._session = None
+        self._session = session
         self._repos = None
 
     @abstractmethod
@@ -41,6 +47,14 @@ class EventListenerBase(ABC):
         """Publishes the event to all subscribers"""
         ...
 
+    @abstractmethod
+    def get_destinations(self, event: Event, subscribers: list) -> list[str]:
+        """
+        Prepares the event for delivery and returns the URL of each subscriber it should be sent to.
+        Used to write the event to the outbox instead of publishing it immediately.
+        """
+        ...
+
     @contextlib.contextmanager
     def ensure_session(self) -> Generator[Session, None, None]:
         """
@@ -70,23 +84,41 @@ class EventListenerBase(ABC):
 
 
 class AppriseEventListener(EventListenerBase):
-    def __init__(self, group_id: UUID4, household_id: UUID4) -> None:
-        super().__init__(group_id, household_id, ApprisePublisher())
+    destination_type = EventOutboxDestinationType.apprise
+
+    def __init__(self, group_id: UUID4, household_id: UUID4, session: Session | None = None) -> None:
+        super().__init__(group_id, household_id, ApprisePublisher(household_id=household_id), session)
 
     def get_subscribers(self, event: Event) -> list[str]:
+        urls_by_event_type = get_subscriber_cache().get_notifier_urls(
+            self.group_id, self.household_id, self.get_notifier_urls
+        )
+        if not (urls := urls_by_event_type.get(event.event_type.name)):
+            return []
+
+        return AppriseEventListener.update_urls_with_event_data(urls, event)
+
+    def get_notifier_urls(self) -> dict[str, list[str]]:
+        """Fetches the Apprise URL of every enabled notifier, grouped by the event types it's subscribed to"""
         with self.ensure_repos(self.group_id, self.household_id) as repos:
             notifiers: list[GroupEventNotifierPrivate] = repos.group_event_notifier.multi_query(
                 {"enabled": True}, override_schema=GroupEventNotifierPrivate
             )
 
-            urls = [notifier.apprise_url for notifier in notifiers if getattr(notifier.options, event.event_type.name)]
-            urls = AppriseEventListener.update_urls_with_event_data(urls, event)
+        urls_by_event_type: dict[str, list[str]] = defaultdict(list)
+        for notifier in notifiers:
+            for event_type in EventTypes:
+                if getattr(notifier.options, event_type.name, False):
+                    urls_by_event_type[event_type.name].append(notifier.apprise_url)
 
-        return urls
+        return dict(urls_by_event_type)
 
     def publish_to_subscribers(self, event: Event, subscribers: list[str]) -> None:
         self.publisher.publish(event, subscribers)
 
+    def get_destinations(self, event: Event, subscribers: list[str]) -> list[str]:
+        return subscribers
+
     @staticmethod
     def update_urls_with_event_data(urls: list[str], event: Event):
         params = {
@@ -132,8 +164,10 @@ class AppriseEventListener(EventListenerBase):
 
 
 class WebhookEventListener(EventListenerBase):
-    def __init__(self, group_id: UUID4, household_id: UUID4) -> None:
-        super().__init__(group_id, household_id, WebhookPublisher())
+    destination_type = EventOutboxDestinationType.webhook
+
+    def __init__(self, group_id: UUID4, household_id: UUID4, session: Session | None = None) -> None:
+        super().__init__(group_id, household_id, WebhookPublisher(), session)
 
     def get_subscribers(self, event: Event) -> list[ReadWebhook]:
         # we only care about events that contain webhook information
@@ -146,9 +180,13 @@ class WebhookEventListener(EventListenerBase):
         return scheduled_webhooks
 
     def publish_to_subscribers(self, event: Event, subscribers: list[ReadWebhook]) -> None:
+        if destinations := self.get_destinations(event, subscribers):
+            self.publisher.publish(event, destinations)
+
+    def get_destinations(self, event: Event, subscribers: list[ReadWebhook]) -> list[str]:
         with self.ensure_repos(self.group_id, self.household_id) as repos:
             if not isinstance(event.document_data, EventWebhookData):
-                return
+                return []
 
             match event.document_data.document_type:
                 case EventDocumentType.mealplan:
@@ -163,17 +201,46 @@ class WebhookEventListener(EventListenerBase):
                         event.document_data.webhook_body = event.document_data.webhook_body or []
 
             # Only publish to subscribers if we have a webhook body to send
-            if event.document_data.webhook_body is not None:
-                self.publisher.publish(event, [webhook.url for webhook in subscribers])
+            if event.document_data.webhook_body is None:
+                return []
+
+            return [webhook.url for webhook in subscribers]
 
     def get_scheduled_webhooks(self, start_dt: datetime, end_dt: datetime) -> list[ReadWebhook]:
         """Fetches all scheduled webhooks from the database"""
         with self.ensure_session() as session:
             stmt = select(GroupWebhooksModel).where(
-                GroupWebhooksModel.enabled == True,  # noqa: E712 - required for SQLAlchemy comparison
-                GroupWebhooksModel.scheduled_time > start_dt.astimezone(UTC).time(),
-                GroupWebhooksModel.scheduled_time <= end_dt.astimezone(UTC).time(),
+                *self.scheduled_webhooks_filter(start_dt, end_dt),
                 GroupWebhooksModel.group_id == self.group_id,
                 GroupWebhooksModel.household_id == self.household_id,
             )
             return session.execute(stmt).scalars().all()
+
+    @staticmethod
+    def scheduled_webhooks_filter(start_dt: datetime, end_dt: datetime) -> list[ColumnElement[bool]]:
+        """Filters enabled webhooks scheduled between `start_dt` (exclusive) and `end_dt` (inclusive)"""
+        return [
+            GroupWebhooksModel.enabled == True,  # noqa: E712 - required for SQLAlchemy comparison
+            GroupWebhooksModel.scheduled_time > start_dt.astimezone(UTC).time(),
+            GroupWebhooksModel.scheduled_time <= end_dt.astimezone(UTC).time(),
+        ]
+
+    @staticmethod
+    def get_households_with_scheduled_webhooks(
+        session: Session,
+        start_dt: datetime,
+        end_dt: datetime,
+        group_id: UUID4 | None = None,
+        household_id: UUID4 | None = None,
+    ) -> list[tuple[UUID4, UUID4]]:
+        """Fetches the (group_id, household_id) of every household with webhooks scheduled in the window"""
+        stmt = select(GroupWebhooksModel.group_id, GroupWebhooksModel.household_id).where(
+            *WebhookEventListener.scheduled_webhooks_filter(start_dt, end_dt),
+            GroupWebhooksModel.household_id.is_not(None),
+        )
+        if group_id:
+            stmt = stmt.where(GroupWebhooksModel.group_id == group_id)
+        if household_id:
+            stmt = stmt.where(GroupWebhooksModel.household_id == household_id)
+
+        return [(row.group_id, row.household_id) for row in session.execute(stmt.distinct())]
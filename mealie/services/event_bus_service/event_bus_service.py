@@ -1,9 +1,11 @@
+from collections.abc import Sequence
+
 from fastapi import BackgroundTasks, Depends
 from pydantic import UUID4
 from sqlalchemy.orm.session import Session
 
 from mealie.core.config import get_app_settings
-from mealie.db.db_setup import generate_session
+from mealie.db.db_setup import generate_session, session_context
 from mealie.repos.all_repositories import get_repositories
 from mealie.schema.response.pagination import PaginationQuery
 from mealie.services.event_bus_service.event_bus_listeners import (
@@ -11,6 +13,8 @@ from mealie.services.event_bus_service.event_bus_listeners import (
     EventListenerBase,
     WebhookEventListener,
 )
+from mealie.services.event_bus_service.event_outbox import EventOutboxRepository, get_event_outbox_worker
+from mealie.services.event_bus_service.subscriber_cache import get_subscriber_cache
 
 from .event_types import Event, EventBusMessage, EventDocumentDataBase, EventTypes
 
@@ -51,17 +55,28 @@ class EventBusService:
         self.bg = bg
         self.session = session
 
-    def _get_listeners(self, group_id: UUID4, household_id: UUID4) -> list[EventListenerBase]:
+    def _get_listeners(self, group_id: UUID4, household_id: UUID4, session: Session) -> list[EventListenerBase]:
         return [
-            AppriseEventListener(group_id, household_id),
-            WebhookEventListener(group_id, household_id),
+            AppriseEventListener(group_id, household_id, session),
+            WebhookEventListener(group_id, household_id, session),
         ]
 
-    def _publish_event(self, event: Event, group_id: UUID4, household_id: UUID4) -> None:
-        """Publishes the event to all listeners"""
-        for listener in self._get_listeners(group_id, household_id):
-            if subscribers := listener.get_subscribers(event):
-                listener.publish_to_subscribers(event, subscribers)
+    def _publish_events(self, events: list[Event], group_id: UUID4, household_id: UUID4, session: Session) -> int:
+        """
+        Writes a pending delivery to the event outbox for each subscriber of each listener,
+        returning the number of deliveries written
+        """
+        outbox = EventOutboxRepository(session)
+        count = 0
+        for listener in self._get_listeners(group_id, household_id, session):
+            for event in events:
+                if not (subscribers := listener.get_subscribers(event)):
+                    continue
+                if destinations := listener.get_destinations(event, subscribers):
+                    outbox.add(event, group_id, household_id, listener.destination_type, destinations)
+                    count += len(destinations)
+
+        return count
 
     def dispatch(
         self,
@@ -72,28 +87,67 @@ class EventBusService:
         document_data: EventDocumentDataBase | None,
         message: str = "",
     ) -> None:
-        event = Event(
-            message=EventBusMessage.from_type(event_type, body=message),
-            event_type=event_type,
-            integration_id=integration_id,
-            document_data=document_data,
-        )
+        self.dispatch_many(integration_id, group_id, household_id, [(event_type, document_data)], message)
+
+    def dispatch_many(
+        self,
+        integration_id: str,
+        group_id: UUID4,
+        household_id: UUID4 | None,
+        documents: Sequence[tuple[EventTypes, EventDocumentDataBase | None]],
+        message: str = "",
+    ) -> None:
+        """
+        Dispatches an event for each event type and document. Subscribers are resolved once for the whole
+        batch and every delivery is written to the outbox in a single commit.
+        """
+        if not documents:
+            return
+
+        events = [
+            Event(
+                message=EventBusMessage.from_type(event_type, body=message),
+                event_type=event_type,
+                integration_id=integration_id,
+                document_data=document_data,
+            )
+            for event_type, document_data in documents
+        ]
 
         if not household_id:
             if not self.session:
                 raise ValueError("Session is required if household_id is not provided")
 
-            repos = get_repositories(self.session, group_id=group_id)
-            households = repos.households.page_all(PaginationQuery(page=1, per_page=-1)).items
-            household_ids = [household.id for household in households]
+            household_ids = get_subscriber_cache().get_household_ids(
+                group_id, lambda: self._get_household_ids(group_id)
+            )
         else:
             household_ids = [household_id]
 
-        for household_id in household_ids:
-            if self.bg:
-                self.bg.add_task(self._publish_event, event=event, group_id=group_id, household_id=household_id)
-            else:
-                self._publish_event(event, group_id, household_id)
+        # events are written to the outbox before returning, so they're never lost if the process stops,
+        # and are delivered in the background by the outbox worker
+        if self.session:
+            enqueued = self._enqueue(events, group_id, household_ids, self.session)
+        else:
+            with session_context() as session:
+                enqueued = self._enqueue(events, group_id, household_ids, session)
+
+        if enqueued:
+            get_event_outbox_worker().notify()
+
+    def _get_household_ids(self, group_id: UUID4) -> list[UUID4]:
+        repos = get_repositories(self.session, group_id=group_id)
+        households = repos.households.page_all(PaginationQuery(page=1, per_page=-1)).items
+        return [household.id for household in households]
+
+    def _enqueue(self, events: list[Event], group_id: UUID4, household_ids: list[UUID4], session: Session) -> int:
+        enqueued = sum(self._publish_events(events, group_id, household_id, session) for household_id in household_ids)
+
+        # nothing to commit if no one is subscribed to the events
+        if enqueued:
+            session.commit()
+
+        return enqueued
 
     @classmethod
     def as_dependency(
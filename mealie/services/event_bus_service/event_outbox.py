@@ -0,0 +1,454 @@
+import asyncio
+import contextlib
+import json
+import threading
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+import httpx
+from pydantic import UUID4
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm.session import Session
+
+from mealie.core import root_logger
+from mealie.core.config import get_app_settings
+from mealie.db.db_setup import session_context
+from mealie.db.models.household.events import EventOutboxModel
+from mealie.schema.admin.event_outbox import (
+    EventOutboxDestinationType,
+    EventOutboxEntry,
+    EventOutboxStatus,
+    EventOutboxSummary,
+)
+
+from .event_types import Event
+from .publisher import ApprisePublisher, WebhookPublisher, create_http_client, serialize_event
+
+logger = root_logger.get_logger()
+
+MAX_RETRY_DELAY = timedelta(hours=1)
+LEASE_DURATION = timedelta(minutes=5)
+"""how long a claimed delivery is reserved for a worker; deliveries held by a worker that died are retried after this"""
+
+
+def get_destination_key(destination: str) -> str:
+    """Returns the scheme and host of a destination, which is what per-destination limits are applied to"""
+    try:
+        parts = urlsplit(destination)
+        host = parts.hostname or ""
+    except ValueError:
+        return destination.split(":", 1)[0].lower()
+
+    return f"{parts.scheme.lower()}://{host}"
+
+
+def get_retry_delay(attempts: int, base_delay: float) -> timedelta:
+    """Exponential backoff: `base_delay` after the first failure, doubling after each one, capped at an hour"""
+    delay = base_delay * 2 ** min(max(attempts - 1, 0), 32)
+    return timedelta(seconds=min(delay, MAX_RETRY_DELAY.total_seconds()))
+
+
+@dataclass(slots=True)
+class OutboxDelivery:
+    """A claimed outbox row, detached from the session it was loaded in"""
+
+    id: UUID4
+    household_id: UUID4 | None
+    destination_type: EventOutboxDestinationType
+    destination: str
+    destination_key: str
+    payload: str
+    attempts: int
+
+
+class EventOutboxRepository:
+    """Reads and writes the event outbox table using the provided session"""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def add(
+        self,
+        event: Event,
+        group_id: UUID4,
+        household_id: UUID4 | None,
+        destination_type: EventOutboxDestinationType,
+        destinations: list[str],
+    ) -> None:
+        """Adds a pending delivery for each destination. The caller is responsible for committing the session"""
+
+        # the event is serialized once and shared by every destination
+        payload = serialize_event(event)
+        now = datetime.now(UTC)
+
+        self.session.add_all(
+            [
+                EventOutboxModel(
+                    group_id=group_id,
+                    household_id=household_id,
+                    event_id=event.event_id,
+                    event_type=event.event_type.name,
+                    destination_type=destination_type.value,
+                    destination=destination,
+                    destination_key=get_destination_key(destination),
+                    payload=payload,
+                    status=EventOutboxStatus.pending.value,
+                    attempts=0,
+                    next_attempt_at=now,
+                )
+                for destination in destinations
+            ]
+        )
+
+    def claim(self, limit: int, exclude_keys: set[str] | None = None) -> list[OutboxDelivery]:
+        """
+        Leases up to `limit` deliveries that are due. Rows are claimed by stamping them with a unique token,
+        so when several processes race for the same rows each row is only ever handed to one of them.
+        """
+        if limit <= 0:
+            return []
+
+        now = datetime.now(UTC)
+        claimable = and_(
+            EventOutboxModel.status == EventOutboxStatus.pending.value,
+            EventOutboxModel.next_attempt_at <= now,
+            or_(EventOutboxModel.locked_until.is_(None), EventOutboxModel.locked_until < now),
+        )
+
+        stmt = select(EventOutboxModel.id).where(claimable)
+        if exclude_keys:
+            stmt = stmt.where(EventOutboxModel.destination_key.not_in(exclude_keys))
+
+        ids = self.session.execute(stmt.order_by(EventOutboxModel.next_attempt_at).limit(limit)).scalars().all()
+        if not ids:
+            return []
+
+        token = uuid4().hex
+        self.session.execute(
+            update(EventOutboxModel)
+            .where(EventOutboxModel.id.in_(ids), claimable)
+            .values(locked_by=token, locked_until=now + LEASE_DURATION)
+        )
+        self.session.commit()
+
+        rows = self.session.execute(
+            select(EventOutboxModel).where(EventOutboxModel.id.in_(ids), EventOutboxModel.locked_by == token)
+        ).scalars()
+
+        return [
+            OutboxDelivery(
+                id=row.id,
+                household_id=row.household_id,
+                destination_type=EventOutboxDestinationType(row.destination_type),
+                destination=row.destination,
+                destination_key=row.destination_key,
+                payload=row.payload,
+                attempts=row.attempts,
+            )
+            for row in rows
+        ]
+
+    def release(self, ids: list[UUID4]) -> None:
+        """Returns claimed deliveries to the queue without counting an attempt"""
+        if not ids:
+            return
+
+        self.session.execute(
+            update(EventOutboxModel).where(EventOutboxModel.id.in_(ids)).values(locked_by=None, locked_until=None)
+        )
+        self.session.commit()
+
+    def mark_delivered(self, id: UUID4) -> None:
+        self.session.execute(
+            update(EventOutboxModel)
+            .where(EventOutboxModel.id == id)
+            .values(
+                status=EventOutboxStatus.delivered.value,
+                attempts=EventOutboxModel.attempts + 1,
+                delivered_at=datetime.now(UTC),
+                locked_by=None,
+                locked_until=None,
+                last_error=None,
+            )
+        )
+        self.session.commit()
+
+    def mark_failed(self, id: UUID4, attempts: int, error: str, max_attempts: int, retry_delay: float) -> None:
+        """Schedules the delivery to be retried, or moves it to the dead-letter state once it's out of attempts"""
+        attempts += 1
+        status = EventOutboxStatus.dead if attempts >= max_attempts else EventOutboxStatus.pending
+
+        self.session.execute(
+            update(EventOutboxModel)
+            .where(EventOutboxModel.id == id)
+            .values(
+                status=status.value,
+                attempts=attempts,
+                next_attempt_at=datetime.now(UTC) + get_retry_delay(attempts, retry_delay),
+                locked_by=None,
+                locked_until=None,
+                last_error=error[:1000],
+            )
+        )
+        self.session.commit()
+
+    def retry(self, id: UUID4) -> bool:
+        """Moves a dead-lettered delivery back into the queue, returning `False` if there was nothing to retry"""
+        result = self.session.execute(
+            update(EventOutboxModel)
+            .where(EventOutboxModel.id == id, EventOutboxModel.status == EventOutboxStatus.dead.value)
+            .values(
+                status=EventOutboxStatus.pending.value,
+                attempts=0,
+                next_attempt_at=datetime.now(UTC),
+                locked_by=None,
+                locked_until=None,
+            )
+        )
+        self.session.commit()
+        return result.rowcount > 0  # type: ignore
+
+    def purge(self, status: EventOutboxStatus, older_than: datetime) -> int:
+        result = self.session.execute(
+            delete(EventOutboxModel).where(
+                EventOutboxModel.status == status.value, EventOutboxModel.update_at < older_than
+            )
+        )
+        self.session.commit()
+        return result.rowcount  # type: ignore
+
+    def get_entries(self, status: EventOutboxStatus, limit: int = 100) -> list[EventOutboxEntry]:
+        stmt = (
+            select(EventOutboxModel)
+            .where(EventOutboxModel.status == status.value)
+            .order_by(EventOutboxModel.created_at.desc())
+            .limit(limit)
+        )
+        return [EventOutboxEntry.model_validate(row) for row in self.session.execute(stmt).scalars()]
+
+    def summary(self) -> EventOutboxSummary:
+        now = datetime.now(UTC)
+        counts: dict[str, int] = defaultdict(int)
+
+        stmt = select(EventOutboxModel.status, func.count()).group_by(EventOutboxModel.status)
+        for status, count in self.session.execute(stmt):
+            counts[status] = count
+
+        in_progress = self.session.execute(
+            select(func.count()).where(
+                EventOutboxModel.status == EventOutboxStatus.pending.value, EventOutboxModel.locked_until >= now
+            )
+        ).scalar_one()
+
+        oldest_pending = self.session.execute(
+            select(func.min(EventOutboxModel.created_at)).where(
+                EventOutboxModel.status == EventOutboxStatus.pending.value
+            )
+        ).scalar()
+
+        # latency is computed in Python since date arithmetic isn't portable between database engines
+        recent = self.session.execute(
+            select(EventOutboxModel.created_at, EventOutboxModel.delivered_at).where(
+                EventOutboxModel.status == EventOutboxStatus.delivered.value,
+                EventOutboxModel.delivered_at >= now - timedelta(hours=1),
+            )
+        ).all()
+        latencies = [
+            (delivered_at - created_at).total_seconds() * 1000
+            for created_at, delivered_at in recent
+            if created_at and delivered_at
+        ]
+
+        return EventOutboxSummary(
+            pending=counts[EventOutboxStatus.pending.value] - in_progress,
+            in_progress=in_progress,
+            delivered=counts[EventOutboxStatus.delivered.value],
+            dead=counts[EventOutboxStatus.dead.value],
+            oldest_pending_seconds=(now - oldest_pending).total_seconds() if oldest_pending else None,
+            average_latency_ms=sum(latencies) / len(latencies) if latencies else None,
+            max_latency_ms=max(latencies) if latencies else None,
+        )
+
+
+async def deliver(delivery: OutboxDelivery, client: httpx.AsyncClient) -> None:
+    """Sends a single delivery, raising if it could not be delivered"""
+    match delivery.destination_type:
+        case EventOutboxDestinationType.apprise:
+            message = json.loads(delivery.payload).get("message") or {}
+            await ApprisePublisher(hard_fail=True, household_id=delivery.household_id).send(
+                message.get("title", ""), message.get("body", ""), delivery.destination
+            )
+        case EventOutboxDestinationType.webhook:
+            # the payload was serialized when the event was published, so it's sent as-is
+            await WebhookPublisher(hard_fail=True, client=client).send(delivery.destination, delivery.payload)
+
+
+class EventOutboxWorker:
+    """
+    Drains the event outbox. The worker runs its own event loop on a background thread: it claims due
+    deliveries in batches and sends up to `workers` of them concurrently over a shared, keep-alive HTTP
+    client, never running more than `max_per_destination` deliveries to the same host at once so one slow
+    or rate-limited destination can't starve the others. Every Mealie worker process runs its own outbox
+    worker; leases on the outbox rows keep them from sending the same delivery twice.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        retry_delay: float,
+        max_per_destination: int,
+        deliver_fn: Callable[[OutboxDelivery, httpx.AsyncClient], Awaitable[None]] = deliver,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.max_per_destination = max(1, max_per_destination)
+        self.deliver_fn = deliver_fn
+
+        self.client: httpx.AsyncClient | None = None
+        self._active_by_key: dict[str, int] = defaultdict(int)
+        self._tasks: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), name="event-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10) -> None:
+        self._stopping.set()
+        self.notify()
+
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self) -> None:
+        """Wakes the worker so newly published events are delivered without waiting for the next poll"""
+        if self._loop and self._wake and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+
+        async with create_http_client(max_connections=self.workers) as client:
+            self.client = client
+            while not self._stopping.is_set():
+                try:
+                    submitted = await self.process_batch()
+                except Exception:
+                    logger.exception("Failed to process the event outbox")
+                    submitted = 0
+
+                if not submitted:
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                    self._wake.clear()
+
+            await self.join()
+            self.client = None
+
+    async def join(self) -> None:
+        """Waits for every delivery that has been started to finish"""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _saturated_keys(self) -> set[str]:
+        return {key for key, count in self._active_by_key.items() if count >= self.max_per_destination}
+
+    def _claim(self, limit: int, exclude_keys: set[str]) -> list[OutboxDelivery]:
+        with session_context() as session:
+            return EventOutboxRepository(session).claim(limit, exclude_keys=exclude_keys)
+
+    def _release(self, ids: list[UUID4]) -> None:
+        with session_context() as session:
+            EventOutboxRepository(session).release(ids)
+
+    async def process_batch(self) -> int:
+        """Claims due deliveries and starts sending them, returning the number started"""
+        capacity = min(self.batch_size, self.workers - len(self._tasks))
+        if capacity <= 0:
+            return 0
+
+        # database calls are blocking, so they're run off the event loop
+        deliveries = await asyncio.to_thread(self._claim, capacity, self._saturated_keys())
+
+        to_release: list[UUID4] = []
+        for delivery in deliveries:
+            if self._active_by_key[delivery.destination_key] >= self.max_per_destination:
+                to_release.append(delivery.id)
+                continue
+
+            self._active_by_key[delivery.destination_key] += 1
+            task = asyncio.create_task(self._deliver(delivery))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        # deliveries over the per-destination limit go straight back to the queue for a later batch
+        if to_release:
+            await asyncio.to_thread(self._release, to_release)
+
+        return len(deliveries) - len(to_release)
+
+    async def _deliver(self, delivery: OutboxDelivery) -> None:
+        error: str | None = None
+        try:
+            await self.deliver_fn(delivery, self.client)  # type: ignore
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Failed to deliver event to {delivery.destination_key}: {error}")
+
+        try:
+            await asyncio.to_thread(self._record_result, delivery, error)
+        except Exception:
+            # the lease will expire and the delivery will be retried
+            logger.exception("Failed to record the result of an event delivery")
+        finally:
+            self._active_by_key[delivery.destination_key] -= 1
+            if not self._active_by_key[delivery.destination_key]:
+                del self._active_by_key[delivery.destination_key]
+
+            if self._wake:
+                self._wake.set()
+
+    def _record_result(self, delivery: OutboxDelivery, error: str | None) -> None:
+        with session_context() as session:
+            repo = EventOutboxRepository(session)
+            if error is None:
+                repo.mark_delivered(delivery.id)
+            else:
+                repo.mark_failed(delivery.id, delivery.attempts, error, self.max_attempts, self.retry_delay)
+
+
+@lru_cache(maxsize=1)
+def get_event_outbox_worker() -> EventOutboxWorker:
+    settings = get_app_settings()
+    return EventOutboxWorker(
+        workers=settings.EVENT_OUTBOX_WORKERS,
+        batch_size=settings.EVENT_OUTBOX_BATCH_SIZE,
+        poll_interval=settings.EVENT_OUTBOX_POLL_INTERVAL,
+        max_attempts=settings.EVENT_OUTBOX_MAX_ATTEMPTS,
+        retry_delay=settings.EVENT_OUTBOX_RETRY_DELAY,
+        max_per_destination=settings.EVENT_OUTBOX_MAX_PER_DESTINATION,
+    )
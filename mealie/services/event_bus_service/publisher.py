@@ -1,49 +1,186 @@
-from typing import Protocol
+import asyncio
+import hashlib
+import json
+import threading
+from collections.abc import Coroutine
+from typing import Any, Protocol
+from urllib.parse import parse_qs, urlsplit
 
 import apprise
-import requests
+import httpx
 from fastapi.encoders import jsonable_encoder
+from pydantic import UUID4
 
+from mealie.core import root_logger
+from mealie.pkgs.cache import MemoryCacheBackend
 from mealie.services.event_bus_service.event_types import Event
 
+logger = root_logger.get_logger()
+
+WEBHOOK_TIMEOUT = 15
+MAX_CONCURRENT_PUBLISHES = 10
+
+
+def _run_publish(coro: Coroutine[Any, Any, None]) -> None:
+    """
+    Runs a publish from synchronous code on an event loop of its own. Unlike `asyncio.run`, this leaves the
+    calling thread's event loop alone, so later `asyncio.get_event_loop()` calls in the thread still work.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(coro)
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+
+
+def create_http_client(max_connections: int = MAX_CONCURRENT_PUBLISHES) -> httpx.AsyncClient:
+    """
+    Creates the client used to deliver webhooks. Connections are kept alive and reused between deliveries,
+    so the client should be shared for as long as possible rather than created per request.
+    """
+    return httpx.AsyncClient(
+        timeout=WEBHOOK_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30,
+        ),
+    )
+
+
+def serialize_event(event: Event) -> str:
+    return json.dumps(jsonable_encoder(event))
+
+
+def raise_or_log_failures(results: list, hard_fail: bool) -> None:
+    for result in results:
+        if not isinstance(result, Exception):
+            continue
+        if hard_fail:
+            raise result
+
+        logger.error(f"Failed to publish event: {type(result).__name__}: {result}")
+
 
 class PublisherLike(Protocol):
     def publish(self, event: Event, notification_urls: list[str]): ...
 
 
+class _HouseholdAppriseInstances:
+    """
+    Configured Apprise instances, one per household. Building an Apprise URL parses and validates it and
+    instantiates its plugin, so each URL is added to its household's instance once and tagged, then reused
+    for every notification sent to it.
+    """
+
+    def __init__(self, max_households: int = 256, timeout: float = 3600) -> None:
+        # entries expire so URLs removed from a household's notifiers don't linger
+        self._instances = MemoryCacheBackend(max_entries=max_households, default_timeout=timeout)
+        self._lock = threading.Lock()
+
+    def get(self, household_id: UUID4, url: str, asset: apprise.AppriseAsset) -> tuple[apprise.Apprise, str]:
+        """Returns the household's Apprise instance and the tag to notify `url` with"""
+        tag = hashlib.sha1(url.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+        with self._lock:
+            entry: tuple[apprise.Apprise, set[str]] | None = self._instances.get(str(household_id))
+            if entry is None:
+                entry = (apprise.Apprise(asset=asset), set())
+                self._instances.set(str(household_id), entry)
+
+            instance, tags = entry
+            if tag not in tags:
+                if not instance.add(url, tag=tag):
+                    raise ValueError("Apprise URL Add Failed")
+                tags.add(tag)
+
+        return instance, tag
+
+
+_household_apprise_instances = _HouseholdAppriseInstances()
+
+
 class ApprisePublisher:
-    def __init__(self, hard_fail=False) -> None:
-        asset = apprise.AppriseAsset(
+    def __init__(self, hard_fail=False, household_id: UUID4 | None = None) -> None:
+        self.asset = apprise.AppriseAsset(
             async_mode=True,
             image_url_mask="https://raw.githubusercontent.com/mealie-recipes/mealie/9571816ac4eed5beacfc0abf6c03eff1427fd0eb/frontend/static/icons/android-chrome-maskable-512x512.png",
         )
-        self.apprise = apprise.Apprise(asset=asset)
         self.hard_fail = hard_fail
+        self.household_id = household_id
 
-    def publish(self, event: Event, notification_urls: list[str]):
-        """Publishses a list of notification URLs"""
+    @staticmethod
+    def _is_event_specific(url: str) -> bool:
+        """URLs carrying event data as custom parameters are unique to one event, so they're never reused"""
+        return any(key.startswith(":") for key in parse_qs(urlsplit(url).query))
 
-        tags = []
-        for dest in notification_urls:
-            # we tag the url so it only sends each notification once
-            tag = str(event.event_id)
-            tags.append(tag)
+    def _get_instance(self, notification_url: str) -> tuple[apprise.Apprise, str | None]:
+        if self.household_id is None or self._is_event_specific(notification_url):
+            instance = apprise.Apprise(asset=self.asset)
+            if not instance.add(notification_url):
+                raise ValueError("Apprise URL Add Failed")
+            return instance, None
 
-            status = self.apprise.add(dest, tag=tag)
+        return _household_apprise_instances.get(self.household_id, notification_url, self.asset)
 
-            if not status and self.hard_fail:
-                raise Exception("Apprise URL Add Failed")
+    def publish(self, event: Event, notification_urls: list[str]):
+        """Publishses a list of notification URLs"""
+        _run_publish(self.publish_async(event, notification_urls))
+
+    async def publish_async(self, event: Event, notification_urls: list[str]) -> None:
+        results = await asyncio.gather(
+            *[self.send(event.message.title, event.message.body, url) for url in notification_urls],
+            return_exceptions=True,
+        )
+        raise_or_log_failures(results, self.hard_fail)
 
-        self.apprise.notify(title=event.message.title, body=event.message.body, tag=tags)
+    async def send(self, title: str, body: str, notification_url: str) -> None:
+        """Sends a single notification, raising if it could not be delivered"""
+        instance, tag = self._get_instance(notification_url)
+        sent = await instance.async_notify(title=title, body=body, tag=tag or apprise.common.MATCH_ALL_TAG)
+        if not sent:
+            raise RuntimeError("Apprise notification failed")
 
 
 class WebhookPublisher:
-    def __init__(self, hard_fail=False) -> None:
+    def __init__(self, hard_fail=False, client: httpx.AsyncClient | None = None) -> None:
         self.hard_fail = hard_fail
+        self.client = client
 
     def publish(self, event: Event, notification_urls: list[str]):
-        event_payload = jsonable_encoder(event)
-        for url in notification_urls:
-            r = requests.post(url, json=event_payload, timeout=15)
-            if self.hard_fail:
-                r.raise_for_status()
+        _run_publish(self.publish_async(event, notification_urls))
+
+    async def publish_async(self, event: Event, notification_urls: list[str]) -> None:
+        """Posts the event to every URL concurrently; the payload is serialized once and shared by every URL"""
+        payload = serialize_event(event)
+
+        if self.client is not None:
+            await self._fan_out(self.client, payload, notification_urls)
+            return
+
+        async with create_http_client() as client:
+            await self._fan_out(client, payload, notification_urls)
+
+    async def _fan_out(self, client: httpx.AsyncClient, payload: str, notification_urls: list[str]) -> None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PUBLISHES)
+
+        async def post(url: str) -> None:
+            async with semaphore:
+                await self.send(url, payload, client)
+
+        results = await asyncio.gather(*[post(url) for url in notification_urls], return_exceptions=True)
+        raise_or_log_failures(results, self.hard_fail)
+
+    async def send(self, url: str, payload: str, client: httpx.AsyncClient | None = None) -> None:
+        """Posts an already serialized event to a single webhook"""
+        client = client or self.client
+        if client is None:
+            async with create_http_client(max_connections=1) as temp_client:
+                return await self.send(url, payload, temp_client)
+
+        r = await client.post(
+            url, content=payload, headers={"Content-Type": "application/json"}, timeout=WEBHOOK_TIMEOUT
+        )
+        if self.hard_fail:
+            r.raise_for_status()
@@ -0,0 +1,132 @@
+from collections.abc import Callable
+from functools import lru_cache
+from uuid import UUID
+
+from pydantic import UUID4
+from sqlalchemy import Connection, event, select
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from mealie.core.cache import get_cache
+from mealie.db.models.household import GroupEventNotifierModel, GroupEventNotifierOptionsModel, Household
+from mealie.pkgs.cache import CacheBackend
+
+
+class EventSubscriberCache:
+    """
+    Caches what the event bus needs to resolve the subscribers of an event: the Apprise URLs of each household,
+    by event type, and the household ids of each group. Entries are invalidated when the underlying notifiers or
+    households are committed, so dispatching an event with no subscribers doesn't touch the database.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    @staticmethod
+    def _notifiers_key(group_id: UUID4 | str, household_id: UUID4 | str) -> str:
+        return f"notifiers:{group_id}:{household_id}"
+
+    @staticmethod
+    def _households_key(group_id: UUID4 | str) -> str:
+        return f"households:{group_id}"
+
+    def get_notifier_urls(
+        self, group_id: UUID4, household_id: UUID4, loader: Callable[[], dict[str, list[str]]]
+    ) -> dict[str, list[str]]:
+        """Returns the household's Apprise URLs keyed by event type name, calling `loader` on a cache miss"""
+        key = self._notifiers_key(group_id, household_id)
+        urls_by_event_type: dict[str, list[str]] | None = self.backend.get(key)
+        if urls_by_event_type is None:
+            urls_by_event_type = loader()
+            self.backend.set(key, urls_by_event_type)
+
+        return urls_by_event_type
+
+    def get_household_ids(self, group_id: UUID4, loader: Callable[[], list[UUID4]]) -> list[UUID4]:
+        """Returns the ids of every household in the group, calling `loader` on a cache miss"""
+        key = self._households_key(group_id)
+        household_ids: list[str] | None = self.backend.get(key)
+        if household_ids is None:
+            household_ids = [str(household_id) for household_id in loader()]
+            self.backend.set(key, household_ids)
+
+        return [UUID(household_id) for household_id in household_ids]
+
+    def invalidate_notifiers(self, group_id: UUID4 | str, household_id: UUID4 | str) -> None:
+        self.backend.delete(self._notifiers_key(group_id, household_id))
+
+    def invalidate_households(self, group_id: UUID4 | str) -> None:
+        self.backend.delete(self._households_key(group_id))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+@lru_cache(maxsize=1)
+def get_subscriber_cache() -> EventSubscriberCache:
+    return EventSubscriberCache(get_cache("event_subscribers", max_entries=1000, default_timeout=600))
+
+
+# =============================================================================
+# Invalidation
+#
+# Changes are collected while the session flushes and only applied once it commits, so another request
+# can't re-populate the cache with rows that are about to change. Entries are also dropped at flush time
+# so the session making the change never reads its own stale entries.
+
+_PENDING_KEY = "event_subscriber_cache_invalidations"
+
+
+def _mark(target: object, invalidation: tuple[str, ...]) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(invalidation)
+
+    _apply({invalidation})
+
+
+def _apply(invalidations: set[tuple[str, ...]]) -> None:
+    cache = get_subscriber_cache()
+    for kind, *ids in invalidations:
+        if kind == "notifiers":
+            cache.invalidate_notifiers(*ids)
+        else:
+            cache.invalidate_households(*ids)
+
+
+@event.listens_for(GroupEventNotifierModel, "after_insert")
+@event.listens_for(GroupEventNotifierModel, "after_update")
+@event.listens_for(GroupEventNotifierModel, "after_delete")
+def _invalidate_notifier(_: Mapper, __: Connection, target: GroupEventNotifierModel) -> None:
+    if target.group_id and target.household_id:
+        _mark(target, ("notifiers", str(target.group_id), str(target.household_id)))
+
+
+@event.listens_for(GroupEventNotifierOptionsModel, "after_insert")
+@event.listens_for(GroupEventNotifierOptionsModel, "after_update")
+@event.listens_for(GroupEventNotifierOptionsModel, "after_delete")
+def _invalidate_notifier_options(_: Mapper, connection: Connection, target: GroupEventNotifierOptionsModel) -> None:
+    # options can change without their notifier row changing, so the notifier's household is looked up here
+    stmt = select(GroupEventNotifierModel.group_id, GroupEventNotifierModel.household_id).where(
+        GroupEventNotifierModel.id == target.event_notifier_id
+    )
+    if (row := connection.execute(stmt).first()) and row.group_id and row.household_id:
+        _mark(target, ("notifiers", str(row.group_id), str(row.household_id)))
+
+
+@event.listens_for(Household, "after_insert")
+@event.listens_for(Household, "after_update")
+@event.listens_for(Household, "after_delete")
+def _invalidate_household(_: Mapper, __: Connection, target: Household) -> None:
+    _mark(target, ("households", str(target.group_id)))
+    _mark(target, ("notifiers", str(target.group_id), str(target.id)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session: Session) -> None:
+    if invalidations := session.info.pop(_PENDING_KEY, None):
+        _apply(invalidations)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from collections.abc import AsyncGenerator
+from functools import lru_cache
+
+from pydantic import UUID4
+
+from mealie.core import root_logger
+from mealie.core.config import get_app_settings
+from mealie.schema.household.group_shopping_list import ShoppingListChange
+
+logger = root_logger.get_logger()
+
+FEED_HEARTBEAT_INTERVAL = 15
+"""Seconds between keep-alive comments, so idle connections aren't closed by proxies"""
+
+FEED_MAX_PENDING_CHANGES = 100
+"""Number of changes buffered for a subscriber before it's considered too slow and disconnected"""
+
+
+class _Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=max_pending)
+
+    def put(self, message: str) -> None:
+        """Queues a message for the subscriber; must be called on the subscriber's event loop"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # the client isn't keeping up; end its stream so it reconnects and reloads the list
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class ShoppingListFeed:
+    """
+    Pushes shopping list changes to the clients subscribed to each list, so they don't need to poll.
+    Changes are published from any thread (e.g. sync route handlers) and streamed as Server-Sent Events
+    from the subscriber's event loop.
+
+    Subscribers are tracked per process. With several workers, a client only hears about changes made
+    through its own worker, so `complete` is false and clients keep polling for the rest.
+    """
+
+    def __init__(
+        self,
+        heartbeat_interval: float = FEED_HEARTBEAT_INTERVAL,
+        max_pending: int = FEED_MAX_PENDING_CHANGES,
+        complete: bool = True,
+    ) -> None:
+        self.heartbeat_interval = heartbeat_interval
+        self.max_pending = max_pending
+        self.complete = complete
+
+        self._lock = threading.Lock()
+        self._subscriptions: dict[UUID4, set[_Subscription]] = defaultdict(set)
+
+    def subscriber_count(self, shopping_list_id: UUID4) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(shopping_list_id, ()))
+
+    def publish(self, change: ShoppingListChange) -> None:
+        """Sends a change to every subscriber of its shopping list. This is a no-op if there are no subscribers."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(change.shopping_list_id, ()))
+        if not subscriptions:
+            return
+
+        # serialize once, no matter how many clients are listening
+        message = change.model_dump_json(by_alias=True)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # the subscriber's event loop has been closed
+                self._unsubscribe(change.shopping_list_id, subscription)
+
+    def _subscribe(self, shopping_list_id: UUID4) -> _Subscription:
+        subscription = _Subscription(asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            self._subscriptions[shopping_list_id].add(subscription)
+
+        return subscription
+
+    def _unsubscribe(self, shopping_list_id: UUID4, subscription: _Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(shopping_list_id)
+            if subscriptions is None:
+                return
+
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[shopping_list_id]
+
+    async def stream(self, shopping_list_id: UUID4) -> AsyncGenerator[str, None]:
+        """Yields Server-Sent Events for changes to the shopping list until the client disconnects"""
+        subscription = self._subscribe(shopping_list_id)
+        try:
+            # tell the client the feed is live, and whether it still needs to poll for changes the feed won't see
+            yield f"event: ready\ndata: {json.dumps({'complete': self.complete})}\n\n"
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), timeout=self.heartbeat_interval)
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if message is None:
+                    logger.debug(f"Shopping list feed subscriber for {shopping_list_id} fell behind")
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+
+                yield f"event: change\ndata: {message}\n\n"
+        finally:
+            self._unsubscribe(shopping_list_id, subscription)
+
+
+@lru_cache(maxsize=1)
+def get_shopping_list_feed() -> ShoppingListFeed:
+    return ShoppingListFeed(complete=get_app_settings().WORKERS == 1)
@@ -1,5 +1,6 @@
 import json
 from datetime import timedelta
+from functools import partial
 from pathlib import Path
 from typing import cast
 
@@ -8,6 +9,7 @@ import yaml
 from PIL import UnidentifiedImageError
 from pydantic import UUID4
 
+from mealie.services.recipe.image_processor import update_recipe_image_key
 from mealie.services.recipe.recipe_data_service import RecipeDataService
 
 
@@ -129,7 +131,7 @@ async def scrape_image(image_url: str, recipe_id: UUID4):
     data_service = RecipeDataService(recipe_id=recipe_id)
 
     try:
-        await data_service.scrape_image(image_url)
+        await data_service.scrape_image(image_url, on_done=partial(update_recipe_image_key, recipe_id))
     except UnidentifiedImageError:
         return
 
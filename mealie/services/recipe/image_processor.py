@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from pydantic import UUID4
+
+from mealie.core.config import get_app_settings
+from mealie.core.root_logger import get_logger
+from mealie.db.db_setup import session_context
+from mealie.pkgs import img
+from mealie.repos.all_repositories import get_repositories
+
+logger = get_logger()
+
+
+def minify_image(image_path: Path) -> None:
+    """Writes the WebP variants of an uploaded image, removing the upload. Runs in an image pool process"""
+    img.PillowMinifier(purge=True).minify(image_path)
+
+
+class ImageProcessor:
+    """
+    A small pool of worker processes for converting and minifying uploaded images, so decoding and encoding a
+    large photo doesn't hold up the request that uploaded it. At most `queue_size` images wait for a worker;
+    once the queue is full, the caller processes its image itself, which slows down uploads instead of letting
+    pending images pile up in memory.
+
+    `on_done` callbacks run in a background thread, once the image has been processed.
+    """
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+
+        self._pending = threading.BoundedSemaphore(self.queue_size)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        # callbacks may use the database, so they're kept off the thread that manages the worker processes
+        self._callbacks = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-callbacks")
+
+    def submit(self, fn: Callable[..., Any], *args, on_done: Callable[[], None] | None = None) -> bool:
+        """Queues `fn` for a worker process, returning `False` if the queue is full and nothing was queued"""
+        if not self._pending.acquire(blocking=False):
+            return False
+
+        def finished(future: Future) -> None:
+            self._pending.release()
+            if exception := future.exception():
+                logger.error(f"Failed to process image: {exception}")
+            elif on_done is not None:
+                self._callbacks.submit(_call_logged, on_done)
+
+        try:
+            self._executor.submit(fn, *args).add_done_callback(finished)
+        except Exception:
+            self._pending.release()
+            raise
+
+        return True
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._callbacks.shutdown(wait=False)
+
+
+def _call_logged(fn: Callable[[], None]) -> None:
+    try:
+        fn()
+    except Exception:
+        logger.exception("Failed to finish processing an image")
+
+
+@lru_cache(maxsize=1)
+def get_image_processor() -> ImageProcessor | None:
+    """Returns the shared image processor, or `None` if images are processed where they're uploaded"""
+    settings = get_app_settings()
+    if settings.TESTING:
+        return None
+
+    workers = settings.IMAGE_PROCESSING_WORKERS or min(2, os.cpu_count() or 1)
+    return ImageProcessor(workers, settings.IMAGE_PROCESSING_QUEUE_SIZE)
+
+
+def process_image(fn: Callable[..., Any], *args, on_done: Callable[[], None] | None = None) -> None:
+    """
+    Runs `fn` in the image processor, or right away if there isn't one or its queue is full.
+    `on_done` is called once `fn` finishes, so it's the place to update any cache key for the image.
+
+    Since `fn` may run in the calling thread, async code should call this through `asyncio.to_thread`.
+    """
+
+    processor = get_image_processor()
+    if processor is not None and processor.submit(fn, *args, on_done=on_done):
+        return
+
+    fn(*args)
+    if on_done is not None:
+        on_done()
+
+
+def update_recipe_image_key(recipe_id: UUID4, key: str | None = None) -> None:
+    """
+    Gives a recipe a new image cache key, so clients fetch its newly processed image. Pass in the `key` when
+    it was already handed to a client, so the client can tell when the image is ready.
+    """
+    with session_context() as session:
+        recipe = get_repositories(session, group_id=None, household_id=None).recipes.get_one(recipe_id, "id")
+        if recipe is None:
+            # the recipe hasn't been saved yet, and will be saved with a new key
+            return
+
+        get_repositories(session, group_id=recipe.group_id, household_id=None).recipes.update_image(
+            recipe.slug, key=key
+        )
@@ -0,0 +1,76 @@
+from enum import Enum
+from pathlib import Path
+
+from PIL import Image
+
+from mealie.core.config import get_app_dirs
+from mealie.pkgs import img
+
+VARIANT_WIDTHS = (160, 320, 480, 640, 960, 1280, 1920)
+"""the widths an image can be resized to; other widths are rounded up, so each image has a handful of variants"""
+
+
+class ImageVariantFormat(str, Enum):
+    webp = "webp"
+    avif = "avif"
+
+
+IMAGE_FORMATS = {
+    ImageVariantFormat.webp: img.WEBP,
+    ImageVariantFormat.avif: img.AVIF,
+}
+
+MEDIA_TYPES = {
+    img.WEBP.suffix: "image/webp",
+    img.AVIF.suffix: "image/avif",
+}
+
+
+def variant_width(width: int) -> int:
+    """The smallest allowed width that's at least `width`, or the largest allowed width"""
+    return next((allowed for allowed in VARIANT_WIDTHS if allowed >= width), VARIANT_WIDTHS[-1])
+
+
+def get_variant_dir(recipe_id: str) -> Path:
+    """Where the image variants of a recipe are cached; they're removed along with the recipe's data"""
+    return get_app_dirs().CACHE_DIR.joinpath("image-variants", str(recipe_id))
+
+
+def get_image_variant(
+    source: Path,
+    variant_dir: Path,
+    name: str,
+    width: int | None = None,
+    variant_format: ImageVariantFormat | None = None,
+) -> Path:
+    """
+    Returns `source` resized to one of `VARIANT_WIDTHS` and/or converted to another format, creating it if it
+    isn't cached yet. Variants are cached in `variant_dir` under `name`, and keyed by the modification time of
+    `source`, so a new image never gets a variant of the old one. Images are never enlarged, and AVIF falls back
+    to WebP when Pillow can't encode it.
+    """
+
+    image_format = IMAGE_FORMATS[variant_format or ImageVariantFormat.webp]
+    if not img.is_supported(image_format):
+        image_format = img.WEBP
+
+    width = variant_width(width) if width else None
+    if width is None and image_format is img.WEBP:
+        return source
+
+    size = str(width) if width else "full"
+    dest = variant_dir.joinpath(f"{name}-{size}-{source.stat().st_mtime_ns}{image_format.suffix}")
+    if dest.exists():
+        return dest
+
+    if image_format is img.WEBP and width:
+        with Image.open(source) as image:
+            if image.width <= width:
+                return source
+
+    # variants of an older version of the image won't be requested again
+    variant_dir.mkdir(parents=True, exist_ok=True)
+    for stale in variant_dir.glob(f"{name}-{size}-*{image_format.suffix}"):
+        stale.unlink(missing_ok=True)
+
+    return img.PillowMinifier().resize(source, dest, width, image_format)
@@ -1,5 +1,6 @@
 import asyncio
 import shutil
+from collections.abc import Callable
 from pathlib import Path
 
 from httpx import AsyncClient, Response
@@ -10,6 +11,8 @@ from mealie.pkgs.safehttp.transport import AsyncSafeTransport
 from mealie.schema.recipe.recipe import Recipe
 from mealie.schema.recipe.recipe_image_types import RecipeImageTypes
 from mealie.services._base_service import BaseService
+from mealie.services.recipe.image_processor import minify_image, process_image
+from mealie.services.recipe.image_variants import get_variant_dir
 from mealie.services.scraper.user_agents_manager import get_user_agents_manager
 
 
@@ -26,7 +29,11 @@ async def gather_with_concurrency(n, *coros, ignore_exceptions=False):
     return results
 
 
-async def largest_content_len(urls: list[str]) -> tuple[str, int]:
+async def largest_content_len(urls: list[str], client: AsyncClient | None = None) -> tuple[str, int]:
+    if client is None:
+        async with AsyncClient(transport=safehttp.AsyncSafeTransport()) as client:
+            return await largest_content_len(urls, client)
+
     user_agent_manager = get_user_agents_manager()
 
     largest_url = ""
@@ -37,14 +44,13 @@ async def largest_content_len(urls: list[str]) -> tuple[str, int]:
     async def do(client: AsyncClient, url: str) -> Response:
         return await client.head(url, headers=user_agent_manager.get_scrape_headers())
 
-    async with AsyncClient(transport=safehttp.AsyncSafeTransport()) as client:
-        tasks = [do(client, url) for url in urls]
-        responses: list[Response] = await gather_with_concurrency(max_concurrency, *tasks, ignore_exceptions=True)
-        for response in responses:
-            len_int = int(response.headers.get("Content-Length", 0))
-            if len_int > largest_len:
-                largest_url = str(response.url)
-                largest_len = len_int
+    tasks = [do(client, url) for url in urls]
+    responses: list[Response] = await gather_with_concurrency(max_concurrency, *tasks, ignore_exceptions=True)
+    for response in responses:
+        len_int = int(response.headers.get("Content-Length", 0))
+        if len_int > largest_len:
+            largest_url = str(response.url)
+            largest_len = len_int
 
     return largest_url, largest_len
 
@@ -84,7 +90,9 @@ class RecipeDataService(BaseService):
         except Exception as e:
             self.logger.exception(f"Failed to delete recipe data: {e}")
 
-    def write_image(self, file_data: bytes | Path, extension: str, image_dir: Path | None = None) -> Path:
+        shutil.rmtree(get_variant_dir(str(self.recipe_id)), ignore_errors=True)
+
+    def _write_original(self, file_data: bytes | Path, extension: str, image_dir: Path | None = None) -> Path:
         if not image_dir:
             image_dir = self.dir_image
 
@@ -101,10 +109,30 @@ class RecipeDataService(BaseService):
             with open(image_path, "ab") as f:
                 shutil.copyfileobj(file_data, f)
 
+        return image_path
+
+    def write_image(self, file_data: bytes | Path, extension: str, image_dir: Path | None = None) -> Path:
+        image_path = self._write_original(file_data, extension, image_dir)
         self.minifier.minify(image_path)
 
         return image_path
 
+    def write_image_in_background(
+        self,
+        file_data: bytes | Path,
+        extension: str,
+        image_dir: Path | None = None,
+        on_done: Callable[[], None] | None = None,
+    ) -> Path:
+        """
+        Saves the image and returns right away, minifying it in the image processor. The minified images
+        aren't ready until `on_done` is called, which is where any cache key for the image should be updated.
+        """
+        image_path = self._write_original(file_data, extension, image_dir)
+        process_image(minify_image, image_path, on_done=on_done)
+
+        return image_path
+
     def delete_image(self, image_dir: Path | None = None):
         if not image_dir:
             image_dir = self.dir_image
@@ -113,7 +141,28 @@ class RecipeDataService(BaseService):
             image_path = image_dir.joinpath(img_type.value)
             image_path.unlink(missing_ok=True)
 
-    async def scrape_image(self, image_url: str | dict[str, str] | list[str]) -> None:
+    async def scrape_image(
+        self,
+        image_url: str | dict[str, str] | list[str],
+        client: AsyncClient | None = None,
+        on_done: Callable[[], None] | None = None,
+    ) -> None:
+        """Downloads the image and minifies it in the background, calling `on_done` once it's ready"""
+        image = await self.fetch_image(image_url, client)
+        if image is None:
+            return None
+
+        # the image is minified right here when the image processor is busy, which mustn't block the event loop
+        await asyncio.to_thread(self.write_image_in_background, *image, on_done=on_done)
+
+    async def fetch_image(
+        self, image_url: str | dict[str, str] | list[str], client: AsyncClient | None = None
+    ) -> tuple[bytes, str] | None:
+        """Downloads the image without writing it, returning its content and extension"""
+        if client is None:
+            async with AsyncClient(transport=AsyncSafeTransport()) as client:
+                return await self.fetch_image(image_url, client)
+
         self.logger.info(f"Image URL: {image_url}")
         user_agent = get_user_agents_manager().user_agents[0]
 
@@ -126,7 +175,7 @@ class RecipeDataService(BaseService):
             # Multiple images have been defined in the schema - usually different resolutions
             # Typically would be in smallest->biggest order, but can't be certain so test each.
             # 'Google will pick the best image to display in Search results based on the aspect ratio and resolution.'
-            image_url_str, _ = await largest_content_len(image_url)
+            image_url_str, _ = await largest_content_len(image_url, client)
 
         elif isinstance(image_url, dict):  # Handles Dictionary Types
             for key in image_url:
@@ -141,27 +190,22 @@ class RecipeDataService(BaseService):
         if ext not in img.IMAGE_EXTENSIONS:
             ext = "jpg"  # Guess the extension
 
-        file_name = f"{self.recipe_id!s}.{ext}"
-        file_path = Recipe.directory_from_id(self.recipe_id).joinpath("images", file_name)
-
-        async with AsyncClient(transport=AsyncSafeTransport()) as client:
-            try:
-                r = await client.get(image_url_str, headers={"User-Agent": user_agent})
-            except Exception:
-                self.logger.exception("Fatal Image Request Exception")
-                return None
+        try:
+            r = await client.get(image_url_str, headers={"User-Agent": user_agent})
+        except Exception:
+            self.logger.exception("Fatal Image Request Exception")
+            return None
 
-            if r.status_code != 200:
-                # TODO: Probably should throw an exception in this case as well, but before these changes
-                # we were returning None if it failed anyways.
-                return None
+        if r.status_code != 200:
+            # TODO: Probably should throw an exception in this case as well, but before these changes
+            # we were returning None if it failed anyways.
+            return None
 
-            content_type = r.headers.get("content-type", "")
+        content_type = r.headers.get("content-type", "")
 
-            if "image" not in content_type:
-                self.logger.error(f"Content-Type: {content_type} is not an image")
-                raise NotAnImageError(f"Content-Type {content_type} is not an image")
+        if "image" not in content_type:
+            self.logger.error(f"Content-Type: {content_type} is not an image")
+            raise NotAnImageError(f"Content-Type {content_type} is not an image")
 
-            self.logger.debug(f"File Name Suffix {file_path.suffix}")
-            self.write_image(r.read(), file_path.suffix)
-            file_path.unlink(missing_ok=True)
+        self.logger.debug(f"File Name Suffix .{ext}")
+        return r.read(), ext
@@ -21,6 +21,7 @@ import json
 import os
 import shutil
 from datetime import UTC, datetime
+from functools import partial
 from pathlib import Path
 from shutil import copytree, rmtree
 from typing import Any
@@ -51,6 +52,7 @@ from mealie.services._base_service import BaseService
 from mealie.services.household_services.household_service import HouseholdService
 from mealie.services.openai import OpenAIDataInjection, OpenAILocalImage, OpenAIService
 from mealie.schema.openai.auto_tag import OpenAIRecipeTags
+from mealie.services.recipe.image_processor import update_recipe_image_key
 from mealie.services.recipe.recipe_data_service import RecipeDataService
 from mealie.services.scraper import cleaner
 
@@ -471,10 +473,15 @@ class RecipeService(RecipeServiceBase):
         if not self.can_update(recipe):
             raise exceptions.PermissionDenied("You do not have permission to edit this recipe.")
 
+        # the recipe's image key is updated once the image has been processed, so clients never cache a
+        # half-processed image under the new key; the key is returned now, so clients can wait for it
+        key = cache.new_key(4)
         data_service = RecipeDataService(recipe.id)
-        data_service.write_image(image, extension)
+        data_service.write_image_in_background(
+            image, extension, on_done=partial(update_recipe_image_key, recipe.id, key)
+        )
 
-        return self.group_recipes.update_image(slug, extension)
+        return key
 
     def delete_recipe_image(self, slug: str) -> None:
         recipe = self.get_one(slug)
@@ -0,0 +1,88 @@
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import ColumnElement, Row, delete, select
+from sqlalchemy.orm.session import Session
+
+from mealie.core import root_logger
+from mealie.db.models._model_base import SqlAlchemyBase
+
+logger = root_logger.get_logger()
+
+PURGE_BATCH_SIZE = 500
+"""max number of rows deleted per statement; each batch is committed on its own, so locks are only held briefly"""
+
+PURGE_TIME_BUDGET = timedelta(seconds=30)
+"""how long a purge task may run; whatever is left over is purged on the task's next run"""
+
+
+@dataclass(slots=True)
+class PurgeStats:
+    """Tracks the rows removed by a single run of a purge task, and whether it ran out of time"""
+
+    name: str
+    time_budget: timedelta = PURGE_TIME_BUDGET
+    removed: int = 0
+    batches: int = 0
+    complete: bool = True
+    _start: float = field(default_factory=time.perf_counter)
+
+    @property
+    def duration_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def out_of_time(self) -> bool:
+        return time.perf_counter() - self._start >= self.time_budget.total_seconds()
+
+    def add_batch(self, removed: int) -> None:
+        self.removed += removed
+        self.batches += 1
+
+    def log(self) -> None:
+        message = f"{self.name}: removed {self.removed} rows in {self.batches} batches ({self.duration_ms:.0f}ms)"
+        if self.complete:
+            logger.info(message)
+        else:
+            logger.warning(f"{message}; ran out of time, the rest will be purged on the next run")
+
+
+def delete_in_batches(
+    session: Session,
+    model: type[SqlAlchemyBase],
+    *where: ColumnElement[bool],
+    stats: PurgeStats,
+    batch_size: int = PURGE_BATCH_SIZE,
+    returning: Sequence[Any] = (),
+    on_batch: Callable[[Sequence[Row]], None] | None = None,
+) -> PurgeStats:
+    """
+    Deletes every row of `model` matching `where` with `DELETE ... WHERE id IN (SELECT id ... LIMIT n)`
+    statements, committing after each one, until there's nothing left or the time budget runs out.
+
+    If `returning` columns are provided, they're returned for each deleted row and passed to `on_batch`
+    once the batch has been committed (e.g. to remove files belonging to the deleted rows).
+    """
+
+    model_id = model.id  # type: ignore
+    stmt = delete(model).where(model_id.in_(select(model_id).where(*where).limit(batch_size)))
+    if returning:
+        stmt = stmt.returning(*returning)
+
+    while not stats.out_of_time():
+        result = session.execute(stmt, execution_options={"synchronize_session": False})
+        rows = result.all() if returning else []
+        removed = len(rows) if returning else result.rowcount  # type: ignore
+        session.commit()
+
+        if removed:
+            stats.add_batch(removed)
+        if on_batch and rows:
+            on_batch(rows)
+        if removed < batch_size:
+            return stats
+
+    stats.complete = False
+    return stats
@@ -0,0 +1,293 @@
+import asyncio
+import os
+import socket
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from uuid import uuid4
+
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.session import Session
+from starlette.concurrency import run_in_threadpool
+
+from mealie.core import root_logger
+from mealie.core.config import get_app_settings
+from mealie.db.db_setup import session_context
+from mealie.db.models.server.scheduler import ScheduledJobModel, ScheduledJobRunModel
+from mealie.schema.admin.scheduler import ScheduledJobOut, ScheduledJobRunOut, ScheduledJobStatus
+
+logger = root_logger.get_logger()
+
+LEASE_DURATION = timedelta(minutes=2)
+"""how long a job is reserved for a worker; it's renewed while the job runs, so this only matters if the worker dies"""
+
+MAX_RUN_HISTORY = 50
+"""number of runs kept for each job"""
+
+DUE_FACTOR = 0.9
+"""
+a job is due once this fraction of its interval has passed since it last started. Every worker ticks on its own
+clock, so this is what keeps the first worker to tick each period the only one running the job
+"""
+
+
+def get_worker_id() -> str:
+    """Identifies this process in job leases and run history"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+
+
+class ScheduledJobRepository:
+    """Reads and writes scheduled job state using the provided session"""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def ensure(self, name: str, schedule: str) -> None:
+        """Creates the job's row if it doesn't exist yet"""
+        if self.session.execute(select(ScheduledJobModel.id).where(ScheduledJobModel.name == name)).first():
+            return
+
+        try:
+            self.session.add(ScheduledJobModel(name=name, schedule=schedule, run_count=0, failure_count=0))
+            self.session.commit()
+        except IntegrityError:
+            # another worker created it first
+            self.session.rollback()
+
+    def acquire(self, name: str, worker: str, interval: timedelta, lease: timedelta = LEASE_DURATION) -> bool:
+        """
+        Leases the job if it isn't running anywhere and hasn't already been started this period. The lease is
+        taken with a single conditional update, so when several workers race for the same job only one wins.
+        """
+        now = datetime.now(UTC)
+        result = self.session.execute(
+            update(ScheduledJobModel)
+            .where(
+                ScheduledJobModel.name == name,
+                or_(ScheduledJobModel.locked_until.is_(None), ScheduledJobModel.locked_until < now),
+                or_(
+                    ScheduledJobModel.last_started_at.is_(None),
+                    ScheduledJobModel.last_started_at <= now - interval * DUE_FACTOR,
+                ),
+            )
+            .values(locked_by=worker, locked_until=now + lease, last_started_at=now)
+        )
+        self.session.commit()
+        return result.rowcount == 1  # type: ignore
+
+    def renew(self, name: str, worker: str, lease: timedelta = LEASE_DURATION) -> bool:
+        result = self.session.execute(
+            update(ScheduledJobModel)
+            .where(ScheduledJobModel.name == name, ScheduledJobModel.locked_by == worker)
+            .values(locked_until=datetime.now(UTC) + lease)
+        )
+        self.session.commit()
+        return result.rowcount == 1  # type: ignore
+
+    def finish(self, name: str, worker: str, started_at: datetime, duration_ms: float, error: str | None) -> None:
+        """Releases the job's lease and records the run"""
+        status = ScheduledJobStatus.failed if error else ScheduledJobStatus.success
+        finished_at = datetime.now(UTC)
+        error = error[:1000] if error else None
+
+        is_owner = ScheduledJobModel.locked_by == worker
+        self.session.execute(
+            update(ScheduledJobModel)
+            .where(ScheduledJobModel.name == name)
+            .values(
+                locked_by=case((is_owner, None), else_=ScheduledJobModel.locked_by),
+                locked_until=case((is_owner, None), else_=ScheduledJobModel.locked_until),
+                last_finished_at=finished_at,
+                last_duration_ms=duration_ms,
+                last_status=status.value,
+                last_error=error,
+                run_count=ScheduledJobModel.run_count + 1,
+                failure_count=ScheduledJobModel.failure_count + (1 if error else 0),
+            )
+        )
+
+        self.session.add(
+            ScheduledJobRunModel(
+                job_name=name,
+                worker=worker,
+                started_at=started_at,
+                finished_at=finished_at,
+                duration_ms=duration_ms,
+                status=status.value,
+                error=error,
+            )
+        )
+        self.session.flush()
+
+        recent = (
+            select(ScheduledJobRunModel.id)
+            .where(ScheduledJobRunModel.job_name == name)
+            .order_by(ScheduledJobRunModel.started_at.desc())
+            .limit(MAX_RUN_HISTORY)
+        )
+        self.session.execute(
+            delete(ScheduledJobRunModel).where(
+                ScheduledJobRunModel.job_name == name, ScheduledJobRunModel.id.not_in(recent.scalar_subquery())
+            )
+        )
+        self.session.commit()
+
+    def get_run_window(self, name: str) -> tuple[datetime | None, datetime | None]:
+        """
+        Returns when the job's previous recorded run started, and when its latest run started. While the job runs,
+        that's the time since it last ran, whichever worker ran it
+        """
+        started_at = self.session.execute(
+            select(ScheduledJobModel.last_started_at).where(ScheduledJobModel.name == name)
+        ).scalar_one_or_none()
+        if started_at is None:
+            return None, None
+
+        previous = self.session.execute(
+            select(ScheduledJobRunModel.started_at)
+            .where(ScheduledJobRunModel.job_name == name, ScheduledJobRunModel.started_at < started_at)
+            .order_by(ScheduledJobRunModel.started_at.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+
+        return previous, started_at
+
+    def get_jobs(self) -> list[ScheduledJobOut]:
+        now = datetime.now(UTC)
+        durations = {
+            name: (average, maximum)
+            for name, average, maximum in self.session.execute(
+                select(
+                    ScheduledJobRunModel.job_name,
+                    func.avg(ScheduledJobRunModel.duration_ms),
+                    func.max(ScheduledJobRunModel.duration_ms),
+                ).group_by(ScheduledJobRunModel.job_name)
+            )
+        }
+
+        jobs: list[ScheduledJobOut] = []
+        for row in self.session.execute(select(ScheduledJobModel).order_by(ScheduledJobModel.name)).scalars():
+            job = ScheduledJobOut.model_validate(row)
+            job.running = bool(row.locked_until and row.locked_until > now)
+            job.average_duration_ms, job.max_duration_ms = durations.get(row.name, (None, None))
+            jobs.append(job)
+
+        return jobs
+
+    def get_runs(self, name: str, limit: int = MAX_RUN_HISTORY) -> list[ScheduledJobRunOut] | None:
+        """Returns the job's most recent runs, or `None` if there's no job with that name"""
+        if not self.session.execute(select(ScheduledJobModel.id).where(ScheduledJobModel.name == name)).first():
+            return None
+
+        stmt = (
+            select(ScheduledJobRunModel)
+            .where(ScheduledJobRunModel.job_name == name)
+            .order_by(ScheduledJobRunModel.started_at.desc())
+            .limit(limit)
+        )
+        return [ScheduledJobRunOut.model_validate(row) for row in self.session.execute(stmt).scalars()]
+
+
+class JobRunner:
+    """
+    Runs the scheduler's jobs. Every Mealie worker runs the scheduler, so before running a job the runner
+    leases it in the database: a job never overlaps with itself, in this worker or any other, and runs once
+    per period no matter how many workers there are. Independent jobs run in parallel on the threadpool,
+    up to `max_concurrent` at a time, and each run's duration and outcome are recorded for admins.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        worker: str | None = None,
+        lease: timedelta = LEASE_DURATION,
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.worker = worker or get_worker_id()
+        self.lease = lease
+
+        self._running: set[str] = set()
+        self._known: set[str] = set()
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _acquire(self, name: str, schedule: str, interval: timedelta) -> datetime | None:
+        """Leases the job, returning when the run started, or `None` if it isn't this worker's to run"""
+        with session_context() as session:
+            repo = ScheduledJobRepository(session)
+            if name not in self._known:
+                repo.ensure(name, schedule)
+                self._known.add(name)
+
+            if not repo.acquire(name, self.worker, interval, self.lease):
+                return None
+
+            # runs are recorded with the job's own start time, so jobs can tell which times earlier runs covered
+            _, started_at = repo.get_run_window(name)
+            return started_at
+
+    def _renew(self, name: str) -> None:
+        with session_context() as session:
+            if not ScheduledJobRepository(session).renew(name, self.worker, self.lease):
+                logger.warning(f"Scheduled job '{name}' lost its lease while running")
+
+    def _finish(self, name: str, started_at: datetime, duration_ms: float, error: str | None) -> None:
+        with session_context() as session:
+            ScheduledJobRepository(session).finish(name, self.worker, started_at, duration_ms, error)
+
+    async def run_job(self, schedule: str, job: Callable[[], None], interval: timedelta) -> bool:
+        """Runs the job if it's due and not already running, returning whether it ran"""
+        name = job.__name__
+        if name in self._running:
+            logger.warning(f"Skipping scheduled job '{name}'; the previous run hasn't finished")
+            return False
+
+        self._running.add(name)
+        try:
+            started_at = await run_in_threadpool(self._acquire, name, schedule, interval)
+            if started_at is None:
+                logger.debug(f"Skipping scheduled job '{name}'; it has already run or is running elsewhere")
+                return False
+
+            start = time.perf_counter()
+            error: str | None = None
+
+            task = asyncio.ensure_future(run_in_threadpool(job))
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.lease.total_seconds() / 3)
+                if done:
+                    break
+
+                await run_in_threadpool(self._renew, name)
+
+            if exc := task.exception():
+                error = f"{type(exc).__name__}: {exc}"
+                logger.error("Error in scheduled task func='%s': exception='%s'", name, exc)
+
+            duration_ms = (time.perf_counter() - start) * 1000
+            logger.debug(f"Scheduled job '{name}' finished in {duration_ms:.0f}ms")
+            await run_in_threadpool(self._finish, name, started_at, duration_ms, error)
+            return True
+        except Exception as e:
+            logger.error("Error running scheduled task func='%s': exception='%s'", name, e)
+            return False
+        finally:
+            self._running.discard(name)
+
+    async def run_jobs(self, schedule: str, jobs: list[Callable[[], None]], interval: timedelta) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        semaphore = self._semaphore
+
+        async def run(job: Callable[[], None]) -> None:
+            async with semaphore:
+                await self.run_job(schedule, job, interval)
+
+        await asyncio.gather(*(run(job) for job in jobs))
+
+
+@lru_cache(maxsize=1)
+def get_job_runner() -> JobRunner:
+    return JobRunner(max_concurrent=get_app_settings().SCHEDULER_MAX_CONCURRENT_JOBS)
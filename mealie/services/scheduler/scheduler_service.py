@@ -4,6 +4,7 @@ from pathlib import Path
 
 from mealie.core import root_logger
 from mealie.core.config import get_app_settings
+from mealie.services.scheduler.job_runner import get_job_runner
 from mealie.services.scheduler.runner import repeat_every
 
 from .scheduler_registry import SchedulerRegistry
@@ -53,29 +54,19 @@ async def schedule_daily():
     await run_daily()
 
 
-def _scheduled_task_wrapper(callable):
-    try:
-        callable()
-    except Exception as e:
-        logger.error("Error in scheduled task func='%s': exception='%s'", callable.__name__, e)
-
-
 @repeat_every(minutes=MINUTES_DAY, wait_first=False, logger=logger)
-def run_daily():
+async def run_daily():
     logger.debug("Running daily callbacks")
-    for func in SchedulerRegistry._daily:
-        _scheduled_task_wrapper(func)
+    await get_job_runner().run_jobs("daily", SchedulerRegistry._daily, timedelta(minutes=MINUTES_DAY))
 
 
 @repeat_every(minutes=MINUTES_HOUR, wait_first=True, logger=logger)
-def run_hourly():
+async def run_hourly():
     logger.debug("Running hourly callbacks")
-    for func in SchedulerRegistry._hourly:
-        _scheduled_task_wrapper(func)
+    await get_job_runner().run_jobs("hourly", SchedulerRegistry._hourly, timedelta(minutes=MINUTES_HOUR))
 
 
 @repeat_every(minutes=MINUTES_5, wait_first=True, logger=logger)
-def run_minutely():
+async def run_minutely():
     logger.debug("Running minutely callbacks")
-    for func in SchedulerRegistry._minutely:
-        _scheduled_task_wrapper(func)
+    await get_job_runner().run_jobs("minutely", SchedulerRegistry._minutely, timedelta(minutes=MINUTES_5))
@@ -1,20 +1,26 @@
 from .create_timeline_events import create_mealplan_timeline_events
 from .delete_old_checked_shopping_list_items import delete_old_checked_list_items
 from .post_webhooks import post_group_webhooks
+from .purge_event_outbox import purge_event_outbox
 from .purge_expired_share_tokens import purge_expired_tokens
 from .purge_group_exports import purge_group_data_exports
 from .purge_password_reset import purge_password_reset_tokens
 from .purge_registration import purge_group_registration
+from .purge_shopping_list_tombstones import purge_shopping_list_tombstones
+from .refresh_imported_recipes import refresh_imported_recipes
 from .reset_locked_users import locked_user_reset
 
 __all__ = [
     "create_mealplan_timeline_events",
     "delete_old_checked_list_items",
     "post_group_webhooks",
+    "purge_event_outbox",
     "purge_expired_tokens",
     "purge_password_reset_tokens",
     "purge_group_data_exports",
     "purge_group_registration",
+    "purge_shopping_list_tombstones",
+    "refresh_imported_recipes",
     "locked_user_reset",
 ]
 
@@ -1,134 +1,207 @@
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import UTC, datetime, time, timedelta
 
 from dateutil.tz import tzlocal
 from pydantic import UUID4
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from mealie.db.db_setup import session_context
-from mealie.repos.all_repositories import get_repositories
-from mealie.schema.household.household import HouseholdRecipeUpdate
+from mealie.db.models._model_utils.guid import GUID
+from mealie.db.models.household.household_to_recipe import HouseholdToRecipe
+from mealie.db.models.household.mealplan import GroupMealPlan
+from mealie.db.models.recipe.recipe import RecipeModel
+from mealie.db.models.recipe.recipe_timeline import RecipeTimelineEvent
+from mealie.db.models.users.users import User
 from mealie.schema.meal_plan.new_meal import PlanEntryType
-from mealie.schema.recipe.recipe import RecipeSummary
-from mealie.schema.recipe.recipe_timeline_events import RecipeTimelineEventCreate, TimelineEventType
-from mealie.schema.response.pagination import PaginationQuery
+from mealie.schema.recipe.recipe_timeline_events import TimelineEventImage, TimelineEventType
 from mealie.schema.user.user import DEFAULT_INTEGRATION_ID
 from mealie.services.event_bus_service.event_bus_service import EventBusService
 from mealie.services.event_bus_service.event_types import (
+    EventDocumentDataBase,
     EventOperation,
     EventRecipeData,
     EventRecipeTimelineEventData,
     EventTypes,
 )
-from mealie.services.household_services.household_service import HouseholdService
 
 
-def _create_mealplan_timeline_events_for_household(
-    event_time: datetime, session: Session, group_id: UUID4, household_id: UUID4
-) -> None:
-    repos = get_repositories(session, group_id=group_id, household_id=household_id)
-    household_service = HouseholdService(group_id, household_id, repos)
-    event_bus_service = EventBusService(session=session)
-
-    timeline_events_to_create: list[RecipeTimelineEventCreate] = []
-    recipes_to_update: dict[UUID4, RecipeSummary] = {}
-    recipe_id_to_slug_map: dict[UUID4, str] = {}
-
-    local_tz = tzlocal()
-    mealplans = repos.meals.get_today(tz=local_tz)
-    for mealplan in mealplans:
-        if not (mealplan.recipe and mealplan.user_id):
+@dataclass(slots=True)
+class _PlannedMeal:
+    recipe_id: UUID4
+    recipe_slug: str
+    user_id: UUID4
+    group_id: UUID4
+    household_id: UUID4
+    subject: str
+
+
+def _get_event_subject(full_name: str | None, entry_type: str) -> str:
+    # TODO: make this translatable
+    if entry_type == PlanEntryType.side.value:
+        return f"{full_name} made this as a side"
+
+    return f"{full_name} made this for {entry_type}"
+
+
+def _get_planned_meals(session: Session) -> list[_PlannedMeal]:
+    """Returns today's meal plan entries that have a recipe and a user, across every household"""
+    today = datetime.now(tz=tzlocal()).date()
+    stmt = (
+        select(
+            GroupMealPlan.recipe_id,
+            GroupMealPlan.entry_type,
+            RecipeModel.slug,
+            User.id,
+            User.full_name,
+            GroupMealPlan.group_id,
+            # a meal plan's household is its user's; `GroupMealPlan.household_id` is a proxy for this column
+            User.household_id,
+        )
+        # meal plans are looked up in their own group, and only count if their user is still in that group
+        .join(User, (User.id == GroupMealPlan.user_id) & (User.group_id == GroupMealPlan.group_id))
+        .join(RecipeModel, RecipeModel.id == GroupMealPlan.recipe_id)
+        .where(GroupMealPlan.date == today)
+    )
+
+    return [
+        _PlannedMeal(
+            recipe_id=recipe_id,
+            recipe_slug=slug,
+            user_id=user_id,
+            group_id=group_id,
+            household_id=household_id,
+            subject=_get_event_subject(full_name, entry_type),
+        )
+        for recipe_id, entry_type, slug, user_id, full_name, group_id, household_id in session.execute(stmt)
+    ]
+
+
+def _get_existing_events(session: Session, recipe_ids: set[UUID4], event_time: datetime) -> set[tuple[UUID4, str]]:
+    """Returns the recipe id and subject of each timeline event already created for these recipes today"""
+    start = datetime.combine(event_time.date(), time.min, tzinfo=UTC)
+    stmt = select(RecipeTimelineEvent.recipe_id, RecipeTimelineEvent.subject).where(
+        RecipeTimelineEvent.recipe_id.in_(recipe_ids),
+        RecipeTimelineEvent.timestamp >= start,
+        RecipeTimelineEvent.timestamp < start + timedelta(days=1),
+    )
+    return {(recipe_id, subject) for recipe_id, subject in session.execute(stmt)}
+
+
+def _update_last_made(
+    session: Session, household_recipe_ids: set[tuple[UUID4, UUID4]], event_time: datetime
+) -> set[tuple[UUID4, UUID4]]:
+    """
+    Bumps the last made date of each household's recipe, unless it's already set to today or later,
+    and returns the (household id, recipe id) pairs that were updated
+    """
+    household_ids = {household_id for household_id, _ in household_recipe_ids}
+    recipe_ids = {recipe_id for _, recipe_id in household_recipe_ids}
+    stmt = select(
+        HouseholdToRecipe.id, HouseholdToRecipe.household_id, HouseholdToRecipe.recipe_id, HouseholdToRecipe.last_made
+    ).where(HouseholdToRecipe.household_id.in_(household_ids), HouseholdToRecipe.recipe_id.in_(recipe_ids))
+
+    existing: dict[tuple[UUID4, UUID4], tuple[UUID4, datetime | None]] = {
+        (household_id, recipe_id): (id, last_made) for id, household_id, recipe_id, last_made in session.execute(stmt)
+    }
+
+    to_update: set[tuple[UUID4, UUID4]] = set()
+    ids_to_update: list[UUID4] = []
+    rows_to_insert: list[dict] = []
+    for key in household_recipe_ids:
+        if key not in existing:
+            household_id, recipe_id = key
+            rows_to_insert.append(
+                {"id": GUID.generate(), "household_id": household_id, "recipe_id": recipe_id, "last_made": event_time}
+            )
+            to_update.add(key)
             continue
 
-        user = repos.users.get_one(mealplan.user_id)
-        if not user:
-            continue
+        id, last_made = existing[key]
+        if not last_made or last_made.date() < event_time.date():
+            ids_to_update.append(id)
+            to_update.add(key)
 
-        # TODO: make this translatable
-        if mealplan.entry_type == PlanEntryType.side:
-            event_subject = f"{user.full_name} made this as a side"
-
-        else:
-            event_subject = f"{user.full_name} made this for {mealplan.entry_type.value}"
-
-        query_start_time = datetime.combine(datetime.now(UTC).date(), time.min)
-        query_end_time = query_start_time + timedelta(days=1)
-        query = PaginationQuery(
-            query_filter=(
-                f'recipe_id = "{mealplan.recipe_id}" '
-                f'AND timestamp >= "{query_start_time.isoformat()}" '
-                f'AND timestamp < "{query_end_time.isoformat()}" '
-                f'AND subject = "{event_subject}"'
-            )
+    if rows_to_insert:
+        session.execute(insert(HouseholdToRecipe), rows_to_insert)
+    if ids_to_update:
+        session.execute(
+            update(HouseholdToRecipe).where(HouseholdToRecipe.id.in_(ids_to_update)).values(last_made=event_time)
         )
+    if to_update:
+        updated_recipe_ids = {recipe_id for _, recipe_id in to_update}
+        session.execute(update(RecipeModel).where(RecipeModel.id.in_(updated_recipe_ids)).values(last_made=event_time))
 
-        # if this event already exists, don't create it again
-        events = repos.recipe_timeline_events.page_all(pagination=query)
-        if events.items:
-            continue
-
-        # bump up the last made date
-        household_to_recipe = household_service.get_household_recipe(mealplan.recipe.slug)
-        last_made = household_to_recipe.last_made if household_to_recipe else None
-        if (not last_made or last_made.date() < event_time.date()) and mealplan.recipe_id not in recipes_to_update:
-            recipes_to_update[mealplan.recipe_id] = mealplan.recipe
-
-        timeline_events_to_create.append(
-            RecipeTimelineEventCreate(
-                user_id=user.id,
-                subject=event_subject,
-                event_type=TimelineEventType.info,
-                timestamp=event_time,
-                recipe_id=mealplan.recipe_id,
-            )
-        )
+    return to_update
 
-        recipe_id_to_slug_map[mealplan.recipe_id] = mealplan.recipe.slug
 
-    if not timeline_events_to_create:
+def _create_mealplan_timeline_events(event_time: datetime, session: Session) -> None:
+    planned_meals = _get_planned_meals(session)
+    if not planned_meals:
         return
 
-    # TODO: use bulk operations
-    for event in timeline_events_to_create:
-        new_event = repos.recipe_timeline_events.create(event)
-        event_bus_service.dispatch(
-            integration_id=DEFAULT_INTEGRATION_ID,
-            group_id=group_id,
-            household_id=household_id,
-            event_type=EventTypes.recipe_updated,
-            document_data=EventRecipeTimelineEventData(
-                operation=EventOperation.create,
-                recipe_slug=recipe_id_to_slug_map[new_event.recipe_id],
-                recipe_timeline_event_id=new_event.id,
-            ),
-        )
+    # one event is created per meal plan entry, unless a matching event was already created today
+    existing_events = _get_existing_events(session, {meal.recipe_id for meal in planned_meals}, event_time)
+    new_meals = [meal for meal in planned_meals if (meal.recipe_id, meal.subject) not in existing_events]
+    if not new_meals:
+        return
 
-    for recipe in recipes_to_update.values():
-        household_service.set_household_recipe(recipe.slug, HouseholdRecipeUpdate(last_made=event_time))
-        repos.recipes.patch(recipe.slug, {"last_made": event_time})
-        event_bus_service.dispatch(
-            integration_id=DEFAULT_INTEGRATION_ID,
-            group_id=group_id,
-            household_id=household_id,
-            event_type=EventTypes.recipe_updated,
-            document_data=EventRecipeData(operation=EventOperation.update, recipe_slug=recipe.slug),
+    event_ids = [GUID.generate() for _ in new_meals]
+    session.execute(
+        insert(RecipeTimelineEvent),
+        [
+            {
+                "id": event_id,
+                "recipe_id": meal.recipe_id,
+                "user_id": meal.user_id,
+                "subject": meal.subject,
+                "event_type": TimelineEventType.info.value,
+                "image": TimelineEventImage.does_not_have_image.value,
+                "timestamp": event_time,
+            }
+            for event_id, meal in zip(event_ids, new_meals, strict=True)
+        ],
+    )
+
+    updated = _update_last_made(session, {(meal.household_id, meal.recipe_id) for meal in new_meals}, event_time)
+    session.commit()
+
+    # events are dispatched in one batch per household
+    documents_by_household: dict[tuple[UUID4, UUID4], list[tuple[EventTypes, EventDocumentDataBase]]] = defaultdict(
+        list
+    )
+    for event_id, meal in zip(event_ids, new_meals, strict=True):
+        documents_by_household[(meal.group_id, meal.household_id)].append(
+            (
+                EventTypes.recipe_updated,
+                EventRecipeTimelineEventData(
+                    operation=EventOperation.create,
+                    recipe_slug=meal.recipe_slug,
+                    recipe_timeline_event_id=event_id,
+                ),
+            )
         )
 
+    # followed by an update for each recipe whose last made date was bumped
+    for meal in new_meals:
+        key = (meal.household_id, meal.recipe_id)
+        if key in updated:
+            updated.discard(key)
+            documents_by_household[(meal.group_id, meal.household_id)].append(
+                (
+                    EventTypes.recipe_updated,
+                    EventRecipeData(operation=EventOperation.update, recipe_slug=meal.recipe_slug),
+                )
+            )
 
-def _create_mealplan_timeline_events_for_group(event_time: datetime, session: Session, group_id: UUID4) -> None:
-    repos = get_repositories(session, group_id=group_id)
-    households_data = repos.households.page_all(PaginationQuery(page=1, per_page=-1))
-    household_ids = [household.id for household in households_data.items]
-    for household_id in household_ids:
-        _create_mealplan_timeline_events_for_household(event_time, session, group_id, household_id)
+    event_bus_service = EventBusService(session=session)
+    for (group_id, household_id), documents in documents_by_household.items():
+        event_bus_service.dispatch_many(DEFAULT_INTEGRATION_ID, group_id, household_id, documents)
 
 
 def create_mealplan_timeline_events() -> None:
     event_time = datetime.now(UTC)
 
     with session_context() as session:
-        repos = get_repositories(session)
-        groups_data = repos.groups.page_all(PaginationQuery(page=1, per_page=-1))
-        group_ids = [group.id for group in groups_data.items]
-
-        for group_id in group_ids:
-            _create_mealplan_timeline_events_for_group(event_time, session, group_id)
+        _create_mealplan_timeline_events(event_time, session)
@@ -1,15 +1,19 @@
-from collections.abc import Callable
+from collections import defaultdict
 
 from pydantic import UUID4
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from mealie.db.db_setup import session_context
+from mealie.db.models.household.shopping_list import ShoppingList, ShoppingListItem
+from mealie.db.models.users.users import User
 from mealie.repos.all_repositories import get_repositories
 from mealie.routes.households.controller_shopping_lists import publish_list_item_events
-from mealie.schema.response.pagination import OrderDirection, PaginationQuery
 from mealie.schema.user.user import DEFAULT_INTEGRATION_ID
 from mealie.services.event_bus_service.event_bus_service import EventBusService
 from mealie.services.event_bus_service.event_types import EventDocumentDataBase, EventTypes
 from mealie.services.household_services.shopping_lists import ShoppingListService
+from mealie.services.scheduler.batched_delete import PURGE_BATCH_SIZE, PurgeStats
 
 MAX_CHECKED_ITEMS = 100
 
@@ -34,42 +38,58 @@ def _create_publish_event(event_bus_service: EventBusService):
     return publish_event
 
 
-def _trim_list_items(shopping_list_service: ShoppingListService, shopping_list_id: UUID4, event_publisher: Callable):
-    pagination = PaginationQuery(
-        page=1,
-        per_page=-1,
-        query_filter=f'shopping_list_id="{shopping_list_id}" AND checked=true',
-        order_by="updated_at",
-        order_direction=OrderDirection.desc,
+def _get_excess_checked_items(session: Session) -> dict[tuple[UUID4, UUID4], list[UUID4]]:
+    """
+    Returns the ids of every checked item beyond each list's `MAX_CHECKED_ITEMS` most recently updated ones,
+    grouped by the group and household the list belongs to
+    """
+    ranked = (
+        select(
+            ShoppingListItem.id,
+            ShoppingListItem.shopping_list_id,
+            func.row_number()
+            .over(partition_by=ShoppingListItem.shopping_list_id, order_by=ShoppingListItem.update_at.desc())
+            .label("rank"),
+        )
+        .where(ShoppingListItem.checked.is_(True))
+        .subquery()
+    )
+    stmt = (
+        select(ranked.c.id, ShoppingList.group_id, User.household_id)
+        .join(ShoppingList, ShoppingList.id == ranked.c.shopping_list_id)
+        .join(User, User.id == ShoppingList.user_id)
+        .where(ranked.c.rank > MAX_CHECKED_ITEMS)
     )
-    query = shopping_list_service.list_items.page_all(pagination)
-    if len(query.items) <= MAX_CHECKED_ITEMS:
-        return
 
-    items_to_delete = query.items[MAX_CHECKED_ITEMS:]
-    items_response = shopping_list_service.bulk_delete_items([item.id for item in items_to_delete])
-    publish_list_item_events(event_publisher, items_response)
+    items: dict[tuple[UUID4, UUID4], list[UUID4]] = defaultdict(list)
+    for item_id, group_id, household_id in session.execute(stmt):
+        items[(group_id, household_id)].append(item_id)
+
+    return items
 
 
 def delete_old_checked_list_items():
+    stats = PurgeStats("checked shopping list items")
+
     with session_context() as session:
-        repos = get_repositories(session)
-        groups = repos.groups.page_all(PaginationQuery(page=1, per_page=-1)).items
-
-        for group in groups:
-            group_repos = get_repositories(session, group_id=group.id)
-            households = group_repos.households.page_all(PaginationQuery(page=1, per_page=-1)).items
-            event_bus_service = EventBusService(session=session)
-            event_publisher = _create_publish_event(event_bus_service)
-
-            for household in households:
-                household_repos = get_repositories(session, group_id=group.id, household_id=household.id)
-
-                shopping_list_service = ShoppingListService(household_repos)
-                shopping_list_data = household_repos.group_shopping_lists.page_all(PaginationQuery(page=1, per_page=-1))
-                for shopping_list in shopping_list_data.items:
-                    _trim_list_items(
-                        shopping_list_service,
-                        shopping_list.id,
-                        event_publisher,
-                    )
+        event_publisher = _create_publish_event(EventBusService(session=session))
+
+        # items are deleted through the shopping list service rather than with plain SQL, so their shopping
+        # lists' versions and tombstones are updated and clients are notified of the deletes
+        for (group_id, household_id), item_ids in _get_excess_checked_items(session).items():
+            household_repos = get_repositories(session, group_id=group_id, household_id=household_id)
+            shopping_list_service = ShoppingListService(household_repos)
+
+            for i in range(0, len(item_ids), PURGE_BATCH_SIZE):
+                if stats.out_of_time():
+                    stats.complete = False
+                    break
+
+                items_response = shopping_list_service.bulk_delete_items(item_ids[i : i + PURGE_BATCH_SIZE])
+                publish_list_item_events(event_publisher, items_response)
+                stats.add_batch(len(items_response.deleted_items))
+
+            if not stats.complete:
+                break
+
+    stats.log()
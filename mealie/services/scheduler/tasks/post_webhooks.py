@@ -1,11 +1,9 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 from pydantic import UUID4
 
 from mealie.db.db_setup import session_context
-from mealie.repos.all_repositories import get_repositories
 from mealie.schema.household.webhook import ReadWebhook
-from mealie.schema.response.pagination import PaginationQuery
 from mealie.services.event_bus_service.event_bus_listeners import WebhookEventListener
 from mealie.services.event_bus_service.event_bus_service import EventBusService
 from mealie.services.event_bus_service.event_types import (
@@ -17,8 +15,23 @@ from mealie.services.event_bus_service.event_types import (
     EventTypes,
     EventWebhookData,
 )
+from mealie.services.scheduler.job_runner import ScheduledJobRepository
 
-last_ran = datetime.now(UTC)
+MAX_CATCH_UP = timedelta(hours=1)
+"""webhooks that came due longer ago than this, e.g. while Mealie was down, aren't sent"""
+
+
+def _get_scheduled_window() -> tuple[datetime, datetime]:
+    """
+    The time since the job last ran. Any worker can win the job's lease, so the window comes from the job's
+    shared state rather than from this process, and each run starts where the previous one, on any worker, ended
+    """
+    with session_context() as session:
+        previous, started_at = ScheduledJobRepository(session).get_run_window(post_group_webhooks.__name__)
+
+    end_dt = started_at or datetime.now(UTC)
+    start_dt = previous or end_dt - timedelta(minutes=1)
+    return max(start_dt, end_dt - MAX_CATCH_UP), end_dt
 
 
 def post_group_webhooks(
@@ -26,24 +39,11 @@ def post_group_webhooks(
 ) -> None:
     """Post webhook events to specified group, or all groups"""
 
-    global last_ran
-
-    # if not specified, start the query at the last time the service ran
-    start_dt = start_dt or last_ran
-
-    # end the query at the current time
-    last_ran = end_dt = datetime.now(UTC)
-
-    if group_id is None:
-        # publish the webhook event to each group's event bus
-
-        with session_context() as session:
-            repos = get_repositories(session)
-            groups_data = repos.groups.page_all(PaginationQuery(page=1, per_page=-1))
-            group_ids = [group.id for group in groups_data.items]
-
+    if start_dt:
+        end_dt = datetime.now(UTC)
     else:
-        group_ids = [group_id]
+        # run by the scheduler: send everything that came due since the last run
+        start_dt, end_dt = _get_scheduled_window()
 
     """
     At this time only mealplan webhooks are supported. To add support for more types,
@@ -59,24 +59,22 @@ def post_group_webhooks(
         webhook_end_dt=end_dt,
     )
 
-    for group_id in group_ids:
-        if household_id is None:
-            with session_context() as session:
-                household_repos = get_repositories(session, group_id=group_id)
-                households_data = household_repos.households.page_all(PaginationQuery(page=1, per_page=-1))
-                household_ids = [household.id for household in households_data.items]
-        else:
-            household_ids = [household_id]
-
-        for household_id in household_ids:
-            event_bus = EventBusService()
-            event_bus.dispatch(
-                integration_id=INTERNAL_INTEGRATION_ID,
-                group_id=group_id,
-                household_id=household_id,
-                event_type=event_type,
-                document_data=event_document_data,
-            )
+    # a single query on the scheduled time finds every household with webhooks due in this window,
+    # so the event bus (and the meal plan query behind it) only runs for households that have something to send
+    with session_context() as session:
+        due_households = WebhookEventListener.get_households_with_scheduled_webhooks(
+            session, start_dt, end_dt, group_id=group_id, household_id=household_id
+        )
+
+    event_bus = EventBusService()
+    for due_group_id, due_household_id in due_households:
+        event_bus.dispatch(
+            integration_id=INTERNAL_INTEGRATION_ID,
+            group_id=due_group_id,
+            household_id=due_household_id,
+            event_type=event_type,
+            document_data=event_document_data.model_copy(),
+        )
 
 
 def post_test_webhook(webhook: ReadWebhook, message: str = "") -> None:
@@ -0,0 +1,24 @@
+import datetime
+
+from mealie.core import root_logger
+from mealie.db.db_setup import session_context
+from mealie.schema.admin.event_outbox import EventOutboxStatus
+from mealie.services.event_bus_service.event_outbox import EventOutboxRepository
+
+logger = root_logger.get_logger()
+
+MAX_DELIVERED_DAYS_OLD = 7
+MAX_DEAD_DAYS_OLD = 30
+
+
+def purge_event_outbox():
+    """Purges delivered events after 7 days and dead-lettered events after 30 days"""
+    logger.debug("purging event outbox")
+    now = datetime.datetime.now(datetime.UTC)
+
+    with session_context() as session:
+        repo = EventOutboxRepository(session)
+        delivered = repo.purge(EventOutboxStatus.delivered, now - datetime.timedelta(days=MAX_DELIVERED_DAYS_OLD))
+        dead = repo.purge(EventOutboxStatus.dead, now - datetime.timedelta(days=MAX_DEAD_DAYS_OLD))
+
+    logger.info(f"event outbox purged ({delivered} delivered, {dead} dead)")
@@ -1,17 +1,24 @@
 import datetime
+from collections.abc import Sequence
 from pathlib import Path
 
-from sqlalchemy import cast, select
+from sqlalchemy import Row, cast
 
 from mealie.core import root_logger
 from mealie.core.config import get_app_dirs
 from mealie.db.db_setup import session_context
 from mealie.db.models._model_utils.datetime import NaiveDateTime
 from mealie.db.models.group.exports import GroupDataExportsModel
+from mealie.services.scheduler.batched_delete import PurgeStats, delete_in_batches
 
 ONE_DAY_AS_MINUTES = 1440
 
 
+def _remove_export_files(rows: Sequence[Row]) -> None:
+    for (path,) in rows:
+        Path(path).unlink(missing_ok=True)
+
+
 def purge_group_data_exports(max_minutes_old=ONE_DAY_AS_MINUTES):
     """Purges all group exports after x days"""
     logger = root_logger.get_logger()
@@ -20,18 +27,17 @@ def purge_group_data_exports(max_minutes_old=ONE_DAY_AS_MINUTES):
     limit = datetime.datetime.now(datetime.UTC) - datetime.timedelta(minutes=max_minutes_old)
 
     with session_context() as session:
-        stmt = select(GroupDataExportsModel).filter(cast(GroupDataExportsModel.expires, NaiveDateTime) <= limit)
-        results = session.execute(stmt).scalars().all()
-
-        total_removed = 0
-        for result in results:
-            session.delete(result)
-            Path(result.path).unlink(missing_ok=True)
-            total_removed += 1
-
-        session.commit()
-
-        logger.info(f"finished purging group data exports. {total_removed} exports removed from group data")
+        # export files are only removed once the rows referencing them have been deleted
+        stats = delete_in_batches(
+            session,
+            GroupDataExportsModel,
+            cast(GroupDataExportsModel.expires, NaiveDateTime) <= limit,
+            stats=PurgeStats("group data exports"),
+            returning=[GroupDataExportsModel.path],
+            on_batch=_remove_export_files,
+        )
+
+    stats.log()
 
 
 def purge_excess_files() -> None:
@@ -1,10 +1,9 @@
 import datetime
 
-from sqlalchemy import delete
-
 from mealie.core import root_logger
 from mealie.db.db_setup import session_context
 from mealie.db.models.users.password_reset import PasswordResetModel
+from mealie.services.scheduler.batched_delete import PurgeStats, delete_in_batches
 
 logger = root_logger.get_logger()
 
@@ -17,8 +16,11 @@ def purge_password_reset_tokens():
     limit = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=MAX_DAYS_OLD)
 
     with session_context() as session:
-        stmt = delete(PasswordResetModel).filter(PasswordResetModel.created_at <= limit)
-        session.execute(stmt)
-        session.commit()
-        session.close()
-        logger.info("password reset tokens purged")
+        stats = delete_in_batches(
+            session,
+            PasswordResetModel,
+            PasswordResetModel.created_at <= limit,
+            stats=PurgeStats("password reset tokens"),
+        )
+
+    stats.log()
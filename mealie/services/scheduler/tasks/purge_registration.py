@@ -1,10 +1,9 @@
 import datetime
 
-from sqlalchemy import delete
-
 from mealie.core import root_logger
 from mealie.db.db_setup import session_context
 from mealie.db.models.household import GroupInviteToken
+from mealie.services.scheduler.batched_delete import PurgeStats, delete_in_batches
 
 logger = root_logger.get_logger()
 
@@ -17,9 +16,11 @@ def purge_group_registration():
     limit = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=MAX_DAYS_OLD)
 
     with session_context() as session:
-        stmt = delete(GroupInviteToken).filter(GroupInviteToken.created_at <= limit)
-        session.execute(stmt)
-        session.commit()
-        session.close()
-
-    logger.info("registration token purged")
+        stats = delete_in_batches(
+            session,
+            GroupInviteToken,
+            GroupInviteToken.created_at <= limit,
+            stats=PurgeStats("registration tokens"),
+        )
+
+    stats.log()
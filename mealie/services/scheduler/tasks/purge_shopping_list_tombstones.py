@@ -0,0 +1,42 @@
+import datetime
+
+from sqlalchemy import delete, func, select, update
+
+from mealie.core import root_logger
+from mealie.db.db_setup import session_context
+from mealie.db.models.household.shopping_list import ShoppingList, ShoppingListItemTombstone
+
+logger = root_logger.get_logger()
+
+MAX_DAYS_OLD = 30
+
+
+def purge_shopping_list_tombstones():
+    """
+    Purges tombstones of deleted shopping list items after 30 days. Clients that haven't synced a list
+    since then receive the whole list on their next sync.
+    """
+    logger.debug("purging shopping list item tombstones")
+    cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=MAX_DAYS_OLD)
+
+    with session_context() as session:
+        pruned_versions = session.execute(
+            select(ShoppingListItemTombstone.shopping_list_id, func.max(ShoppingListItemTombstone.version))
+            .where(ShoppingListItemTombstone.created_at < cutoff)
+            .group_by(ShoppingListItemTombstone.shopping_list_id)
+        ).all()
+        if not pruned_versions:
+            return
+
+        # plain SQL statements, so purging doesn't bump the lists' versions
+        for shopping_list_id, pruned_version in pruned_versions:
+            session.execute(
+                update(ShoppingList)
+                .where(ShoppingList.id == shopping_list_id)
+                .values(pruned_version=pruned_version, pruned_at=cutoff)
+            )
+
+        result = session.execute(delete(ShoppingListItemTombstone).where(ShoppingListItemTombstone.created_at < cutoff))
+        session.commit()
+
+    logger.info(f"purged {result.rowcount} shopping list item tombstones")  # type: ignore
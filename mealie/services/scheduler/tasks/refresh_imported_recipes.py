@@ -0,0 +1,368 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
+
+from httpx import AsyncClient
+from pydantic import UUID4
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from mealie.core import root_logger
+from mealie.core.config import get_app_settings
+from mealie.db.db_setup import session_context
+from mealie.db.models.recipe.recipe import RecipeModel
+from mealie.db.models.recipe.refresh_state import RecipeRefreshStateModel
+from mealie.lang.providers import local_provider
+from mealie.repos.all_repositories import get_repositories
+from mealie.repos.repository_factory import AllRepositories
+from mealie.schema.recipe.recipe import Recipe
+from mealie.schema.reports.reports import ReportCategory, ReportCreate, ReportEntryCreate, ReportSummaryStatus
+from mealie.services.scraper.http_client import DomainLimiter, create_scraper_client
+from mealie.services.scraper.recipe_scraper import RecipeScraper
+from mealie.services.scraper.scraper_strategies import FetchedHTML, fetch_html
+
+REFRESH_CONCURRENCY = 4
+REFRESH_TIME_BUDGET = 45 * 60
+"""seconds; recipes that weren't checked in time are left for the next hourly run"""
+
+REFRESHED_FIELDS = (
+    "description",
+    "recipe_servings",
+    "recipe_yield_quantity",
+    "recipe_yield",
+    "total_time",
+    "prep_time",
+    "cook_time",
+    "perform_time",
+    "recipe_ingredient",
+    "recipe_instructions",
+    "nutrition",
+)
+"""the parts of a recipe that are updated from its source; the name, image and organizers are left alone"""
+
+
+def recipe_content(recipe: Recipe) -> dict[str, Any]:
+    """
+    The refreshed fields of a recipe, normalized so the same recipe gives the same content whether it was
+    just parsed or loaded from the database (e.g. missing text is always `None`, never `""`)
+    """
+
+    def text(value: str | None) -> str | None:
+        return value.strip() or None if value else None
+
+    return {
+        "description": text(recipe.description),
+        "recipe_servings": recipe.recipe_servings or 0,
+        "recipe_yield_quantity": recipe.recipe_yield_quantity or 0,
+        "recipe_yield": text(recipe.recipe_yield),
+        "total_time": text(recipe.total_time),
+        "prep_time": text(recipe.prep_time),
+        "cook_time": text(recipe.cook_time),
+        "perform_time": text(recipe.perform_time),
+        "recipe_ingredient": [
+            {
+                "title": text(ingredient.title),
+                "note": text(ingredient.note),
+                "quantity": ingredient.quantity or 0,
+                "unit": ingredient.unit.name if ingredient.unit else None,
+                "food": ingredient.food.name if ingredient.food else None,
+                "original_text": text(ingredient.original_text),
+            }
+            for ingredient in recipe.recipe_ingredient
+        ],
+        "recipe_instructions": [
+            {"title": text(step.title), "summary": text(step.summary), "text": text(step.text)}
+            for step in recipe.recipe_instructions or []
+        ],
+        "nutrition": recipe.nutrition.model_dump(exclude_none=True) if recipe.nutrition else {},
+    }
+
+
+def content_hash(content: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class RecipeToRefresh:
+    recipe_id: UUID4
+    group_id: UUID4
+    org_url: str
+
+
+@dataclass(slots=True)
+class RefreshStats:
+    checked: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    updated: int = 0
+    edited: int = 0
+    failed: int = 0
+
+    def log(self) -> None:
+        root_logger.get_logger().info(
+            f"checked the source of {self.checked} recipes: {self.not_modified} not modified, "
+            f"{self.unchanged} unchanged, {self.updated} updated, {self.edited} edited locally, {self.failed} failed"
+        )
+
+
+def get_recipes_to_refresh(session: Session, interval: timedelta, limit: int) -> list[RecipeToRefresh]:
+    """
+    Imported recipes that haven't been checked within `interval`, never-checked ones first. Each recipe's
+    state is saved as soon as it's checked, so an interrupted run picks up where it left off.
+    """
+
+    checked_before = datetime.now(UTC) - interval
+    stmt = (
+        select(RecipeModel.id, RecipeModel.group_id, RecipeModel.org_url)
+        .outerjoin(RecipeRefreshStateModel, RecipeRefreshStateModel.recipe_id == RecipeModel.id)
+        .where(RecipeModel.org_url.like("http%"))
+        .where(
+            or_(
+                RecipeRefreshStateModel.checked_at.is_(None),
+                RecipeRefreshStateModel.checked_at < checked_before,
+            )
+        )
+        .order_by(RecipeRefreshStateModel.checked_at.asc().nulls_first(), RecipeModel.id)
+        .limit(limit)
+    )
+
+    return [RecipeToRefresh(id_, group_id, org_url) for id_, group_id, org_url in session.execute(stmt)]
+
+
+class RecipeRefresher:
+    """
+    Checks the source of imported recipes with conditional requests, so unchanged pages cost the site a 304
+    instead of a full page, and a changed page is only parsed when it was actually downloaded. A recipe is
+    updated only when the recipe parsed from its source differs from the one parsed last time, and the recipe
+    hasn't been edited since; otherwise edits made in Mealie would be overwritten. The first check of a recipe
+    only records what its source looks like.
+
+    The refreshes of a run share one session, so it's only used between awaits: each refresh reads what it needs
+    before fetching, and writes and commits its changes after, so a rollback never discards another's changes.
+    """
+
+    def __init__(self, session: Session, client: AsyncClient) -> None:
+        self.session = session
+        self.client = client
+        self.settings = get_app_settings()
+        self.logger = root_logger.get_logger()
+        self.scraper = RecipeScraper(local_provider())
+
+        self.stats = RefreshStats()
+        self._reports: dict[UUID4, tuple[AllRepositories, UUID4, RefreshStats]] = {}
+
+    def _repos(self, group_id: UUID4) -> AllRepositories:
+        return get_repositories(self.session, group_id=group_id, household_id=None)
+
+    def _add_entry(
+        self,
+        item: RecipeToRefresh,
+        outcome: Literal["updated", "edited", "failed"],
+        message: str,
+        exception: str = "",
+    ) -> None:
+        """
+        Adds an entry to the group's report for this run, creating the report with the first entry. The entry is
+        counted under its `outcome` in the report's stats, which decide the report's status.
+        """
+        if item.group_id not in self._reports:
+            repos = self._repos(item.group_id)
+            report = repos.group_reports.create(
+                ReportCreate(
+                    name="Recipe Refresh",
+                    category=ReportCategory.recipe_refresh,
+                    status=ReportSummaryStatus.in_progress,
+                    group_id=item.group_id,
+                )
+            )
+            self._reports[item.group_id] = (repos, report.id, RefreshStats())
+
+        repos, report_id, stats = self._reports[item.group_id]
+        setattr(stats, outcome, getattr(stats, outcome) + 1)
+
+        repos.group_report_entries.create(
+            ReportEntryCreate(report_id=report_id, success=outcome != "failed", message=message, exception=exception)
+        )
+
+    def save_report_statuses(self) -> None:
+        for repos, report_id, stats in self._reports.values():
+            if not stats.failed:
+                status = ReportSummaryStatus.success
+            elif not stats.updated:
+                # recipes skipped since they were edited in Mealie don't make up for the failures
+                status = ReportSummaryStatus.failure
+            else:
+                status = ReportSummaryStatus.partial
+
+            repos.group_reports.patch(report_id, {"status": status})
+
+    def _conditional_headers(self, recipe_id: UUID4) -> dict[str, str]:
+        stmt = select(RecipeRefreshStateModel.etag, RecipeRefreshStateModel.last_modified).filter_by(
+            recipe_id=recipe_id
+        )
+        etag, last_modified = self.session.execute(stmt).one_or_none() or (None, None)
+
+        headers: dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        return headers
+
+    def _get_state(self, recipe_id: UUID4) -> RecipeRefreshStateModel:
+        stmt = select(RecipeRefreshStateModel).filter_by(recipe_id=recipe_id)
+        state = self.session.execute(stmt).scalars().one_or_none()
+        if state is None:
+            state = RecipeRefreshStateModel(recipe_id=recipe_id)
+            self.session.add(state)
+
+        return state
+
+    async def refresh(self, item: RecipeToRefresh) -> None:
+        checked = await self._check(item, self._conditional_headers(item.recipe_id))
+
+        state = self._get_state(item.recipe_id)
+        try:
+            # the validators are only saved once the page was handled, so a failed page isn't skipped as unmodified
+            if checked is not None and self._refresh(item, state, checked[0]):
+                state.etag, state.last_modified = checked[1].etag, checked[1].last_modified
+        finally:
+            state.checked_at = datetime.now(UTC)
+            self.session.commit()
+
+    async def _check(self, item: RecipeToRefresh, headers: dict[str, str]) -> tuple[Recipe, FetchedHTML] | None:
+        """
+        Returns the recipe parsed from the source and the page it was parsed from,
+        or `None` if it hasn't changed or couldn't be parsed
+        """
+        self.stats.checked += 1
+
+        try:
+            fetched = await fetch_html(
+                item.org_url, self.client, headers=headers, stop_at_recipe=self.settings.SCRAPER_STOP_AT_RECIPE
+            )
+        except Exception as e:
+            self.logger.exception(f"failed to check recipe source {item.org_url}")
+            self._failed(item, f"Unable to check recipe source {item.org_url}", str(e))
+            return None
+
+        if fetched is None or fetched.status_code >= 400:
+            status_code = fetched.status_code if fetched else 403
+            self._failed(item, f"Unable to check recipe source {item.org_url}", f"status code {status_code}")
+            return None
+
+        if fetched.not_modified:
+            self.stats.not_modified += 1
+            return None
+
+        try:
+            recipe, _ = await self.scraper.scrape(item.org_url, fetched.html, self.client, partial=fetched.partial)
+        except Exception as e:
+            self.logger.exception(f"failed to parse recipe source {item.org_url}")
+            self._failed(item, f"Unable to parse recipe source {item.org_url}", str(e))
+            return None
+
+        if recipe is None:
+            self._failed(item, f"No recipe found at recipe source {item.org_url}")
+            return None
+
+        return recipe, fetched
+
+    def _failed(self, item: RecipeToRefresh, message: str, exception: str = "") -> None:
+        self.stats.failed += 1
+        self._add_entry(item, "failed", message, exception)
+
+    def _refresh(self, item: RecipeToRefresh, state: RecipeRefreshStateModel, upstream: Recipe) -> bool:
+        """Updates the recipe from `upstream` when it's safe to, returning whether the source was handled"""
+        upstream_content = recipe_content(upstream)
+        upstream_hash = content_hash(upstream_content)
+        if upstream_hash == state.content_hash:
+            self.stats.unchanged += 1
+            return True
+
+        previous_hash = state.content_hash
+        if previous_hash is None:
+            # the first check only records what the source looks like, since the recipe may have been edited
+            state.content_hash = upstream_hash
+            self.stats.unchanged += 1
+            return True
+
+        repos = self._repos(item.group_id)
+        recipe = repos.recipes.get_one(item.recipe_id, "id")
+        if recipe is None:
+            return False
+
+        local_content = recipe_content(recipe)
+        if content_hash(local_content) != previous_hash:
+            state.content_hash = upstream_hash
+            self.stats.edited += 1
+            self._add_entry(
+                item, "edited", f"Recipe {recipe.name} wasn't updated from its source, since it was edited in Mealie"
+            )
+            return True
+
+        upstream_data = upstream.model_dump(include=set(REFRESHED_FIELDS))
+        changes = {key: upstream_data[key] for key in REFRESHED_FIELDS if local_content[key] != upstream_content[key]}
+        try:
+            repos.recipes.patch(recipe.slug, changes)
+        except Exception as e:
+            self.session.rollback()
+            self.logger.exception(f"failed to update recipe {recipe.slug} from its source")
+            self._failed(item, f"Unable to update recipe {recipe.name} from its source", str(e))
+            return False
+
+        state.content_hash = upstream_hash
+        state.changed_at = datetime.now(UTC)
+        self.stats.updated += 1
+        self._add_entry(item, "updated", f"Updated recipe {recipe.name} from its source")
+        return True
+
+
+async def _refresh_recipes(session: Session, recipes: list[RecipeToRefresh]) -> RefreshStats:
+    settings = get_app_settings()
+    domain_limiter = DomainLimiter(settings.SCRAPER_MAX_PER_DOMAIN, settings.SCRAPER_DOMAIN_DELAY)
+    semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+    deadline = time.monotonic() + REFRESH_TIME_BUDGET
+
+    async with create_scraper_client(max_connections=REFRESH_CONCURRENCY * 2) as client:
+        refresher = RecipeRefresher(session, client)
+
+        async def refresh(item: RecipeToRefresh) -> None:
+            async with semaphore, domain_limiter.limit(item.org_url):
+                if time.monotonic() > deadline:
+                    return
+
+                try:
+                    await refresher.refresh(item)
+                except Exception:
+                    session.rollback()
+                    refresher.logger.exception(f"unexpected error refreshing recipe {item.recipe_id}")
+
+        try:
+            await asyncio.gather(*(refresh(item) for item in recipes))
+        finally:
+            refresher.save_report_statuses()
+
+    return refresher.stats
+
+
+def refresh_imported_recipes() -> None:
+    """Checks the source of imported recipes that are due, updating recipes whose source changed"""
+    settings = get_app_settings()
+    root_logger.get_logger().debug("checking the source of imported recipes")
+
+    with session_context() as session:
+        recipes = get_recipes_to_refresh(
+            session, timedelta(days=settings.RECIPE_REFRESH_INTERVAL), settings.RECIPE_REFRESH_BATCH_SIZE
+        )
+        if not recipes:
+            return
+
+        stats = asyncio.run(_refresh_recipes(session, recipes))
+
+    stats.log()
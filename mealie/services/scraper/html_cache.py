@@ -0,0 +1,265 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from mealie.core.config import get_app_dirs, get_app_settings
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+"""query parameters that don't change the page, so they're dropped from cache keys, along with any utm_ parameter"""
+
+TRIM_RATIO = 0.9
+"""share of `max_size` a full cache is trimmed down to, so it isn't trimmed again on the very next write"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL so trivially different links to the same page share a cache entry: the scheme and host
+    are lowercased, default ports, fragments and tracking parameters are dropped, and the query is sorted
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in {("http", 80), ("https", 443)}:
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+@dataclass(slots=True)
+class CachedHTML:
+    url: str
+    html: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers, so the site can answer with `304 Not Modified` if the page hasn't changed"""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ScrapedHTMLCache:
+    """
+    On-disk cache of fetched recipe pages, shared by every worker. Pages are stored gzipped under the hash
+    of their content, so identical pages reached through different URLs are only stored once, and an index
+    maps each normalized URL to its page along with the validators needed to revalidate it.
+
+    Entries are served as-is until they're `ttl` seconds old. After that, entries with an `ETag` or
+    `Last-Modified` header are kept so they can be revalidated, and entries without one are dropped. Once
+    the stored pages exceed `max_size` bytes, the least recently used entries are evicted until they fit in
+    `TRIM_RATIO` of it.
+
+    Every method hits the disk, so async code should call them through `asyncio.to_thread`.
+    """
+
+    def __init__(self, directory: Path, max_size: int, ttl: float) -> None:
+        self.directory = directory
+        self.pages_dir = directory / "pages"
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local = threading.local()
+
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            self.pages_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.directory / "index.db", timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # connections are per thread, and a new thread may find the index removed since the cache was created
+            self._create_schema(conn)
+            self._local.conn = conn
+
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_digest ON pages (digest)")
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+    def _page_path(self, digest: str) -> Path:
+        return self.pages_dir / digest[:2] / f"{digest}.html.gz"
+
+    def get(self, url: str) -> CachedHTML | None:
+        """Returns the cached page, or `None` if there isn't one or it's expired and can't be revalidated"""
+        key = self._key(url)
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT url, digest, etag, last_modified, fetched FROM pages WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        url, digest, etag, last_modified, fetched = row
+        entry = CachedHTML(url=url, html="", etag=etag, last_modified=last_modified, fetched_at=fetched)
+        if not entry.is_fresh(self.ttl) and not entry.can_revalidate:
+            self.delete(url)
+            return None
+
+        try:
+            entry.html = gzip.decompress(self._page_path(digest).read_bytes()).decode()
+        except (OSError, EOFError, UnicodeDecodeError):
+            # the page was evicted by another worker, or never finished writing
+            self.delete(url)
+            return None
+
+        conn.execute("UPDATE pages SET accessed = ? WHERE key = ?", (time.time(), key))
+        return entry
+
+    def set(self, url: str, html: str, etag: str | None = None, last_modified: str | None = None) -> None:
+        content = html.encode()
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._page_path(digest)
+
+        if not path.exists():
+            compressed = gzip.compress(content)
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # write to a temporary file first, so other workers never read a partially written page
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(compressed)
+            os.replace(tmp_path, path)
+
+        now = time.time()
+        self._connection().execute(
+            """
+            INSERT OR REPLACE INTO pages (key, url, digest, size, etag, last_modified, fetched, accessed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (self._key(url), url, digest, path.stat().st_size, etag, last_modified, now, now),
+        )
+
+        if self.size() > self.max_size:
+            self.trim()
+
+    def mark_revalidated(self, url: str) -> None:
+        """Resets the entry's age after the site confirmed the cached page is still current"""
+        now = time.time()
+        self._connection().execute(
+            "UPDATE pages SET fetched = ?, accessed = ? WHERE key = ?", (now, now, self._key(url))
+        )
+
+    def delete(self, url: str) -> bool:
+        conn = self._connection()
+        row = conn.execute("DELETE FROM pages WHERE key = ? RETURNING digest", (self._key(url),)).fetchone()
+        if row is None:
+            return False
+
+        self._remove_unreferenced_pages({row[0]})
+        return True
+
+    def size(self) -> int:
+        """Total size of the stored pages in bytes"""
+        row = self._connection().execute("SELECT SUM(size) FROM (SELECT DISTINCT digest, size FROM pages)").fetchone()
+        return row[0] or 0
+
+    def trim(self) -> None:
+        """
+        Drops expired entries that can't be revalidated, then the least recently used entries until the
+        stored pages fit in `TRIM_RATIO` of `max_size`
+        """
+        conn = self._connection()
+        max_size = int(self.max_size * TRIM_RATIO)
+        rows = conn.execute(
+            "SELECT key, digest, size, etag, last_modified, fetched FROM pages ORDER BY accessed DESC"
+        ).fetchall()
+
+        cutoff = time.time() - self.ttl
+        kept_digests: set[str] = set()
+        total = 0
+
+        evicted_keys: list[str] = []
+        evicted_digests: set[str] = set()
+        for key, digest, size, etag, last_modified, fetched in rows:
+            is_expired = fetched <= cutoff and not (etag or last_modified)
+            if not is_expired and digest in kept_digests:
+                continue
+            if not is_expired and total + size <= max_size:
+                kept_digests.add(digest)
+                total += size
+                continue
+
+            evicted_keys.append(key)
+            evicted_digests.add(digest)
+
+        for i in range(0, len(evicted_keys), 500):
+            chunk = evicted_keys[i : i + 500]
+            conn.execute(f"DELETE FROM pages WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+
+        self._remove_unreferenced_pages(evicted_digests - kept_digests)
+
+    def _remove_unreferenced_pages(self, digests: Iterable[str]) -> None:
+        conn = self._connection()
+        for digest in digests:
+            if conn.execute("SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                continue
+
+            self._page_path(digest).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM pages")
+        for path in self.pages_dir.glob("*/*.html.gz"):
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+
+@lru_cache(maxsize=1)
+def get_scraped_html_cache() -> ScrapedHTMLCache | None:
+    """Returns the shared cache of fetched recipe pages, or `None` if it's disabled"""
+    settings = get_app_settings()
+    if settings.SCRAPER_CACHE_TTL <= 0 or settings.SCRAPER_CACHE_MAX_SIZE <= 0:
+        return None
+
+    return ScrapedHTMLCache(
+        get_app_dirs().CACHE_DIR / "scraped-html",
+        max_size=settings.SCRAPER_CACHE_MAX_SIZE * 1024 * 1024,
+        ttl=settings.SCRAPER_CACHE_TTL,
+    )
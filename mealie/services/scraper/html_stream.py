@@ -0,0 +1,74 @@
+import json
+import re
+from typing import Any
+
+JSON_LD_OPEN = re.compile(rb"<script\b[^>]*application/ld\+json[^>]*>", re.IGNORECASE)
+JSON_LD_CLOSE = re.compile(rb"</script\s*>", re.IGNORECASE)
+
+MAX_TAG_LENGTH = 512
+"""opening tags longer than this aren't recognized when they're split across two chunks"""
+
+
+def is_recipe(data: Any) -> bool:
+    """Returns whether a JSON-LD document contains a schema.org Recipe, directly or in a graph"""
+    if isinstance(data, list):
+        return any(is_recipe(item) for item in data)
+    if not isinstance(data, dict):
+        return False
+
+    types = data.get("@type")
+    if types == "Recipe" or (isinstance(types, list) and "Recipe" in types):
+        return True
+
+    return is_recipe(data.get("@graph")) or is_recipe(data.get("mainEntity"))
+
+
+class RecipeJsonLdDetector:
+    """
+    Incrementally scans an HTML document as it's downloaded, so the download can stop as soon as a complete
+    `application/ld+json` block describing a Recipe has been received. Scanning resumes where the previous
+    chunk left off, so the document isn't scanned from the start again for every chunk.
+    """
+
+    def __init__(self) -> None:
+        self.end: int | None = None
+        """the position just past the closing tag of the first Recipe block, once it's been found"""
+
+        self._pos = 0
+        self._block_start: int | None = None
+
+    @property
+    def found(self) -> bool:
+        return self.end is not None
+
+    def feed(self, buffer: bytes | bytearray) -> bool:
+        """Scans the new part of `buffer` (the document so far), returning whether a Recipe block was found"""
+        while self.end is None:
+            if self._block_start is None:
+                opening = JSON_LD_OPEN.search(buffer, self._pos)
+                if not opening:
+                    # an opening tag may be split across chunks, so the tail is scanned again next time
+                    self._pos = max(self._pos, len(buffer) - MAX_TAG_LENGTH)
+                    return False
+
+                self._block_start = opening.end()
+                self._pos = opening.end()
+
+            closing = JSON_LD_CLOSE.search(buffer, self._pos)
+            if not closing:
+                # a closing tag may also be split, so the search resumes a few bytes back
+                self._pos = max(self._block_start, len(buffer) - 16)
+                return False
+
+            try:
+                data = json.loads(bytes(buffer[self._block_start : closing.start()]))
+            except ValueError:
+                data = None
+
+            if is_recipe(data):
+                self.end = closing.end()
+
+            self._block_start = None
+            self._pos = closing.end()
+
+        return True
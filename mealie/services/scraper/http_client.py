@@ -0,0 +1,66 @@
+import asyncio
+import importlib.util
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from mealie.pkgs import safehttp
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+"""HTTP/2 is only negotiated when the optional `h2` package is installed; otherwise requests use HTTP/1.1"""
+
+
+def create_scraper_client(max_connections: int) -> httpx.AsyncClient:
+    """
+    Creates a client for fetching recipe pages and their images. Connections are kept alive and reused
+    (and multiplexed over HTTP/2 where possible), so the client should be shared across every URL in an
+    import rather than created per request.
+    """
+    return httpx.AsyncClient(
+        transport=safehttp.AsyncSafeTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30,
+            ),
+        ),
+    )
+
+
+class DomainLimiter:
+    """
+    Limits how many requests are made to a single site at once, and spaces out the start of consecutive
+    requests to the same site by at least `delay` seconds, so a bulk import doesn't hammer any one site
+    """
+
+    def __init__(self, max_per_domain: int, delay: float) -> None:
+        self.max_per_domain = max(1, max_per_domain)
+        self.delay = max(0.0, delay)
+
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    @staticmethod
+    def get_domain(url: str) -> str:
+        domain = (urlsplit(url.strip()).hostname or "").lower()
+        return domain.removeprefix("www.")
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        domain = self.get_domain(url)
+        semaphore = self._semaphores.setdefault(domain, asyncio.Semaphore(self.max_per_domain))
+
+        async with semaphore:
+            # reserve the next start time before waiting, so requests queued behind this one are spaced out too
+            now = time.monotonic()
+            start = max(now, self._next_start.get(domain, now))
+            self._next_start[domain] = start + self.delay
+
+            if start > now:
+                await asyncio.sleep(start - now)
+
+            yield
@@ -1,25 +1,60 @@
 import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from uuid import uuid4
 
+from httpx import AsyncClient
 from pydantic import UUID4
 
 from mealie.lang.providers import Translator
 from mealie.repos.repository_factory import AllRepositories
-from mealie.schema.recipe.recipe import CreateRecipeByUrlBulk, Recipe
+from mealie.schema.recipe.recipe import CreateRecipeBulk, CreateRecipeByUrlBulk, Recipe
 from mealie.schema.reports.reports import (
     ReportCategory,
     ReportCreate,
     ReportEntryCreate,
-    ReportEntryOut,
     ReportSummaryStatus,
 )
 from mealie.schema.user.user import GroupInDB
 from mealie.services._base_service import BaseService
+from mealie.services.recipe.image_processor import update_recipe_image_key
+from mealie.services.recipe.recipe_data_service import RecipeDataService
 from mealie.services.recipe.recipe_service import RecipeService
-from mealie.services.scraper.scraper import create_from_html
+from mealie.services.scraper.http_client import DomainLimiter, create_scraper_client
+from mealie.services.scraper.scraper import extract_url, scrape_recipe
+from mealie.services.scraper.scraper_strategies import safe_scrape_html
+
+
+@dataclass(slots=True)
+class BulkImportItem:
+    """A URL as it moves through the import pipeline; each stage drops what the next stages don't need"""
+
+    request: CreateRecipeBulk
+    url: str = ""
+    html: str = ""
+    recipe: Recipe | None = None
+    image_url: str | dict[str, str] | list[str] | None = None
+    image: tuple[bytes, str] | None = None
+
+    recipe_id: UUID4 | None = None
+    slug: str = ""
 
 
 class RecipeBulkScraperService(BaseService):
-    report_entries: list[ReportEntryCreate]
+    """
+    Imports a list of recipe URLs through a pipeline of stages: fetch the page → parse and clean it → save
+    the recipe → fetch its image → minify the image. Stages are connected by bounded queues, so a fast stage
+    waits for a slow one instead of piling up pages in memory, and each stage runs its own number of workers.
+    Report entries are written as each URL succeeds or fails, so the report shows progress while the import runs.
+    """
+
+    parse_workers = 4
+    persist_workers = 1
+    """recipes are saved one at a time, since the workers share a database session"""
+    image_fetch_workers = 4
+    image_write_workers = 2
+    queue_size = 8
 
     def __init__(
         self, service: RecipeService, repos: AllRepositories, group: GroupInDB, translator: Translator
@@ -27,9 +62,11 @@ class RecipeBulkScraperService(BaseService):
         self.service = service
         self.repos = repos
         self.group = group
-        self.report_entries = []
         self.translator = translator
 
+        self.imported = 0
+        self.failed = 0
+
         super().__init__()
 
     def get_report_id(self) -> UUID4:
@@ -43,85 +80,171 @@ class RecipeBulkScraperService(BaseService):
         self.report = self.repos.group_reports.create(import_report)
         return self.report.id
 
-    def _add_error_entry(self, message: str, exception: str = "") -> None:
-        self.report_entries.append(
-            ReportEntryCreate(
-                report_id=self.report.id,
-                success=False,
-                message=message,
-                exception=exception,
+    def _add_entry(self, success: bool, message: str, exception: str = "") -> None:
+        try:
+            self.repos.group_report_entries.create(
+                ReportEntryCreate(
+                    report_id=self.report.id,
+                    success=success,
+                    message=message,
+                    exception=exception,
+                )
             )
-        )
-
-    def _save_all_entries(self) -> None:
-        is_success = True
-        is_failure = True
-
-        new_entries: list[ReportEntryOut] = []
-        for entry in self.report_entries:
-            if is_failure and entry.success:
-                is_failure = False
-
-            if is_success and not entry.success:
-                is_success = False
+        except Exception:
+            # entries are written from the pipeline workers' error handlers, so this must not raise: a worker
+            # that dies leaves its queue unfinished, and the import waits for it forever
+            self.logger.exception(f"failed to save bulk import report entry: {message}")
 
-            new_entries.append(self.repos.group_report_entries.create(entry))
+    def _add_error_entry(self, message: str, exception: str = "") -> None:
+        self.failed += 1
+        self._add_entry(False, message, exception)
 
-        if is_success:
+    def _save_report_status(self) -> None:
+        if not self.failed:
             self.report.status = ReportSummaryStatus.success
-
-        if is_failure:
+        elif not self.imported:
             self.report.status = ReportSummaryStatus.failure
-
-        if not is_success and not is_failure:
+        else:
             self.report.status = ReportSummaryStatus.partial
 
-        self.report.entries = new_entries
-        self.repos.group_reports.update(self.report.id, self.report)
+        # the entries were saved as they happened, so only the status is updated
+        self.repos.group_reports.patch(self.report.id, {"status": self.report.status})
+
+    async def _fetch(self, item: BulkImportItem, client: AsyncClient, domain_limiter: DomainLimiter) -> bool:
+        try:
+            item.url = extract_url(item.request.url)
+            async with domain_limiter.limit(item.url):
+                item.html = await safe_scrape_html(item.url, client)
+        except Exception as e:
+            self.logger.exception(f"failed to scrape url during bulk url import {item.request.url}")
+            self._add_error_entry(f"failed to scrape url {item.request.url}", str(e))
+            return False
+
+        if not item.html:
+            self._add_error_entry(f"failed to scrape url {item.url}", "no content was returned")
+            return False
+
+        return True
+
+    async def _parse(self, item: BulkImportItem) -> bool:
+        try:
+            recipe, _ = await scrape_recipe(item.url, self.translator, item.html)
+        except Exception as e:
+            self.logger.exception(f"failed to scrape url during bulk url import {item.url}")
+            self._add_error_entry(f"failed to scrape url {item.url}", str(e))
+            return False
+        finally:
+            item.html = ""
+
+        item.image_url = recipe.image[0] if recipe.image and isinstance(recipe.image, list) else recipe.image
+        recipe.image = "no image"
+        if not recipe.name:
+            recipe.name = f"No Recipe Name Found - {uuid4()!s}"
+
+        if item.request.tags:
+            recipe.tags = item.request.tags
+
+        if item.request.categories:
+            recipe.recipe_category = item.request.categories
+
+        item.recipe = recipe
+        return True
+
+    async def _persist(self, item: BulkImportItem) -> bool:
+        if item.recipe is None:
+            return False
+
+        try:
+            recipe = self.service.create_one(item.recipe)
+        except Exception as e:
+            self.logger.exception(f"Failed to save recipe to database during bulk url import {item.url}")
+            self._add_error_entry(f"Failed to save recipe to database during bulk url import {item.url}", str(e))
+            return False
+        finally:
+            item.recipe = None
+
+        self.imported += 1
+        self._add_entry(True, f"Successfully imported recipe {recipe.name}")
+
+        item.recipe_id = recipe.id
+        item.slug = recipe.slug
+        return bool(item.image_url)
+
+    async def _fetch_image(self, item: BulkImportItem, client: AsyncClient) -> bool:
+        if item.recipe_id is None or not item.image_url:
+            return False
+
+        try:
+            item.image = await RecipeDataService(item.recipe_id).fetch_image(item.image_url, client)
+        except Exception as e:
+            self.logger.exception(f"Error Scraping Image: {e}")
+            return False
+
+        return item.image is not None
+
+    async def _write_image(self, item: BulkImportItem) -> bool:
+        if item.recipe_id is None or item.image is None:
+            return False
+
+        try:
+            # the image is minified in the background, and the recipe's image key updated once it's ready
+            await asyncio.to_thread(
+                RecipeDataService(item.recipe_id).write_image_in_background,
+                *item.image,
+                on_done=partial(update_recipe_image_key, item.recipe_id),
+            )
+        except Exception as e:
+            self.logger.exception(f"Error Scraping Image: {e}")
+        finally:
+            item.image = None
 
-    async def scrape(self, urls: CreateRecipeByUrlBulk) -> None:
-        sem = asyncio.Semaphore(3)
-
-        async def _do(url: str) -> Recipe | None:
-            async with sem:
-                try:
-                    recipe, _ = await create_from_html(url, self.translator)
-                    return recipe
-                except Exception as e:
-                    self.service.logger.error(f"failed to scrape url during bulk url import {url}")
-                    self.service.logger.exception(e)
-                    self._add_error_entry(f"failed to scrape url {url}", str(e))
-                    return None
+        return True
 
+    async def scrape(self, urls: CreateRecipeByUrlBulk) -> None:
         if self.report is None:
             self.get_report_id()
-        tasks = [_do(b.url) for b in urls.imports]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        for b, recipe in zip(urls.imports, results, strict=True):
-            if not recipe or isinstance(recipe, BaseException):
-                continue
 
-            if b.tags:
-                recipe.tags = b.tags
+        domain_limiter = DomainLimiter(self.settings.SCRAPER_MAX_PER_DOMAIN, self.settings.SCRAPER_DOMAIN_DELAY)
+
+        # every page and image is fetched with the same client, so connections to each site are reused
+        async with create_scraper_client(max_connections=self.settings.SCRAPER_MAX_CONCURRENCY * 2) as client:
+            stages: list[tuple[Callable[[BulkImportItem], Awaitable[bool]], int]] = [
+                (lambda item: self._fetch(item, client, domain_limiter), self.settings.SCRAPER_MAX_CONCURRENCY),
+                (self._parse, self.parse_workers),
+                (self._persist, self.persist_workers),
+                (lambda item: self._fetch_image(item, client), self.image_fetch_workers),
+                (self._write_image, self.image_write_workers),
+            ]
+            queues: list[asyncio.Queue[BulkImportItem]] = [asyncio.Queue(self.queue_size) for _ in stages]
+
+            async def worker(stage: int) -> None:
+                process, _ = stages[stage]
+                inbox = queues[stage]
+                while True:
+                    item = await inbox.get()
+                    try:
+                        if await process(item) and stage + 1 < len(stages):
+                            await queues[stage + 1].put(item)
+                    except Exception as e:
+                        self.logger.exception(f"unexpected error during bulk url import {item.request.url}")
+                        self._add_error_entry(f"failed to import url {item.request.url}", str(e))
+                    finally:
+                        inbox.task_done()
+
+            workers = [
+                asyncio.create_task(worker(stage)) for stage, (_, count) in enumerate(stages) for _ in range(count)
+            ]
+            try:
+                for request in urls.imports:
+                    await queues[0].put(BulkImportItem(request))
 
-            if b.categories:
-                recipe.recipe_category = b.categories
+                # each stage is drained in order, so once a queue is empty nothing can be added to it again
+                for queue in queues:
+                    await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
 
-            try:
-                self.service.create_one(recipe)
-            except Exception as e:
-                self.service.logger.error(f"Failed to save recipe to database during bulk url import {b.url}")
-                self.service.logger.exception(e)
-                self._add_error_entry(f"Failed to save recipe to database during bulk url import {b.url}", str(e))
-                continue
-
-            self.report_entries.append(
-                ReportEntryCreate(
-                    report_id=self.report.id,
-                    success=True,
-                    message=f"Successfully imported recipe {recipe.name}",
-                    exception="",
-                )
-            )
+                await asyncio.gather(*workers, return_exceptions=True)
 
-        self._save_all_entries()
+        self._save_report_status()
@@ -1,15 +1,23 @@
+import asyncio
+
+from httpx import AsyncClient
+
+from mealie.core.config import get_app_settings
 from mealie.core.root_logger import get_logger
 from mealie.lang.providers import Translator
 from mealie.schema.recipe.recipe import Recipe
 from mealie.services.scraper import cleaner
 from mealie.services.scraper.scraped_extras import ScrapedExtras
 
+from .scraped_document import ScrapedDocument
+from .scraper_pool import get_scraper_pool
 from .scraper_strategies import (
     ABCScraperStrategy,
     RecipeScraperOpenAI,
     RecipeScraperOpenGraph,
     RecipeScraperPackage,
     safe_scrape_html,
+    scrape_page,
 )
 
 DEFAULT_SCRAPER_STRATEGIES: list[type[ABCScraperStrategy]] = [
@@ -19,6 +27,30 @@ DEFAULT_SCRAPER_STRATEGIES: list[type[ABCScraperStrategy]] = [
 ]
 
 
+_worker_document: ScrapedDocument | None = None
+"""the page last parsed in this scraper pool process, which the next strategy tried against it reuses"""
+
+
+def _get_worker_document(url: str, html: str) -> ScrapedDocument:
+    global _worker_document
+
+    if _worker_document is None or _worker_document.url != url or _worker_document.html != html:
+        _worker_document = ScrapedDocument(url, html)
+
+    return _worker_document
+
+
+def _parse_in_worker(
+    scraper_type: type[ABCScraperStrategy], url: str, html: str, translator: Translator
+) -> tuple[Recipe, ScrapedExtras] | tuple[None, None]:
+    """
+    Runs a CPU-bound strategy against an already fetched page, in a scraper pool process. The page is shared
+    with the strategy tried before it, when that one ran in the same process.
+    """
+    document = _get_worker_document(url, html)
+    return asyncio.run(scraper_type(url, translator, raw_html=html, document=document).parse())
+
+
 class RecipeScraper:
     """
     Scrapes recipes from the web.
@@ -35,18 +67,41 @@ class RecipeScraper:
         self.translator = translator
         self.logger = get_logger()
 
-    async def scrape(self, url: str, html: str | None = None) -> tuple[Recipe, ScrapedExtras] | tuple[None, None]:
+    async def scrape(
+        self, url: str, html: str | None = None, client: AsyncClient | None = None, partial: bool = False
+    ) -> tuple[Recipe, ScrapedExtras] | tuple[None, None]:
         """
         Scrapes a recipe from the web.
-        Skips the network request if `html` is provided.
+        Skips the network request if `html` is provided, which is `partial` if its download stopped at
+        the JSON-LD recipe. The page is parsed at most once, and shared by every strategy that's tried in this process.
+
+        When `SCRAPER_STOP_AT_RECIPE` is enabled, only the start of the page is downloaded at first. The rest of it
+        is only downloaded if a strategy that reads more than the JSON-LD recipe has to be tried.
+
+        Parsing and cleaning run in the scraper process pool, when there is one, so they don't block
+        the event loop. Strategies that aren't `cpu_bound` still parse here, since they do their own I/O.
         """
 
-        raw_html = html or await safe_scrape_html(url)
+        raw_html = html
+        if not raw_html:
+            page = await scrape_page(url, client, stop_at_recipe=get_app_settings().SCRAPER_STOP_AT_RECIPE)
+            raw_html, partial = page.html, page.partial
+
+        document = ScrapedDocument(url, raw_html)
+        pool = get_scraper_pool() if raw_html else None
         for scraper_type in self.scrapers:
-            scraper = scraper_type(url, self.translator, raw_html=raw_html)
+            if partial and not scraper_type.reads_partial_html:
+                raw_html, partial = await safe_scrape_html(url, client), False
+                document = ScrapedDocument(url, raw_html)
+                pool = get_scraper_pool() if raw_html else None
+
+            scraper = scraper_type(url, self.translator, raw_html=raw_html, document=document)
 
             try:
-                result = await scraper.parse()
+                if pool is not None and scraper.cpu_bound:
+                    result = await pool.run(_parse_in_worker, scraper_type, url, raw_html, self.translator)
+                else:
+                    result = await scraper.parse()
             except Exception:
                 self.logger.exception(f"Failed to scrape HTML with {scraper.__class__.__name__}")
                 result = None
@@ -56,7 +111,10 @@ class RecipeScraper:
 
             recipe_result, extras = result
             try:
-                recipe = cleaner.clean(recipe_result, self.translator)
+                if pool is not None:
+                    recipe = await pool.run(cleaner.clean, recipe_result, self.translator)
+                else:
+                    recipe = cleaner.clean(recipe_result, self.translator)
             except Exception:
                 self.logger.exception(f"Failed to clean recipe data from {scraper.__class__.__name__}")
                 continue
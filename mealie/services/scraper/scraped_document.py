@@ -0,0 +1,89 @@
+from functools import cached_property
+from typing import Any
+
+import bs4
+from extruct import extract
+from extruct.utils import parse_html
+from lxml.etree import ParserError
+from lxml.html import HtmlElement
+from recipe_scrapers import AbstractScraper, scrape_html
+from w3lib.html import get_base_url
+
+from mealie.core.root_logger import get_logger
+
+logger = get_logger()
+
+
+class ScrapedDocument:
+    """
+    A fetched page, shared by every scraper strategy that runs against it. The page is only parsed the first
+    time a strategy asks for a representation of it (a tree, a soup, or extracted metadata), and each
+    representation is reused by the strategies that run after it.
+    """
+
+    def __init__(self, url: str, html: str) -> None:
+        self.url = url
+        self.html = html
+
+        self._soup: bs4.BeautifulSoup | None = None
+        self._recipe_scraper: AbstractScraper | None = None
+        self._metadata: dict[str, list[Any]] = {}
+
+    @cached_property
+    def base_url(self) -> str:
+        return get_base_url(self.html, self.url)
+
+    @cached_property
+    def tree(self) -> HtmlElement | None:
+        """The page parsed with lxml, or `None` if it couldn't be parsed"""
+        try:
+            return parse_html(self.html.encode(), encoding="UTF-8")
+        except (ParserError, ValueError):
+            logger.debug(f"Unable to parse HTML from {self.url}")
+            return None
+
+    @property
+    def soup(self) -> bs4.BeautifulSoup:
+        """
+        The page parsed with BeautifulSoup. If recipe-scrapers already parsed the page,
+        its soup is reused rather than parsing the page again.
+        """
+        if self._soup is None:
+            self._soup = bs4.BeautifulSoup(self.html, "lxml")
+
+        return self._soup
+
+    def recipe_scraper(self) -> AbstractScraper:
+        """Returns the recipe-scrapers scraper for the page, raising the same errors as `scrape_html`"""
+        if self._recipe_scraper is None:
+            # scrape_html requires a URL, but we might not have one, so we default to a dummy URL
+            self._recipe_scraper = scrape_html(
+                self.html, org_url=self.url or "https://example.com", supported_only=False
+            )
+            if self._soup is None:
+                self._soup = self._recipe_scraper.soup
+
+        return self._recipe_scraper
+
+    def metadata(self, syntax: str) -> list[Any]:
+        """Returns the page's metadata in `syntax` (e.g. "json-ld" or "opengraph"), as extracted by extruct"""
+        if syntax not in self._metadata:
+            if self.tree is None:
+                self._metadata[syntax] = []
+            else:
+                data = extract(self.tree, base_url=self.base_url, syntaxes=[syntax], errors="log")
+                self._metadata[syntax] = data.get(syntax, [])
+
+        return self._metadata[syntax]
+
+    @property
+    def json_ld(self) -> list[Any]:
+        return self.metadata("json-ld")
+
+    @property
+    def microdata(self) -> list[Any]:
+        return self.metadata("microdata")
+
+    @property
+    def opengraph(self) -> list[Any]:
+        return self.metadata("opengraph")
@@ -1,14 +1,17 @@
 from enum import Enum
+from functools import partial
 from re import search as regex_search
 from uuid import uuid4
 
 from fastapi import HTTPException, status
+from httpx import AsyncClient
 from slugify import slugify
 
 from mealie.core.root_logger import get_logger
 from mealie.lang.providers import Translator
 from mealie.pkgs import cache
 from mealie.schema.recipe import Recipe
+from mealie.services.recipe.image_processor import update_recipe_image_key
 from mealie.services.recipe.recipe_data_service import RecipeDataService
 from mealie.services.scraper.scraped_extras import ScrapedExtras
 
@@ -21,15 +24,25 @@ class ParserErrors(str, Enum):
     CONNECTION_ERROR = "CONNECTION_ERROR"
 
 
-async def create_from_html(
-    url: str, translator: Translator, html: str | None = None
+def extract_url(text: str) -> str:
+    """Returns the first URL in `text`, which may contain more than the URL (e.g. text shared from another app)"""
+    extracted_url = regex_search(r"(https?://|www\.)[^\s]+", text)
+    if not extracted_url:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, {"details": ParserErrors.BAD_RECIPE_DATA.value})
+
+    return extracted_url.group(0)
+
+
+async def scrape_recipe(
+    url: str, translator: Translator, html: str | None = None, client: AsyncClient | None = None
 ) -> tuple[Recipe, ScrapedExtras | None]:
-    """Main entry point for generating a recipe from a URL. Pass in a URL and
-    a Recipe object will be returned if successful. Optionally pass in the HTML to skip fetching it.
+    """Scrapes a recipe from a URL without fetching its image, so `recipe.image` is still the scraped image URL.
+    The recipe is given a new id, which its image should be stored under.
 
     Args:
         url (str): a valid string representing a URL
         html (str | None): optional HTML string to skip network request. Defaults to None.
+        client (AsyncClient | None): optional shared client used to fetch the page. Defaults to None.
 
     Returns:
         Recipe: Recipe Object
@@ -37,17 +50,33 @@ async def create_from_html(
     scraper = RecipeScraper(translator)
 
     if not html:
-        extracted_url = regex_search(r"(https?://|www\.)[^\s]+", url)
-        if not extracted_url:
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, {"details": ParserErrors.BAD_RECIPE_DATA.value})
-        url = extracted_url.group(0)
+        url = extract_url(url)
 
-    new_recipe, extras = await scraper.scrape(url, html)
+    new_recipe, extras = await scraper.scrape(url, html, client)
 
     if not new_recipe:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, {"details": ParserErrors.BAD_RECIPE_DATA.value})
 
     new_recipe.id = uuid4()
+    return new_recipe, extras
+
+
+async def create_from_html(
+    url: str, translator: Translator, html: str | None = None, client: AsyncClient | None = None
+) -> tuple[Recipe, ScrapedExtras | None]:
+    """Main entry point for generating a recipe from a URL. Pass in a URL and
+    a Recipe object will be returned if successful. Optionally pass in the HTML to skip fetching it.
+
+    Args:
+        url (str): a valid string representing a URL
+        html (str | None): optional HTML string to skip network request. Defaults to None.
+        client (AsyncClient | None): optional shared client used to fetch the page and its image. Defaults to None.
+
+    Returns:
+        Recipe: Recipe Object
+    """
+    new_recipe, extras = await scrape_recipe(url, translator, html, client)
+
     logger = get_logger()
     logger.debug(f"Image {new_recipe.image}")
 
@@ -56,7 +85,11 @@ async def create_from_html(
     try:
         if new_recipe.image and isinstance(new_recipe.image, list):
             new_recipe.image = new_recipe.image[0]
-        await recipe_data_service.scrape_image(new_recipe.image)  # type: ignore
+        await recipe_data_service.scrape_image(
+            new_recipe.image,  # type: ignore
+            client,
+            on_done=partial(update_recipe_image_key, new_recipe.id),
+        )
 
         if new_recipe.name is None:
             new_recipe.name = "Untitled"
@@ -0,0 +1,84 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any
+
+from mealie.core.config import get_app_settings
+from mealie.core.root_logger import get_logger
+
+logger = get_logger()
+
+
+def _call_with_timeout(timeout: float, fn: Callable[..., Any], *args) -> Any:
+    """Runs in a worker process, interrupting `fn` with a `TimeoutError` once it has run for `timeout` seconds"""
+    if timeout <= 0 or not hasattr(signal, "setitimer"):
+        return fn(*args)
+
+    def on_timeout(*_) -> None:
+        raise TimeoutError(f"scraping took longer than {timeout} seconds")
+
+    previous = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class ScraperPool:
+    """
+    A bounded pool of worker processes for parsing scraped pages. Parsing HTML and cleaning recipes is pure
+    Python that holds the GIL, so on the event loop a single heavy page stalls every other request in the
+    worker. Calls are interrupted with a `TimeoutError` once they've run for `timeout` seconds, so a
+    pathological page can't tie up a process indefinitely.
+
+    Arguments and results cross a process boundary, so they must be picklable.
+    """
+
+    def __init__(self, workers: int, timeout: float) -> None:
+        self.workers = max(1, workers)
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # workers are spawned rather than forked, since forking a process with running threads isn't safe
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def run[T](self, fn: Callable[..., T], *args) -> T:
+        executor = self._executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, _call_with_timeout, self.timeout, fn, *args
+            )
+        except BrokenProcessPool:
+            # a worker died (e.g. it ran out of memory), which breaks the whole pool, so it's replaced
+            logger.error("A scraper worker process died unexpectedly, restarting the scraper pool")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = self._create_executor()
+
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_scraper_pool() -> ScraperPool | None:
+    """Returns the shared scraper pool, or `None` if pages are parsed in-process"""
+    settings = get_app_settings()
+    if settings.TESTING:
+        return None
+
+    workers = settings.SCRAPER_WORKERS or min(4, os.cpu_count() or 1)
+    return ScraperPool(workers, settings.SCRAPER_PARSE_TIMEOUT)
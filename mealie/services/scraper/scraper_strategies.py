@@ -1,15 +1,16 @@
+import asyncio
 import time
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 import bs4
-import extruct
 from fastapi import HTTPException, status
 from httpx import AsyncClient, Response
-from recipe_scrapers import NoSchemaFoundInWildMode, SchemaScraperFactory, scrape_html
+from recipe_scrapers import SCRAPERS, NoSchemaFoundInWildMode, SchemaScraperFactory
+from recipe_scrapers._utils import get_host_name
 from slugify import slugify
-from w3lib.html import get_base_url
 
 from mealie.core.config import get_app_settings
 from mealie.core.root_logger import get_logger
@@ -20,6 +21,9 @@ from mealie.services.openai import OpenAIService
 from mealie.services.scraper.scraped_extras import ScrapedExtras
 
 from . import cleaner
+from .html_cache import get_scraped_html_cache
+from .html_stream import RecipeJsonLdDetector
+from .scraped_document import ScrapedDocument
 from .user_agents_manager import get_user_agents_manager
 
 SCRAPER_TIMEOUT = 15
@@ -30,70 +34,187 @@ class ForceTimeoutException(Exception):
     pass
 
 
-async def safe_scrape_html(url: str) -> str:
+@dataclass(slots=True)
+class FetchedHTML:
+    status_code: int
+    html: str = ""
+    etag: str | None = None
+    last_modified: str | None = None
+
+    truncated: bool = False
+    """whether the download was cut off at the size limit, so the page is incomplete"""
+
+    partial: bool = False
+    """whether the download stopped at the page's JSON-LD recipe, so only that much of the page was received"""
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def _decode_html(response: Response, html_bytes: bytes | bytearray) -> str:
+    # =====================================
+    # Copied from requests text property
+
+    # Try charset from content-type
+    content = None
+    encoding = response.encoding
+
+    # Fallback to auto-detected encoding.
+    if encoding is None:
+        encoding = response.apparent_encoding
+
+    # Decode unicode from given encoding.
+    try:
+        content = str(html_bytes, encoding, errors="replace")
+    except (LookupError, TypeError):
+        # A LookupError is raised if the encoding was not found which could
+        # indicate a misspelling or similar mistake.
+        #
+        # A TypeError can be raised if encoding is None
+        #
+        # So we try blindly encoding.
+        content = str(html_bytes, errors="replace")
+
+    return content
+
+
+def can_stop_at_recipe(url: str) -> bool:
     """
-    Scrapes the html from a url but will cancel the request
-    if the request takes longer than 15 seconds. This is used to mitigate
-    DDOS attacks from users providing a url with arbitrary large content.
+    Returns whether the recipe scrapers would only read the page's JSON-LD recipe. Sites with a site-specific
+    scraper may read any part of the page, so they're always downloaded in full.
+    """
+    try:
+        return get_host_name(url) not in SCRAPERS
+    except Exception:
+        return False
+
+
+async def _read_html(resp: Response, max_bytes: int, detector: RecipeJsonLdDetector | None) -> tuple[bytearray, bool]:
+    """
+    Reads the response body into a single growing buffer, returning it along with whether it was cut off at
+    `max_bytes`. If a `detector` is given, the download stops as soon as it has found a complete JSON-LD Recipe.
+    """
+    buffer = bytearray()
+    start_time = time.time()
+
+    # chunks are handled as they arrive rather than re-chunked, so the download can stop as early as possible
+    async for chunk in resp.aiter_bytes():
+        buffer += chunk
+
+        if time.time() - start_time > SCRAPER_TIMEOUT:
+            raise ForceTimeoutException()
+
+        if detector and detector.feed(buffer):
+            logger.debug(f"Found a recipe after downloading {len(buffer)} bytes, skipping the rest of the page")
+            break
+
+        if len(buffer) >= max_bytes:
+            logger.warning(f"Page is larger than {max_bytes} bytes, only the start of it will be scraped")
+            del buffer[max_bytes:]
+            return buffer, True
+
+    return buffer, False
+
+
+async def fetch_html(
+    url: str,
+    client: AsyncClient,
+    headers: dict[str, str] | None = None,
+    max_bytes: int | None = None,
+    stop_at_recipe: bool = False,
+) -> FetchedHTML | None:
+    """
+    Fetches the html from a url, trying each user agent until one isn't forbidden, starting with the one
+    that last worked for the site. The request is cancelled if it takes longer than 15 seconds or the
+    page is larger than `max_bytes`. Extra `headers` (e.g. conditional request headers) are sent with
+    every attempt. Returns `None` if every user agent was forbidden.
+
+    If `stop_at_recipe` is set, the download stops once a complete JSON-LD recipe has been received and the
+    result is marked `partial`, unless the site has a site-specific scraper that needs the whole page.
     """
     user_agents_manager = get_user_agents_manager()
+    if max_bytes is None:
+        max_bytes = get_app_settings().SCRAPER_MAX_PAGE_SIZE * 1024 * 1024
+    stop_at_recipe = stop_at_recipe and can_stop_at_recipe(url)
 
     logger.debug(f"Scraping URL: {url}")
-    async with AsyncClient(transport=safehttp.AsyncSafeTransport()) as client:
-        for user_agent in user_agents_manager.user_agents:
-            logger.debug(f'Trying User-Agent: "{user_agent}"')
-
-            response: Response | None = None
-            html_bytes = b""
-            async with client.stream(
-                "GET",
-                url,
-                timeout=SCRAPER_TIMEOUT,
-                headers=user_agents_manager.get_scrape_headers(user_agent),
-                follow_redirects=True,
-            ) as resp:
-                if resp.status_code == status.HTTP_403_FORBIDDEN:
-                    logger.debug(f'403 Forbidden with User-Agent: "{user_agent}"')
-                    continue
-
-                start_time = time.time()
-
-                async for chunk in resp.aiter_bytes(chunk_size=1024):
-                    html_bytes += chunk
-
-                    if time.time() - start_time > SCRAPER_TIMEOUT:
-                        raise ForceTimeoutException()
-
-                response = resp
-                break
-
-        if not (response and html_bytes):
-            return ""
+    # the user agent records live in SQLite, so they're read and written off the event loop
+    for user_agent in await asyncio.to_thread(user_agents_manager.user_agents_for, url):
+        logger.debug(f'Trying User-Agent: "{user_agent}"')
+
+        async with client.stream(
+            "GET",
+            url,
+            timeout=SCRAPER_TIMEOUT,
+            headers=user_agents_manager.get_scrape_headers(user_agent) | (headers or {}),
+            follow_redirects=True,
+        ) as resp:
+            if resp.status_code == status.HTTP_403_FORBIDDEN:
+                logger.debug(f'403 Forbidden with User-Agent: "{user_agent}"')
+                await asyncio.to_thread(user_agents_manager.record_user_agent, url, user_agent, blocked=True)
+                continue
 
-        # =====================================
-        # Copied from requests text property
+            if resp.status_code < status.HTTP_400_BAD_REQUEST:
+                await asyncio.to_thread(user_agents_manager.record_user_agent, url, user_agent, blocked=False)
+
+            detector = RecipeJsonLdDetector() if stop_at_recipe else None
+            html_bytes, truncated = await _read_html(resp, max_bytes, detector)
+            return FetchedHTML(
+                status_code=resp.status_code,
+                html=_decode_html(resp, html_bytes) if html_bytes else "",
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+                truncated=truncated,
+                partial=detector is not None and detector.found,
+            )
 
-        # Try charset from content-type
-        content = None
-        encoding = response.encoding
+    return None
 
-        # Fallback to auto-detected encoding.
-        if encoding is None:
-            encoding = response.apparent_encoding
 
-        # Decode unicode from given encoding.
-        try:
-            content = str(html_bytes, encoding, errors="replace")
-        except (LookupError, TypeError):
-            # A LookupError is raised if the encoding was not found which could
-            # indicate a misspelling or similar mistake.
-            #
-            # A TypeError can be raised if encoding is None
-            #
-            # So we try blindly encoding.
-            content = str(html_bytes, errors="replace")
+async def scrape_page(url: str, client: AsyncClient | None = None, stop_at_recipe: bool = False) -> FetchedHTML:
+    """
+    Fetches a page the same way as `safe_scrape_html`, but returns it along with whether it's `partial`.
+    Partial pages are never cached, since they're only useful to the strategies that read the JSON-LD recipe.
+    """
+    cache = get_scraped_html_cache()
+    cached = await asyncio.to_thread(cache.get, url) if cache is not None else None
+    if cache is not None and cached and cached.is_fresh(cache.ttl):
+        logger.debug(f"Using cached HTML for URL: {url}")
+        return FetchedHTML(status.HTTP_200_OK, cached.html)
+
+    headers = cached.validators if cached else None
+    if client is None:
+        async with AsyncClient(transport=safehttp.AsyncSafeTransport()) as client:
+            fetched = await fetch_html(url, client, headers, stop_at_recipe=stop_at_recipe)
+    else:
+        fetched = await fetch_html(url, client, headers, stop_at_recipe=stop_at_recipe)
+
+    if not fetched:
+        return FetchedHTML(status.HTTP_403_FORBIDDEN)
+
+    if cache is not None and cached and fetched.not_modified:
+        logger.debug(f"Cached HTML is still current for URL: {url}")
+        await asyncio.to_thread(cache.mark_revalidated, url)
+        return FetchedHTML(status.HTTP_200_OK, cached.html)
+
+    complete = not fetched.truncated and not fetched.partial
+    if cache is not None and fetched.html and complete and fetched.status_code == status.HTTP_200_OK:
+        await asyncio.to_thread(cache.set, url, fetched.html, etag=fetched.etag, last_modified=fetched.last_modified)
+
+    return fetched
+
 
-        return content
+async def safe_scrape_html(url: str, client: AsyncClient | None = None) -> str:
+    """
+    Scrapes the html from a url but will cancel the request
+    if the request takes longer than 15 seconds. This is used to mitigate
+    DDOS attacks from users providing a url with arbitrary large content.
+
+    Pages are served from the scraped html cache while they're fresh, and revalidated with the site
+    once they aren't. Pass in a shared `client` to reuse its connections across requests.
+    """
+    return (await scrape_page(url, client)).html
 
 
 class ABCScraperStrategy(ABC):
@@ -103,20 +224,35 @@ class ABCScraperStrategy(ABC):
 
     url: str
 
+    cpu_bound = False
+    """whether `parse` only does CPU work on `raw_html`, so it can run in the scraper process pool"""
+
+    reads_partial_html = False
+    """whether `parse` only needs the page up to its JSON-LD recipe, so it can run against a partial page"""
+
     def __init__(
         self,
         url: str,
         translator: Translator,
         raw_html: str | None = None,
+        document: ScrapedDocument | None = None,
     ) -> None:
         self.logger = get_logger()
         self.url = url
         self.raw_html = raw_html
+        self.document = document
         self.translator = translator
 
     @abstractmethod
     async def get_html(self, url: str) -> str: ...
 
+    def get_document(self, html: str) -> ScrapedDocument:
+        """Returns the document shared with the other strategies if it holds `html`, otherwise a new one"""
+        if self.document is not None and self.document.html == html:
+            return self.document
+
+        return ScrapedDocument(self.url, html)
+
     @abstractmethod
     async def parse(self) -> tuple[Recipe, ScrapedExtras] | tuple[None, None]:
         """Parse a recipe from a web URL.
@@ -131,6 +267,9 @@ class ABCScraperStrategy(ABC):
 
 
 class RecipeScraperPackage(ABCScraperStrategy):
+    cpu_bound = True
+    reads_partial_html = True
+
     @staticmethod
     def ld_json_to_html(ld_json: str) -> str:
         return (
@@ -225,8 +364,7 @@ class RecipeScraperPackage(ABCScraperStrategy):
         recipe_html = await self.get_html(self.url)
 
         try:
-            # scrape_html requires a URL, but we might not have one, so we default to a dummy URL
-            scraped_schema = scrape_html(recipe_html, org_url=self.url or "https://example.com", supported_only=False)
+            scraped_schema = self.get_document(recipe_html).recipe_scraper()
         except (NoSchemaFoundInWildMode, AttributeError):
             self.logger.error(f"Recipe Scraper was unable to extract a recipe from {self.url}")
             return None
@@ -269,6 +407,9 @@ class RecipeScraperOpenAI(RecipeScraperPackage):
     rather than trying to scrape it directly.
     """
 
+    cpu_bound = False
+    reads_partial_html = False
+
     def extract_json_ld_data_from_html(self, soup: bs4.BeautifulSoup) -> str:
         data_parts: list[str] = []
         for script in soup.find_all("script", type="application/ld+json"):
@@ -310,7 +451,7 @@ class RecipeScraperOpenAI(RecipeScraperPackage):
         return None
 
     def format_html_to_text(self, html: str) -> str:
-        soup = bs4.BeautifulSoup(html, "lxml")
+        soup = self.get_document(html).soup
 
         text = soup.get_text(separator="\n", strip=True)
         text += self.extract_json_ld_data_from_html(soup)
@@ -333,7 +474,8 @@ class RecipeScraperOpenAI(RecipeScraperPackage):
             return ""
 
         html = self.raw_html or await safe_scrape_html(url)
-        text = self.format_html_to_text(html)
+        # the page is parsed in a thread, so a large page doesn't block the event loop
+        text = await asyncio.to_thread(self.format_html_to_text, html)
         try:
             service = OpenAIService()
             prompt = service.get_prompt("recipes.scrape-recipe")
@@ -349,6 +491,8 @@ class RecipeScraperOpenAI(RecipeScraperPackage):
 
 
 class RecipeScraperOpenGraph(ABCScraperStrategy):
+    cpu_bound = True
+
     async def get_html(self, url: str) -> str:
         return self.raw_html or await safe_scrape_html(url)
 
@@ -363,10 +507,8 @@ class RecipeScraperOpenGraph(ABCScraperStrategy):
         def og_fields(properties: list[tuple[str, str]], field_name: str) -> list[str]:
             return list({val for name, val in properties if name == field_name})
 
-        base_url = get_base_url(html, self.url)
-        data = extruct.extract(html, base_url=base_url, errors="log")
         try:
-            properties = data["opengraph"][0]["properties"]
+            properties = self.get_document(html).opengraph[0]["properties"]
         except Exception:
             return None
 
@@ -2,23 +2,153 @@ from __future__ import annotations
 
 import os
 import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from mealie.core.config import get_app_dirs, get_app_settings
+
+from .http_client import DomainLimiter
 
 _USER_AGENTS_MANAGER: UserAgentsManager | None = None
 
+REFRESH_INTERVAL = 60 * 60
+"""seconds an unchanged record goes without being written again, and between removing expired records"""
+
+MAX_KNOWN_DOMAINS = 1000
+"""number of sites whose records are kept in memory, to tell when a record hasn't changed"""
+
 
 def get_user_agents_manager() -> UserAgentsManager:
     global _USER_AGENTS_MANAGER
 
     if not _USER_AGENTS_MANAGER:
-        _USER_AGENTS_MANAGER = UserAgentsManager()
+        ttl = get_app_settings().SCRAPER_USER_AGENT_TTL
+        memory = DomainUserAgents(get_app_dirs().CACHE_DIR / "scraper-user-agents.db", ttl) if ttl > 0 else None
+        _USER_AGENTS_MANAGER = UserAgentsManager(memory)
 
     return _USER_AGENTS_MANAGER
 
 
+class DomainUserAgents:
+    """
+    Remembers, for each site, the user agent that last fetched a page from it and the user agents it rejected
+    with a 403. Records are shared by every worker through a small SQLite database and expire after `ttl`
+    seconds, since sites change what they block.
+
+    Records are only written when they change, or every `REFRESH_INTERVAL` seconds to keep them from
+    expiring, so scraping a site with a user agent that keeps working doesn't write on every request.
+    """
+
+    def __init__(self, path: Path, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.refresh_interval = min(REFRESH_INTERVAL, ttl)
+        self._local = threading.local()
+        # each site's records, as last read or written by this process: user agent -> (blocked, updated)
+        self._known: dict[str, dict[str, tuple[bool, float]]] = {}
+        self._lock = threading.Lock()
+        self._cleaned_at = 0.0
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # connections are per thread, and a new thread may find the database removed since it was created
+            self._create_schema(conn)
+            self._local.conn = conn
+
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_agents (
+                domain TEXT NOT NULL,
+                user_agent TEXT NOT NULL,
+                blocked INTEGER NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (domain, user_agent)
+            )
+            """
+        )
+
+    def get(self, domain: str) -> tuple[str | None, set[str]]:
+        """Returns the user agent that last worked for `domain`, if any, and the user agents it rejected"""
+        rows = self._connection().execute(
+            "SELECT user_agent, blocked, updated FROM user_agents WHERE domain = ? AND updated > ? "
+            "ORDER BY updated DESC",
+            (domain, time.time() - self.ttl),
+        )
+
+        working: str | None = None
+        blocked: set[str] = set()
+        known: dict[str, tuple[bool, float]] = {}
+        for user_agent, is_blocked, updated in rows:
+            known[user_agent] = (bool(is_blocked), updated)
+            if is_blocked:
+                blocked.add(user_agent)
+            elif working is None:
+                working = user_agent
+
+        self._remember(domain, known)
+        return working, blocked
+
+    def _remember(self, domain: str, known: dict[str, tuple[bool, float]]) -> None:
+        with self._lock:
+            self._known.pop(domain, None)
+            if len(self._known) >= MAX_KNOWN_DOMAINS:
+                # forget the site that was looked up longest ago
+                self._known.pop(next(iter(self._known)))
+
+            self._known[domain] = known
+
+    def set(self, domain: str, user_agent: str, blocked: bool) -> None:
+        now = time.time()
+        known = self._known.get(domain, {})
+        if self._is_recorded(known, user_agent, blocked, now):
+            return
+
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO user_agents (domain, user_agent, blocked, updated) VALUES (?, ?, ?, ?)",
+            (domain, user_agent, int(blocked), now),
+        )
+        self._remember(domain, known | {user_agent: (blocked, now)})
+
+        if now - self._cleaned_at >= self.refresh_interval:
+            self._cleaned_at = now
+            conn.execute("DELETE FROM user_agents WHERE updated <= ?", (now - self.ttl,))
+
+    def _is_recorded(self, known: dict[str, tuple[bool, float]], user_agent: str, blocked: bool, now: float) -> bool:
+        """Whether the record is already stored, recently enough that writing it again can wait"""
+        if user_agent not in known:
+            return False
+
+        is_blocked, updated = known[user_agent]
+        if is_blocked != blocked or now - updated >= self.refresh_interval:
+            return False
+
+        # a user agent that works is only recorded already if it's the one that last worked
+        return blocked or all(
+            other_blocked or other_updated <= updated for other_blocked, other_updated in known.values()
+        )
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM user_agents")
+        self._known.clear()
+
+
 class UserAgentsManager:
-    def __init__(self) -> None:
+    def __init__(self, memory: DomainUserAgents | None = None) -> None:
         self._user_agents: list[str] | None = None
         self._user_agents_text_path = os.path.join(os.path.dirname(__file__), "user-agents.txt")
+        self.memory = memory
 
     def get_scrape_headers(self, user_agent: str | None = None) -> dict[str, str]:
         # From: https://scrapeops.io/web-scraping-playbook/403-forbidden-error-web-scraping/#optimize-request-headers
@@ -39,6 +169,37 @@ class UserAgentsManager:
             "Cache-Control": "max-age=0",
         }
 
+    def user_agents_for(self, url: str) -> list[str]:
+        """
+        Returns the user agents to try, in order, when fetching `url`. The user agent that last worked for the
+        site comes first, and the ones the site recently rejected are skipped, unless it rejected all of them.
+        """
+        if self.memory is None:
+            return self.user_agents
+
+        try:
+            working, blocked = self.memory.get(DomainLimiter.get_domain(url))
+        except sqlite3.Error:
+            # without the records every user agent is tried, as if the site had never been scraped
+            return self.user_agents
+
+        user_agents = [ua for ua in self.user_agents if ua not in blocked] or self.user_agents
+        if working in user_agents:
+            user_agents = [working, *(ua for ua in user_agents if ua != working)]
+
+        return user_agents
+
+    def record_user_agent(self, url: str, user_agent: str, blocked: bool) -> None:
+        """Remembers whether the site `url` belongs to rejected `user_agent`"""
+        if self.memory is None:
+            return
+
+        try:
+            self.memory.set(DomainLimiter.get_domain(url), user_agent, blocked)
+        except sqlite3.Error:
+            # the record only saves requests, so a busy database isn't worth failing the scrape over
+            pass
+
     @property
     def user_agents(self) -> list[str]:
         if not self._user_agents:
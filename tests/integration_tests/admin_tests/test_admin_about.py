@@ -62,6 +62,16 @@ def test_admin_about_get_app_statistics(api_client: TestClient, admin_user: Test
     assert as_dict["totalGroups"] >= 0
 
 
+def test_admin_about_get_hasher_statistics(api_client: TestClient, admin_user: TestUser):
+    response = api_client.get(api_routes.admin_about_statistics_hasher, headers=admin_user.token)
+    assert response.status_code == 200
+
+    as_dict = response.json()
+    assert as_dict["workers"] >= 1
+    assert as_dict["inFlight"] >= 0
+    assert as_dict["rejected"] >= 0
+
+
 def test_admin_about_check_app_config(api_client: TestClient, admin_user: TestUser):
     response = api_client.get(api_routes.admin_about_check, headers=admin_user.token)
 
@@ -0,0 +1,75 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from mealie.db.db_setup import session_context
+from mealie.db.models.household.events import EventOutboxModel
+from mealie.schema.admin.event_outbox import EventOutboxStatus
+from tests.utils import api_routes
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def create_dead_delivery(user: TestUser) -> str:
+    id = uuid4()
+    with session_context() as session:
+        session.add(
+            EventOutboxModel(
+                id=id,
+                group_id=user.group_id,
+                household_id=user.household_id,
+                event_id=uuid4(),
+                event_type="recipe_created",
+                destination_type="webhook",
+                destination=f"https://example.com/{random_string()}?token=secret",
+                destination_key="https://example.com",
+                payload="{}",
+                status=EventOutboxStatus.dead.value,
+                attempts=8,
+                last_error="ConnectionError: destination unavailable",
+            )
+        )
+        session.commit()
+
+    return str(id)
+
+
+def test_admin_get_event_outbox_summary(api_client: TestClient, admin_user: TestUser):
+    create_dead_delivery(admin_user)
+
+    response = api_client.get(api_routes.admin_events_outbox, headers=admin_user.token)
+    assert response.status_code == 200
+
+    summary = response.json()
+    for key in ["pending", "inProgress", "delivered", "dead", "oldestPendingSeconds", "averageLatencyMs"]:
+        assert key in summary
+    assert summary["dead"] >= 1
+
+
+def test_admin_event_outbox_requires_admin(api_client: TestClient, unique_user: TestUser):
+    response = api_client.get(api_routes.admin_events_outbox, headers=unique_user.token)
+    assert response.status_code == 403
+
+
+def test_admin_retry_dead_delivery(api_client: TestClient, admin_user: TestUser):
+    id = create_dead_delivery(admin_user)
+
+    response = api_client.get(api_routes.admin_events_outbox_entries, headers=admin_user.token)
+    assert response.status_code == 200
+    entries = {entry["id"]: entry for entry in response.json()}
+    assert id in entries
+    assert entries[id]["destinationKey"] == "https://example.com"
+    assert "destination" not in entries[id]
+
+    response = api_client.post(api_routes.admin_events_outbox_item_id_retry(id), headers=admin_user.token)
+    assert response.status_code == 200
+
+    response = api_client.get(
+        api_routes.admin_events_outbox_entries, params={"status": "pending"}, headers=admin_user.token
+    )
+    entries = {entry["id"]: entry for entry in response.json()}
+    assert entries[id]["attempts"] == 0
+
+    # only dead-lettered deliveries can be retried
+    response = api_client.post(api_routes.admin_events_outbox_item_id_retry(id), headers=admin_user.token)
+    assert response.status_code == 404
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from mealie.db.db_setup import session_context
+from mealie.services.scheduler.job_runner import ScheduledJobRepository
+from tests.utils import api_routes
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def create_job_run(error: str | None = None) -> str:
+    name = f"test_job_{random_string()}"
+    with session_context() as session:
+        repo = ScheduledJobRepository(session)
+        repo.ensure(name, "daily")
+        repo.acquire(name, "worker", timedelta(days=1))
+
+        started_at = next(job for job in repo.get_jobs() if job.name == name).last_started_at
+        repo.finish(name, "worker", started_at, 250, error)  # type: ignore
+
+    return name
+
+
+def test_admin_get_scheduled_jobs(api_client: TestClient, admin_user: TestUser):
+    name = create_job_run()
+
+    response = api_client.get(api_routes.admin_scheduler_jobs, headers=admin_user.token)
+    assert response.status_code == 200
+
+    jobs = {job["name"]: job for job in response.json()}
+    assert name in jobs
+    assert jobs[name]["schedule"] == "daily"
+    assert jobs[name]["running"] is False
+    assert jobs[name]["lastDurationMs"] == 250
+    assert jobs[name]["averageDurationMs"] == 250
+    assert jobs[name]["lastStatus"] == "success"
+
+
+def test_admin_get_scheduled_job_runs(api_client: TestClient, admin_user: TestUser):
+    name = create_job_run(error="ValueError: something went wrong")
+
+    response = api_client.get(api_routes.admin_scheduler_jobs_name_runs(name), headers=admin_user.token)
+    assert response.status_code == 200
+
+    [run] = response.json()
+    assert run["jobName"] == name
+    assert run["durationMs"] == 250
+    assert run["status"] == "failed"
+    assert run["error"] == "ValueError: something went wrong"
+
+    response = api_client.get(api_routes.admin_scheduler_jobs_name_runs(random_string()), headers=admin_user.token)
+    assert response.status_code == 404
+
+
+def test_admin_scheduler_requires_admin(api_client: TestClient, unique_user: TestUser):
+    response = api_client.get(api_routes.admin_scheduler_jobs, headers=unique_user.token)
+    assert response.status_code == 403
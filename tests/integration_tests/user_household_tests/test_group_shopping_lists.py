@@ -1,4 +1,6 @@
 import random
+from datetime import UTC, datetime
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
@@ -1350,3 +1352,125 @@ def test_bulk_modify_shopping_list_items_updates_shopping_list(
     )
     assert updated_list and updated_list.updated_at
     assert updated_list.updated_at > last_update_at
+
+
+def test_shopping_list_feed_requires_list_in_household(
+    api_client: TestClient, unique_user: TestUser, h2_user: TestUser, shopping_lists: list[ShoppingListOut]
+):
+    shopping_list = shopping_lists[0]
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_feed(shopping_list.id), headers=h2_user.token
+    )
+    assert response.status_code == 404
+
+    response = api_client.get(api_routes.households_shopping_lists_item_id_feed(uuid4()), headers=unique_user.token)
+    assert response.status_code == 404
+
+
+def test_shopping_list_changes(api_client: TestClient, unique_user: TestUser, list_with_items: ShoppingListOut):
+    shopping_list = list_with_items
+
+    # a full sync returns every item
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": 0},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert changes["reset"] is True
+    assert changes["shoppingList"]["id"] == str(shopping_list.id)
+    assert len(changes["items"]) == len(shopping_list.list_items)
+    version = changes["version"]
+    assert version > 0
+
+    # nothing has changed since then
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": version},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert changes["reset"] is False
+    assert changes["version"] == version
+    assert changes["items"] == []
+    assert changes["deletedItemIds"] == []
+
+    # update one item and delete another
+    updated_item, deleted_item = random.sample(shopping_list.list_items, 2)
+    updated_item.note = random_string()
+    response = api_client.put(
+        api_routes.households_shopping_items_item_id(updated_item.id),
+        json=utils.jsonify(updated_item.cast(ShoppingListItemUpdateBulk).model_dump()),
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+    response = api_client.delete(
+        api_routes.households_shopping_items_item_id(deleted_item.id), headers=unique_user.token
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": version},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert changes["reset"] is False
+    assert changes["version"] > version
+    assert [item["id"] for item in changes["items"]] == [str(updated_item.id)]
+    assert changes["items"][0]["note"] == updated_item.note
+    assert changes["deletedItemIds"] == [str(deleted_item.id)]
+
+    # renaming the list only returns the list's metadata
+    version = changes["version"]
+    response = api_client.get(api_routes.households_shopping_lists_item_id(shopping_list.id), headers=unique_user.token)
+    payload = assert_deserialize(response, 200)
+    payload["name"] = random_string()
+    response = api_client.put(
+        api_routes.households_shopping_lists_item_id(shopping_list.id), json=payload, headers=unique_user.token
+    )
+    new_name = assert_deserialize(response, 200)["name"]
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": version},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert changes["version"] > version
+    assert changes["shoppingList"]["name"] == new_name
+    assert changes["items"] == []
+    assert changes["deletedItemIds"] == []
+
+
+def test_shopping_list_changes_since_timestamp(
+    api_client: TestClient, unique_user: TestUser, list_with_items: ShoppingListOut
+):
+    shopping_list = list_with_items
+    since = datetime.now(UTC)
+
+    deleted_item = shopping_list.list_items[0]
+    response = api_client.delete(
+        api_routes.households_shopping_items_item_id(deleted_item.id), headers=unique_user.token
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": since.isoformat()},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert changes["reset"] is False
+    assert changes["items"] == []
+    assert changes["deletedItemIds"] == [str(deleted_item.id)]
+
+
+def test_shopping_list_changes_other_household(
+    api_client: TestClient, h2_user: TestUser, shopping_lists: list[ShoppingListOut]
+):
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_lists[0].id), headers=h2_user.token
+    )
+    assert response.status_code == 404
@@ -1,5 +1,7 @@
+import json
 from datetime import UTC, datetime
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
@@ -91,17 +93,17 @@ def test_delete_webhook(api_client: TestClient, webhook_data, unique_user: TestU
 def test_post_test_webhook(
     monkeypatch: pytest.MonkeyPatch, api_client: TestClient, unique_user: TestUser, webhook_data
 ):
-    # Mock the requests.post to avoid actual HTTP calls
+    # Mock the httpx post to avoid actual HTTP calls
     class MockResponse:
         status_code = 200
 
     mock_calls = []
 
-    def mock_post(*args, **kwargs):
+    async def mock_post(self, *args, **kwargs):
         mock_calls.append((args, kwargs))
         return MockResponse()
 
-    monkeypatch.setattr("mealie.services.event_bus_service.publisher.requests.post", mock_post)
+    monkeypatch.setattr(httpx.AsyncClient, "post", mock_post)
 
     # Create a webhook and post it
     response = api_client.post(
@@ -124,10 +126,11 @@ def test_post_test_webhook(
     test_message = "This is a test webhook message"
     post_test_webhook(webhook, test_message)
 
-    # Verify that requests.post was called with the correct parameters
+    # Verify that the webhook was posted with the correct parameters
     assert len(mock_calls) == 1
     args, kwargs = mock_calls[0]
 
-    assert kwargs["json"]["message"]["body"] == test_message
+    assert json.loads(kwargs["content"])["message"]["body"] == test_message
+    assert kwargs["headers"]["Content-Type"] == "application/json"
     assert kwargs["timeout"] == 15
     assert args[0] == webhook.url
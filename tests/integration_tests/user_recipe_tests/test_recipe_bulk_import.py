@@ -1,6 +1,13 @@
 import pytest
 from fastapi.testclient import TestClient
+from slugify import slugify
 
+from mealie.repos.repository_generic import RepositoryGeneric
+from mealie.schema.recipe.recipe import Recipe
+from mealie.schema.reports.reports import ReportEntryCreate
+from mealie.services.recipe.recipe_data_service import RecipeDataService
+from mealie.services.scraper import recipe_bulk_scraper
+from tests import data as test_data
 from tests.utils import api_routes
 from tests.utils.fixture_schemas import TestUser
 
@@ -26,3 +33,75 @@ def test_bulk_import(api_client: TestClient, unique_user: TestUser):
     for slug in slugs:
         response = api_client.get(api_routes.recipes_slug(slug), headers=unique_user.token)
         assert response.status_code == 200
+
+
+def test_bulk_import_pipeline(api_client: TestClient, unique_user: TestUser, monkeypatch: pytest.MonkeyPatch):
+    pages = {
+        "https://example.com/shrimp": test_data.html_sous_vide_shrimp.read_text(),
+        "https://example.com/ribs": test_data.html_sous_vide_smoked_beef_ribs.read_text(),
+    }
+
+    async def safe_scrape_html(url: str, *_) -> str:
+        return pages.get(url, "")
+
+    async def fetch_image(*_) -> tuple[bytes, str]:
+        return test_data.images_test_image_1.read_bytes(), "jpg"
+
+    monkeypatch.setattr(recipe_bulk_scraper, "safe_scrape_html", safe_scrape_html)
+    monkeypatch.setattr(RecipeDataService, "fetch_image", fetch_image)
+
+    urls = [*pages, "https://example.com/missing", "not a url"]
+    response = api_client.post(
+        api_routes.recipes_create_url_bulk,
+        json={"imports": [{"url": url} for url in urls]},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 202
+
+    response = api_client.get(api_routes.groups_reports_item_id(response.json()["reportId"]), headers=unique_user.token)
+    assert response.status_code == 200
+    report = response.json()
+
+    assert report["status"] == "partial"
+    assert len(report["entries"]) == len(urls)
+    assert sum(entry["success"] for entry in report["entries"]) == len(pages)
+
+    # images are fetched and minified after the recipes are saved
+    for entry in report["entries"]:
+        if entry["success"]:
+            slug = entry["message"].removeprefix("Successfully imported recipe ")
+            recipe = api_client.get(api_routes.recipes_slug(slugify(slug)), headers=unique_user.token).json()
+            assert recipe["image"] != "no image"
+            assert Recipe.directory_from_id(recipe["id"]).joinpath("images", "min-original.webp").exists()
+
+
+def test_bulk_import_survives_report_errors(
+    api_client: TestClient, unique_user: TestUser, monkeypatch: pytest.MonkeyPatch
+):
+    create = RepositoryGeneric.create
+
+    def create_failing_entries(self: RepositoryGeneric, data):
+        if isinstance(data, ReportEntryCreate) and not data.success:
+            raise ValueError("unable to save report entry")
+
+        return create(self, data)
+
+    async def safe_scrape_html(url: str, *_) -> str:
+        return test_data.html_sous_vide_shrimp.read_text() if url == "https://example.com/shrimp" else ""
+
+    monkeypatch.setattr(RepositoryGeneric, "create", create_failing_entries)
+    monkeypatch.setattr(recipe_bulk_scraper, "safe_scrape_html", safe_scrape_html)
+
+    # every worker of the first stage hits an error it can't report, and the import still finishes
+    urls = [f"https://example.com/missing-{i}" for i in range(12)] + ["https://example.com/shrimp"]
+    response = api_client.post(
+        api_routes.recipes_create_url_bulk,
+        json={"imports": [{"url": url} for url in urls]},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 202
+
+    response = api_client.get(api_routes.groups_reports_item_id(response.json()["reportId"]), headers=unique_user.token)
+    report = response.json()
+    assert report["status"] == "partial"
+    assert [entry["success"] for entry in report["entries"]] == [True]
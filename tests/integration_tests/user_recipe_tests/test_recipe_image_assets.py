@@ -1,10 +1,18 @@
 import filecmp
+import time
+from io import BytesIO
 
+import pytest
 from fastapi.testclient import TestClient
+from PIL import Image
 from slugify import slugify
 
+from mealie.core.config import get_app_dirs, get_app_settings
 from mealie.schema.recipe.recipe import Recipe
+from mealie.services.recipe import image_processor
+from mealie.services.recipe.image_processor import ImageProcessor
 from tests import data
+from tests.utils import api_routes
 from tests.utils.factories import random_string
 from tests.utils.fixture_schemas import TestUser
 
@@ -106,3 +114,141 @@ def test_recipe_image_upload(api_client: TestClient, unique_user: TestUser, reci
     response = api_client.get(f"/api/recipes/{recipe_ingredient_only.slug}", headers=unique_user.token)
     recipe_respons = response.json()
     assert recipe_respons["image"] == image_version
+
+
+def test_recipe_image_upload_returns_key_set_once_processed(
+    api_client: TestClient, unique_user: TestUser, recipe_ingredient_only: Recipe, monkeypatch: pytest.MonkeyPatch
+):
+    processor = ImageProcessor(workers=1, queue_size=1)
+    monkeypatch.setattr(image_processor, "get_image_processor", lambda: processor)
+    try:
+        response = api_client.put(
+            f"/api/recipes/{recipe_ingredient_only.slug}/image",
+            data={"extension": "jpg"},
+            files={"image": data.images_test_image_1.read_bytes()},
+            headers=unique_user.token,
+        )
+        assert response.status_code == 200
+        key = response.json()["image"]
+        assert key and key != recipe_ingredient_only.image
+
+        # the image is processed in the background, and the recipe is given the returned key once it's ready
+        for _ in range(60):
+            response = api_client.get(f"/api/recipes/{recipe_ingredient_only.slug}", headers=unique_user.token)
+            if response.json()["image"] == key:
+                break
+            time.sleep(1)
+
+        assert response.json()["image"] == key
+    finally:
+        processor.shutdown()
+
+
+def test_recipe_image_variant(api_client: TestClient, unique_user: TestUser, recipe_ingredient_only: Recipe):
+    response = api_client.put(
+        f"/api/recipes/{recipe_ingredient_only.slug}/image",
+        data={"extension": "jpg"},
+        files={"image": data.images_test_image_1.read_bytes()},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+
+    route = api_routes.media_recipes_recipe_id_images_file_name(recipe_ingredient_only.id, "original.webp")
+    response = api_client.get(route, params={"w": 300, "fmt": "webp"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert Image.open(BytesIO(response.content)).width == 320
+
+    response = api_client.get(route, params={"w": 0})
+    assert response.status_code == 422
+
+    response = api_client.get(route, params={"fmt": "gif"})
+    assert response.status_code == 422
+
+
+def test_recipe_image_cache_headers(api_client: TestClient, unique_user: TestUser, recipe_ingredient_only: Recipe):
+    response = api_client.put(
+        f"/api/recipes/{recipe_ingredient_only.slug}/image",
+        data={"extension": "jpg"},
+        files={"image": data.images_test_image_1.read_bytes()},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+    version = response.json()["image"]
+
+    route = api_routes.media_recipes_recipe_id_images_file_name(recipe_ingredient_only.id, "min-original.webp")
+
+    # versioned URLs change along with the image, so they're cached for good
+    response = api_client.get(route, params={"version": version})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    etag = response.headers["etag"]
+    assert etag.startswith('"')
+
+    response = api_client.get(route)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["etag"] == etag
+
+    response = api_client.get(route, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert not response.content
+
+
+def test_recipe_asset_cache_headers(api_client: TestClient, unique_user: TestUser, recipe_ingredient_only: Recipe):
+    response = api_client.post(
+        f"/api/recipes/{recipe_ingredient_only.slug}/assets",
+        data={"name": "asset", "icon": random_string(10), "extension": "jpg"},
+        files={"file": data.images_test_image_1.read_bytes()},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+
+    route = f"/api/media/recipes/{recipe_ingredient_only.id}/assets/asset.jpg"
+    response = api_client.get(route)
+    assert response.status_code == 200
+    assert response.content == data.images_test_image_1.read_bytes()
+    assert response.headers["content-disposition"].startswith("attachment")
+    assert response.headers["cache-control"] == "no-cache"
+
+    response = api_client.get(route, headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+    response = api_client.get(f"/api/media/recipes/{recipe_ingredient_only.id}/assets/missing.jpg")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("mode", ["x-accel-redirect", "x-sendfile"])
+def test_recipe_image_sendfile(
+    api_client: TestClient,
+    unique_user: TestUser,
+    recipe_ingredient_only: Recipe,
+    monkeypatch: pytest.MonkeyPatch,
+    mode: str,
+):
+    response = api_client.put(
+        f"/api/recipes/{recipe_ingredient_only.slug}/image",
+        data={"extension": "jpg"},
+        files={"image": data.images_test_image_1.read_bytes()},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+
+    monkeypatch.setattr(get_app_settings(), "MEDIA_SENDFILE", mode)
+    response = api_client.get(
+        api_routes.media_recipes_recipe_id_images_file_name(recipe_ingredient_only.id, "original.webp")
+    )
+
+    # the web server sends the file, so the response only has its headers
+    assert response.status_code == 200
+    assert not response.content
+    assert response.headers["content-type"] == "image/webp"
+    assert "etag" in response.headers
+
+    image = recipe_ingredient_only.image_dir / "original.webp"
+    if mode == "x-accel-redirect":
+        relative = image.resolve().relative_to(get_app_dirs().DATA_DIR.resolve())
+        assert response.headers["x-accel-redirect"] == f"/_mealie_data/{relative.as_posix()}"
+    else:
+        assert response.headers["x-sendfile"] == str(image.resolve())
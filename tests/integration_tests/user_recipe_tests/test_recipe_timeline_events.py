@@ -323,6 +323,40 @@ def test_timeline_event_update_image(
     assert updated_event.timestamp == new_event.timestamp
     assert updated_event.image == TimelineEventImage.has_image.value
 
+    # the image is ready as soon as the event says it has one
+    image_response = api_client.get(
+        api_routes.media_recipes_recipe_id_images_timeline_timeline_event_id_file_name(
+            recipe.id, new_event.id, "original.webp"
+        )
+    )
+    assert image_response.status_code == 200
+
+
+def test_timeline_event_update_image_rejects_invalid_image(
+    api_client: TestClient, unique_user: TestUser, recipes: list[Recipe]
+):
+    new_event_data = {
+        "recipe_id": str(recipes[0].id),
+        "user_id": str(unique_user.user_id),
+        "subject": random_string(),
+        "message": random_string(),
+        "event_type": "info",
+    }
+    event_response = api_client.post(api_routes.recipes_timeline_events, json=new_event_data, headers=unique_user.token)
+    new_event = RecipeTimelineEventOut.model_validate(event_response.json())
+
+    r = api_client.put(
+        api_routes.recipes_timeline_events_item_id_image(new_event.id),
+        files={"image": ("test_image_jpg.jpg", random_string().encode(), "image/jpeg")},
+        data={"extension": "jpg"},
+        headers=unique_user.token,
+    )
+    assert r.status_code == 400
+
+    event_response = api_client.get(api_routes.recipes_timeline_events_item_id(new_event.id), headers=unique_user.token)
+    updated_event = RecipeTimelineEventOut.model_validate(event_response.json())
+    assert updated_event.image == TimelineEventImage.does_not_have_image.value
+
 
 @pytest.mark.parametrize("use_other_household_user", [True, False])
 def test_create_recipe_with_timeline_event(
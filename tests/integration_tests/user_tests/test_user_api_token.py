@@ -50,3 +50,20 @@ def test_delete_token(api_client: TestClient, admin_token):
 
     response = api_client.delete(api_routes.users_api_tokens_token_id(2), headers=admin_token)
     assert response.status_code == 200
+
+
+def test_deleted_token_is_revoked(api_client: TestClient, admin_token):
+    response = api_client.post(api_routes.users_api_tokens, json={"name": "Revoked Token"}, headers=admin_token)
+    assert response.status_code == 201
+    token_id = response.json()["id"]
+    long_live_token = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    # prime the validation cache
+    response = api_client.get(api_routes.users_self, headers=long_live_token)
+    assert response.status_code == 200
+
+    response = api_client.delete(api_routes.users_api_tokens_token_id(token_id), headers=admin_token)
+    assert response.status_code == 200
+
+    response = api_client.get(api_routes.users_self, headers=long_live_token)
+    assert response.status_code == 401
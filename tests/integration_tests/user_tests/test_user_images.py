@@ -2,6 +2,7 @@ from fastapi.testclient import TestClient
 
 from tests import data as test_data
 from tests.utils import api_routes
+from tests.utils.factories import random_string
 from tests.utils.fixture_schemas import TestUser
 
 
@@ -26,3 +27,19 @@ def test_user_update_image(api_client: TestClient, unique_user: TestUser):
     # Request the image again
     response = api_client.get(api_routes.media_users_user_id_file_name(str(unique_user.user_id), "profile.webp"))
     assert response.status_code == 200
+
+
+def test_user_update_image_rejects_invalid_image(api_client: TestClient, unique_user: TestUser):
+    before = api_client.get(api_routes.media_users_user_id_file_name(str(unique_user.user_id), "profile.webp"))
+
+    response = api_client.post(
+        api_routes.users_id_image(str(unique_user.user_id)),
+        files={"profile": random_string().encode()},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 400
+
+    # the user's image is left as it was
+    after = api_client.get(api_routes.media_users_user_id_file_name(str(unique_user.user_id), "profile.webp"))
+    assert after.status_code == 200
+    assert after.content == before.content
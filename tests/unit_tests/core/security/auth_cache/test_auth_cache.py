@@ -87,7 +87,7 @@ async def test_expiration_with_default_timeout(cache: AuthCache):
     await cache.set(key, value)
     assert await cache.has(key) is True
 
-    with patch("mealie.routes.auth.auth_cache.time") as mock_time:
+    with patch("mealie.pkgs.cache.backends.time") as mock_time:
         current_time = time.time()
         expired_time = current_time + cache.default_timeout + 1
         mock_time.time.return_value = expired_time
@@ -133,7 +133,7 @@ async def test_pruning_when_threshold_exceeded(cache: AuthCache):
     for i in range(10):
         await cache.set(f"key_{i}", f"value_{i}")
 
-    assert len(cache._cache) < 10  # Should be less than what we inserted
+    assert len(cache.backend) < 10  # Should be less than what we inserted
 
 
 @pytest.mark.asyncio
@@ -164,13 +164,13 @@ def test_normalize_timeout_none():
     cache = AuthCache(default_timeout=300)
 
     with patch("time.time", return_value=1000):
-        result = cache._normalize_timeout(None)
+        result = cache.backend._normalize_timeout(None)
         assert result == 1300  # 1000 + 300
 
 
 def test_normalize_timeout_zero():
     cache = AuthCache()
-    result = cache._normalize_timeout(0)
+    result = cache.backend._normalize_timeout(0)
     assert result == 0
 
 
@@ -178,7 +178,7 @@ def test_normalize_timeout_positive():
     cache = AuthCache()
 
     with patch("time.time", return_value=1000):
-        result = cache._normalize_timeout(60)
+        result = cache.backend._normalize_timeout(60)
         assert result == 1060  # 1000 + 60
 
 
@@ -104,7 +104,7 @@ async def test_auth_cache_memory_efficiency():
     for i in range(50):
         await cache.set(f"token_{i}", f"data_{i}", timeout=0)  # Never expire
 
-    assert len(cache._cache) <= 15  # Should be close to threshold, accounting for pruning logic
+    assert len(cache.backend) <= 15  # Should be close to threshold, accounting for pruning logic
 
     remaining_items = 0
     for i in range(50):
@@ -0,0 +1,120 @@
+import time
+from uuid import uuid4
+
+import pytest
+
+from mealie.core.security.token_cache import LongLiveTokenCache
+from mealie.pkgs.cache import MemoryCacheBackend
+from mealie.schema.user.user import PrivateUser
+from tests.utils.factories import random_email, random_string
+
+
+def private_user_factory() -> PrivateUser:
+    return PrivateUser(
+        id=uuid4(),
+        username=random_string(),
+        full_name=random_string(),
+        email=random_email(),
+        group=random_string(),
+        group_id=uuid4(),
+        group_slug=random_string(),
+        household=random_string(),
+        household_id=uuid4(),
+        household_slug=random_string(),
+        cache_key="1234",
+        password="fake-password",
+    )
+
+
+@pytest.fixture
+def cache():
+    return LongLiveTokenCache(MemoryCacheBackend(max_entries=100, default_timeout=60))
+
+
+def test_token_cache_get_and_set(cache: LongLiveTokenCache):
+    user = private_user_factory()
+    token = random_string(64)
+
+    assert cache.get(token) is None
+    cache.set(token, user)
+
+    cached_user = cache.get(token)
+    assert cached_user == user
+    assert cached_user is not user
+
+
+def test_token_cache_returns_copies(cache: LongLiveTokenCache):
+    user = private_user_factory()
+    token = random_string(64)
+    cache.set(token, user)
+
+    cached_user = cache.get(token)
+    assert cached_user
+    cached_user.password = "changed"
+
+    assert cache.get(token).password == "fake-password"  # type: ignore
+
+
+def test_token_cache_does_not_store_raw_token(cache: LongLiveTokenCache):
+    token = random_string(64)
+    cache.set(token, private_user_factory())
+
+    assert all(token not in key for key in cache.backend._cache)  # type: ignore
+
+
+def test_token_cache_expires():
+    cache = LongLiveTokenCache(MemoryCacheBackend(default_timeout=0.05))
+    token = random_string(64)
+    cache.set(token, private_user_factory())
+
+    time.sleep(0.1)
+    assert cache.get(token) is None
+
+
+def test_token_cache_is_bounded():
+    cache = LongLiveTokenCache(MemoryCacheBackend(max_entries=4, default_timeout=60))
+    user = private_user_factory()
+    tokens = [random_string(64) for _ in range(5)]
+    for token in tokens:
+        cache.set(token, user)
+
+    assert len(cache.backend) <= 4
+    assert cache.get(tokens[0]) is None
+    assert cache.get(tokens[-1]) == user
+
+
+def test_token_cache_invalidate_token(cache: LongLiveTokenCache):
+    token = random_string(64)
+    cache.set(token, private_user_factory())
+
+    cache.invalidate_token(token)
+    assert cache.get(token) is None
+
+
+def test_token_cache_invalidate_user(cache: LongLiveTokenCache):
+    user = private_user_factory()
+    other_user = private_user_factory()
+    user_tokens = [random_string(64), random_string(64)]
+    other_token = random_string(64)
+
+    for token in user_tokens:
+        cache.set(token, user)
+    cache.set(other_token, other_user)
+
+    cache.invalidate_user(user.id)
+    for token in user_tokens:
+        assert cache.get(token) is None
+    assert cache.get(other_token) == other_user
+
+    # the user's tokens can be cached again after invalidation
+    cache.set(user_tokens[0], user)
+    assert cache.get(user_tokens[0]) == user
+    assert cache.get(user_tokens[1]) is None
+
+
+def test_token_cache_disabled():
+    cache = LongLiveTokenCache(MemoryCacheBackend(default_timeout=0))
+    token = random_string(64)
+    cache.set(token, private_user_factory())
+
+    assert cache.get(token) is None
@@ -1,12 +1,24 @@
+import threading
+
+import pytest
 from pytest import MonkeyPatch
 
 from mealie.core.config import get_app_settings
-from mealie.core.security.hasher import BcryptHasher, FakeHasher, get_hasher
+from mealie.core.exceptions import PasswordHasherBusy
+from mealie.core.security.hasher import (
+    MAX_BLOCKED_REQUESTS,
+    BcryptHasher,
+    FakeHasher,
+    HasherPool,
+    get_hasher,
+    get_hasher_pool,
+)
 from tests.utils.factories import random_string
 
 
 def clear_hasher_cache():
     get_hasher.cache_clear()
+    get_hasher_pool.cache_clear()
     get_app_settings.cache_clear()
 
 
@@ -42,3 +54,55 @@ def test_hasher_long_password(monkeypatch: MonkeyPatch):
         assert hasher.verify(password, hashed_password)
     finally:
         clear_hasher_cache()
+
+
+def test_hasher_pool_runs_work():
+    pool = HasherPool(workers=2, max_queue=2)
+
+    assert pool.run(str.upper, "abc") == "ABC"
+
+    stats = pool.statistics()
+    assert stats.completed == 1
+    assert stats.rejected == 0
+    assert stats.in_flight == 0
+
+
+def test_hasher_pool_rejects_when_saturated():
+    pool = HasherPool(workers=1, max_queue=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=pool.run, args=(block,))
+    worker.start()
+    try:
+        assert started.wait(5)
+        with pytest.raises(PasswordHasherBusy):
+            pool.run(str.upper, "abc")
+    finally:
+        release.set()
+        worker.join()
+
+    stats = pool.statistics()
+    assert stats.completed == 1
+    assert stats.rejected == 1
+
+    # capacity is released once the blocking call finishes
+    assert pool.run(str.upper, "abc") == "ABC"
+
+
+def test_hasher_pool_leaves_request_threads_free(monkeypatch: MonkeyPatch):
+    try:
+        monkeypatch.setenv("SECURITY_HASHER_WORKERS", "4")
+        monkeypatch.setenv("SECURITY_HASHER_MAX_QUEUE", "32")
+        clear_hasher_cache()
+
+        # every call waiting on the pool holds a request thread, so the queue is capped well below AnyIO's 40
+        pool = get_hasher_pool()
+        assert pool.workers + pool.max_queue == MAX_BLOCKED_REQUESTS
+    finally:
+        monkeypatch.undo()
+        clear_hasher_cache()
@@ -0,0 +1,154 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mealie.pkgs.cache import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend_factory(request, tmp_path: Path):
+    def factory(max_entries: int = 500, default_timeout: float = 300, namespace: str = "test") -> CacheBackend:
+        if request.param == "memory":
+            return MemoryCacheBackend(max_entries=max_entries, default_timeout=default_timeout)
+
+        return SQLiteCacheBackend(
+            tmp_path / "cache.db", namespace=namespace, max_entries=max_entries, default_timeout=default_timeout
+        )
+
+    return factory
+
+
+def test_cache_backend_get_set_delete(backend_factory):
+    cache: CacheBackend = backend_factory()
+    value = {"state": "12345", "nested": {"groups": ["a", "b"]}}
+
+    assert cache.get("key") is None
+    assert cache.has("key") is False
+
+    cache.set("key", value)
+    assert cache.get("key") == value
+    assert cache.has("key") is True
+    assert len(cache) == 1
+
+    assert cache.delete("key") is True
+    assert cache.delete("key") is False
+    assert cache.get("key") is None
+
+
+def test_cache_backend_overwrite(backend_factory):
+    cache: CacheBackend = backend_factory()
+
+    cache.set("key", "first")
+    cache.set("key", "second")
+
+    assert cache.get("key") == "second"
+    assert len(cache) == 1
+
+
+def test_cache_backend_expiration(backend_factory):
+    cache: CacheBackend = backend_factory(default_timeout=0.05)
+
+    cache.set("default", "value")
+    cache.set("forever", "value", timeout=0)
+    cache.set("custom", "value", timeout=300)
+    time.sleep(0.1)
+
+    assert cache.get("default") is None
+    assert cache.get("forever") == "value"
+    assert cache.get("custom") == "value"
+
+
+def test_cache_backend_clear(backend_factory):
+    cache: CacheBackend = backend_factory()
+    for i in range(5):
+        cache.set(f"key_{i}", i)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("key_0") is None
+
+
+def test_cache_backend_evicts_least_recently_used(backend_factory):
+    cache: CacheBackend = backend_factory(max_entries=3)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    # make sure the access is far enough apart to be recorded by every backend
+    time.sleep(SQLiteCacheBackend._TOUCH_INTERVAL + 0.1)
+    assert cache.get("a") == 1
+
+    cache.set("d", 4)
+    if isinstance(cache, SQLiteCacheBackend):
+        cache.trim()
+
+    assert len(cache) == 3
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.get("d") == 4
+
+
+def test_memory_cache_backend_stays_bounded():
+    cache = MemoryCacheBackend(max_entries=10)
+    for i in range(1000):
+        cache.set(f"key_{i}", i)
+
+    assert len(cache) == 10
+    assert cache.get("key_999") == 999
+    assert cache.get("key_0") is None
+
+
+def test_sqlite_cache_backend_stays_bounded(tmp_path: Path):
+    cache = SQLiteCacheBackend(tmp_path / "cache.db", max_entries=10)
+    for i in range(100):
+        cache.set(f"key_{i}", i)
+
+    # trimming is batched, so allow for the documented overshoot
+    assert len(cache) <= 11
+    assert cache.get("key_99") == 99
+    assert cache.get("key_0") is None
+
+
+def test_sqlite_cache_backend_is_shared(tmp_path: Path):
+    path = tmp_path / "cache.db"
+    worker_1 = SQLiteCacheBackend(path, namespace="oidc")
+    worker_2 = SQLiteCacheBackend(path, namespace="oidc")
+
+    worker_1.set("state", {"code_verifier": "abc"})
+    assert worker_2.get("state") == {"code_verifier": "abc"}
+
+    assert worker_2.delete("state") is True
+    assert worker_1.get("state") is None
+
+
+def test_sqlite_cache_backend_namespaces_are_isolated(tmp_path: Path):
+    path = tmp_path / "cache.db"
+    oidc = SQLiteCacheBackend(path, namespace="oidc")
+    tokens = SQLiteCacheBackend(path, namespace="tokens")
+
+    oidc.set("key", "oidc")
+    tokens.set("key", "tokens")
+
+    assert oidc.get("key") == "oidc"
+    assert tokens.get("key") == "tokens"
+
+    oidc.clear()
+    assert oidc.get("key") is None
+    assert tokens.get("key") == "tokens"
+
+
+def test_sqlite_cache_backend_recreates_removed_file(tmp_path: Path):
+    path = tmp_path / "cache.db"
+    cache = SQLiteCacheBackend(path)
+    path.unlink()
+
+    # a thread opening its own connection finds an empty file, like after a backup restore
+    results = []
+    thread = threading.Thread(target=lambda: (cache.set("key", "value"), results.append(cache.get("key"))))
+    thread.start()
+    thread.join()
+
+    assert results == ["value"]
@@ -0,0 +1,66 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from mealie.pkgs.img import MinifierOptions, PillowMinifier
+from tests import data as test_data
+
+
+@pytest.fixture()
+def large_jpg(tmp_path: Path) -> Path:
+    path = tmp_path / "image.jpg"
+
+    # rotated a quarter turn by its EXIF orientation, so it's shown 1600x2400
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.new("RGB", (2400, 1600), (200, 120, 40)).save(path, "JPEG", exif=exif)
+    return path
+
+
+def sizes(directory: Path) -> dict[str, tuple[int, int]]:
+    return {path.name: Image.open(path).size for path in directory.glob("*.webp")}
+
+
+def test_minify_writes_resized_variants(large_jpg: Path):
+    PillowMinifier().minify(large_jpg)
+
+    assert sizes(large_jpg.parent) == {
+        "original.webp": (1600, 2400),
+        "min-original.webp": (533, 800),
+        "tiny-original.webp": (300, 300),
+    }
+
+
+def test_minify_decodes_draft_without_original(large_jpg: Path):
+    PillowMinifier(opts=MinifierOptions(original=False)).minify(large_jpg)
+
+    assert sizes(large_jpg.parent) == {
+        "min-original.webp": (533, 800),
+        "tiny-original.webp": (300, 300),
+    }
+
+
+def test_minify_doesnt_enlarge_small_images(tmp_path: Path):
+    image = tmp_path / "image.png"
+    shutil.copy(test_data.images_test_image_2, image)
+
+    PillowMinifier(purge=True).minify(image)
+
+    assert sizes(tmp_path) == {
+        "original.webp": (80, 54),
+        "min-original.webp": (80, 54),
+        "tiny-original.webp": (80, 54),
+    }
+    assert not image.exists()
+
+
+def test_minify_skips_existing_variants(large_jpg: Path):
+    tiny = large_jpg.parent / "tiny-original.webp"
+    Image.new("RGB", (10, 10)).save(tiny, "WEBP")
+
+    PillowMinifier().minify(large_jpg, force=False)
+
+    assert sizes(large_jpg.parent)["tiny-original.webp"] == (10, 10)
+    assert sizes(large_jpg.parent)["min-original.webp"] == (533, 800)
@@ -1,12 +1,14 @@
 import filecmp
+import shutil
 import statistics
 from pathlib import Path
 from typing import Any
+from zipfile import ZipFile
 
 from sqlalchemy.orm import Session
 
 import tests.data as test_data
-from mealie.core.config import get_app_settings
+from mealie.core.config import get_app_dirs, get_app_settings
 from mealie.db.db_setup import session_context
 from mealie.db.models._model_utils.guid import GUID
 from mealie.db.models.group import Group
@@ -24,6 +26,7 @@ from mealie.db.models.users.users import User
 from mealie.services.backups_v2.alchemy_exporter import AlchemyExporter
 from mealie.services.backups_v2.backup_file import BackupFile
 from mealie.services.backups_v2.backup_v2 import BackupV2
+from tests.utils.factories import random_string
 
 
 def dict_sorter(d: dict) -> Any:
@@ -55,6 +58,27 @@ def test_database_backup():
         assert contents.validate()
 
 
+def test_database_backup_skips_cache():
+    # the caches in use by other tests are left alone, so the files are written to a directory of their own
+    cache_dir = get_app_dirs().CACHE_DIR / random_string()
+    cached_files = [
+        cache_dir / "index.db",
+        cache_dir / "index.db-wal",
+        cache_dir / "recipe-id" / "original-320-1.webp",
+    ]
+    for cached_file in cached_files:
+        cached_file.parent.mkdir(parents=True, exist_ok=True)
+        cached_file.write_bytes(b"cached")
+
+    try:
+        path_to_backup = BackupV2().backup()
+
+        with ZipFile(path_to_backup) as zip_file:
+            assert not [name for name in zip_file.namelist() if ".cache" in Path(name).parts]
+    finally:
+        shutil.rmtree(cache_dir)
+
+
 def test_database_restore():
     settings = get_app_settings()
 
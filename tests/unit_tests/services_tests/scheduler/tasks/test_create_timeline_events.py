@@ -1,9 +1,13 @@
 from datetime import UTC, datetime, timedelta
+from uuid import UUID
 
 from dateutil.parser import parse as parse_dt
 from fastapi.testclient import TestClient
 from pydantic import UUID4
+from sqlalchemy import update
 
+from mealie.db.db_setup import session_context
+from mealie.db.models.household.mealplan import GroupMealPlan
 from mealie.schema.household.household import HouseholdRecipeSummary
 from mealie.schema.meal_plan.new_meal import CreatePlanEntry
 from mealie.schema.recipe.recipe import RecipeLastMade, RecipeSummary
@@ -251,3 +255,75 @@ def test_preserve_future_made_date(api_client: TestClient, unique_user: TestUser
     response = api_client.get(api_routes.households_self_recipes_recipe_slug(recipe.slug), headers=h2_user.token)
     household_recipe = HouseholdRecipeSummary.model_validate(response.json())
     assert household_recipe.last_made is None
+
+
+def test_new_mealplan_events_across_households(api_client: TestClient, unique_user: TestUser, h2_user: TestUser):
+    recipe_name = random_string(length=25)
+    response = api_client.post(api_routes.recipes, json={"name": recipe_name}, headers=unique_user.token)
+    assert response.status_code == 201
+
+    response = api_client.get(api_routes.recipes_slug(recipe_name), headers=unique_user.token)
+    recipe = RecipeSummary.model_validate(response.json())
+
+    # both households plan the same recipe today
+    for user in [unique_user, h2_user]:
+        new_plan = CreatePlanEntry(
+            date=datetime.now(UTC).date(), entry_type="lunch", recipe_id=str(recipe.id)
+        ).model_dump(by_alias=True)
+        new_plan["date"] = datetime.now(UTC).date().isoformat()
+        new_plan["recipeId"] = str(recipe.id)
+
+        response = api_client.post(api_routes.households_mealplans, json=new_plan, headers=user.token)
+        assert response.status_code == 201
+
+    for _ in range(2):
+        create_mealplan_timeline_events()
+
+    params = {"page": "1", "perPage": "-1", "queryFilter": f"recipe_id={recipe.id}"}
+    response = api_client.get(api_routes.recipes_timeline_events, headers=unique_user.token, params=params)
+    subjects = sorted(event["subject"] for event in response.json()["items"] if "made this" in event["subject"])
+    assert subjects == sorted(f"{user.full_name} made this for lunch" for user in [unique_user, h2_user])
+
+    # each household's last made date is updated
+    for user in [unique_user, h2_user]:
+        response = api_client.get(api_routes.households_self_recipes_recipe_slug(recipe.slug), headers=user.token)
+        assert response.status_code == 200
+        household_recipe = HouseholdRecipeSummary.model_validate(response.json())
+        assert household_recipe.last_made and household_recipe.last_made.date() == datetime.now(UTC).date()
+
+
+def test_new_mealplan_event_uses_mealplan_group(api_client: TestClient, unique_user: TestUser, g2_user: TestUser):
+    recipe_name = random_string(length=25)
+    response = api_client.post(api_routes.recipes, json={"name": recipe_name}, headers=unique_user.token)
+    assert response.status_code == 201
+
+    response = api_client.get(api_routes.recipes_slug(recipe_name), headers=unique_user.token)
+    recipe = RecipeSummary.model_validate(response.json())
+
+    new_plan = CreatePlanEntry(date=datetime.now(UTC).date(), entry_type="dinner", recipe_id=str(recipe.id)).model_dump(
+        by_alias=True
+    )
+    new_plan["date"] = datetime.now(UTC).date().isoformat()
+    new_plan["recipeId"] = str(recipe.id)
+
+    response = api_client.post(api_routes.households_mealplans, json=new_plan, headers=unique_user.token)
+    assert response.status_code == 201
+
+    # the meal plan belongs to another group than its user's, so it isn't anyone's meal in that group
+    with session_context() as session:
+        session.execute(
+            update(GroupMealPlan)
+            .where(GroupMealPlan.id == response.json()["id"])
+            .values(group_id=UUID(g2_user.group_id))
+        )
+        session.commit()
+
+    create_mealplan_timeline_events()
+
+    params = {"page": "1", "perPage": "-1", "queryFilter": f"recipe_id={recipe.id}"}
+    response = api_client.get(api_routes.recipes_timeline_events, headers=unique_user.token, params=params)
+    assert not [event for event in response.json()["items"] if "made this" in event["subject"]]
+
+    response = api_client.get(api_routes.households_self_recipes_recipe_slug(recipe.slug), headers=unique_user.token)
+    household_recipe = HouseholdRecipeSummary.model_validate(response.json())
+    assert household_recipe.last_made is None
@@ -1,8 +1,10 @@
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
+import pytest
 from pydantic import UUID4
 
+from mealie.db.db_setup import session_context
 from mealie.schema.household.webhook import SaveWebhook, WebhookType
 from mealie.services.event_bus_service.event_bus_listeners import WebhookEventListener
 from mealie.services.event_bus_service.event_types import (
@@ -12,6 +14,8 @@ from mealie.services.event_bus_service.event_types import (
     EventTypes,
     EventWebhookData,
 )
+from mealie.services.scheduler.job_runner import JobRunner
+from mealie.services.scheduler.tasks.post_webhooks import post_group_webhooks
 from tests.utils import random_string
 from tests.utils.factories import random_bool
 from tests.utils.fixture_schemas import TestUser
@@ -295,3 +299,66 @@ def test_get_meals_by_date_range_invalid_date_range(unique_user: TestUser):
     meals_in_range = meal_repo.get_meals_by_date_range(start_date, end_date)
 
     assert len(meals_in_range) == 0
+
+
+def test_get_households_with_scheduled_webhooks(unique_user: TestUser, h2_user: TestUser):
+    start = datetime.now(UTC)
+
+    for user in [unique_user, h2_user]:
+        user.repos.webhooks.create(
+            webhook_factory(
+                group_id=user.group_id,
+                household_id=user.household_id,
+                scheduled_time=start - timedelta(minutes=20),
+            )
+        )
+
+    unique_user.repos.webhooks.create(
+        webhook_factory(group_id=unique_user.group_id, household_id=unique_user.household_id, enabled=False)
+    )
+
+    with session_context() as session:
+        results = WebhookEventListener.get_households_with_scheduled_webhooks(
+            session, start, datetime.now(UTC) + timedelta(minutes=5)
+        )
+    assert (UUID(unique_user.group_id), UUID(unique_user.household_id)) not in results
+
+    unique_user.repos.webhooks.create(
+        webhook_factory(group_id=unique_user.group_id, household_id=unique_user.household_id)
+    )
+    unique_user.repos.webhooks.create(
+        webhook_factory(group_id=unique_user.group_id, household_id=unique_user.household_id)
+    )
+
+    with session_context() as session:
+        results = WebhookEventListener.get_households_with_scheduled_webhooks(
+            session, start, datetime.now(UTC) + timedelta(minutes=5)
+        )
+        filtered_results = WebhookEventListener.get_households_with_scheduled_webhooks(
+            session, start, datetime.now(UTC) + timedelta(minutes=5), household_id=UUID(h2_user.household_id)
+        )
+
+    # households are only returned once, no matter how many webhooks are due
+    assert results.count((UUID(unique_user.group_id), UUID(unique_user.household_id))) == 1
+    assert (UUID(h2_user.group_id), UUID(h2_user.household_id)) not in results
+    assert filtered_results == []
+
+
+@pytest.mark.asyncio
+async def test_post_group_webhooks_windows_follow_each_other_across_workers(monkeypatch: pytest.MonkeyPatch):
+    windows: list[tuple[datetime, datetime]] = []
+
+    def record_window(session, start_dt: datetime, end_dt: datetime, **kwargs):
+        windows.append((start_dt, end_dt))
+        return []
+
+    monkeypatch.setattr(WebhookEventListener, "get_households_with_scheduled_webhooks", record_window)
+
+    # whichever worker wins the lease, each run picks up where the previous one ended
+    for worker in [JobRunner(max_concurrent=1), JobRunner(max_concurrent=1), JobRunner(max_concurrent=1)]:
+        assert await worker.run_job("minutely", post_group_webhooks, timedelta(0))
+
+    assert len(windows) == 3
+    assert windows[1][0] == windows[0][1]
+    assert windows[2][0] == windows[1][1]
+    assert all(start < end for start, end in windows)
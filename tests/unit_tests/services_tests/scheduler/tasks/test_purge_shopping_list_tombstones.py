@@ -0,0 +1,53 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+
+from mealie.db.db_setup import session_context
+from mealie.db.models.household.shopping_list import ShoppingListItemTombstone
+from mealie.schema.household.group_shopping_list import ShoppingListItemCreate, ShoppingListSave
+from mealie.services.scheduler.tasks.purge_shopping_list_tombstones import (
+    MAX_DAYS_OLD,
+    purge_shopping_list_tombstones,
+)
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def test_purge_shopping_list_tombstones(unique_user: TestUser):
+    database = unique_user.repos
+    shopping_list = database.group_shopping_lists.create(
+        ShoppingListSave(name=random_string(), group_id=unique_user.group_id, user_id=unique_user.user_id)
+    )
+    old_item, new_item, kept_item = database.group_shopping_list_item.create_many(
+        [ShoppingListItemCreate(note=random_string(), shopping_list_id=shopping_list.id) for _ in range(3)]
+    )
+
+    database.group_shopping_list_item.delete(old_item.id)
+    old_item_version = database.group_shopping_lists.get_changes(shopping_list.id, 0).version  # type: ignore
+    database.group_shopping_list_item.delete(new_item.id)
+
+    with session_context() as session:
+        session.execute(
+            update(ShoppingListItemTombstone)
+            .where(ShoppingListItemTombstone.shopping_list_item_id == old_item.id)
+            .values(created_at=datetime.now(UTC) - timedelta(days=MAX_DAYS_OLD + 1))
+        )
+        session.commit()
+
+    purge_shopping_list_tombstones()
+
+    with session_context() as session:
+        stmt = select(ShoppingListItemTombstone.shopping_list_item_id).where(
+            ShoppingListItemTombstone.shopping_list_id == shopping_list.id
+        )
+        assert list(session.execute(stmt).scalars()) == [new_item.id]
+
+    # clients that synced after the purged deletion still get incremental changes
+    changes = database.group_shopping_lists.get_changes(shopping_list.id, old_item_version)
+    assert changes and not changes.reset
+    assert changes.deleted_item_ids == [new_item.id]
+
+    # clients that synced before it need the whole list
+    changes = database.group_shopping_lists.get_changes(shopping_list.id, old_item_version - 1)
+    assert changes and changes.reset
+    assert [item.id for item in changes.items] == [kept_item.id]
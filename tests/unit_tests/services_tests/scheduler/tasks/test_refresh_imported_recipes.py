@@ -0,0 +1,251 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from mealie.lang.providers import local_provider
+from mealie.schema.recipe.recipe import Recipe
+from mealie.schema.recipe.recipe_settings import RecipeSettings
+from mealie.services.scheduler.tasks.refresh_imported_recipes import (
+    RecipeRefresher,
+    RecipeToRefresh,
+    content_hash,
+    get_recipes_to_refresh,
+    recipe_content,
+)
+from mealie.services.scraper.recipe_scraper import RecipeScraper
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def recipe_page(name: str, description: str) -> str:
+    recipe = {
+        "@context": "https://schema.org",
+        "@type": "Recipe",
+        "name": name,
+        "description": description,
+        "recipeYield": "4 servings",
+        "recipeIngredient": ["2 cups flour", "1 cup water", "1 tsp salt"],
+        "recipeInstructions": [
+            {"@type": "HowToStep", "text": "Mix everything together."},
+            {"@type": "HowToStep", "text": "Bake for 30 minutes."},
+        ],
+    }
+    return f'<html><head><script type="application/ld+json">{json.dumps(recipe)}</script></head><body></body></html>'
+
+
+class RecipeSource:
+    """A recipe page that answers conditional requests, like a well-behaved site"""
+
+    def __init__(self, html: str) -> None:
+        self.requests: list[httpx.Request] = []
+        self.update(html)
+
+    def update(self, html: str) -> None:
+        self.html = html
+        self.etag = f'"{content_hash({"html": html})}"'
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+
+        return httpx.Response(200, html=self.html, headers={"ETag": self.etag})
+
+
+@pytest.fixture()
+def source() -> RecipeSource:
+    return RecipeSource(recipe_page(random_string(), "A simple loaf of bread."))
+
+
+async def import_recipe(unique_user: TestUser, source: RecipeSource) -> Recipe:
+    url = f"https://example.com/{random_string()}"
+    scraped, _ = await RecipeScraper(local_provider()).scrape(url, source.html)
+    assert scraped
+
+    scraped.image = None
+    return unique_user.repos.recipes.create(
+        scraped.model_copy(
+            update={
+                "id": None,
+                "user_id": unique_user.user_id,
+                "group_id": unique_user.group_id,
+                "settings": RecipeSettings(),
+            }
+        )
+    )
+
+
+async def refresh(unique_user: TestUser, recipe: Recipe, source: RecipeSource) -> RecipeRefresher:
+    async with httpx.AsyncClient(transport=httpx.MockTransport(source.handler)) as client:
+        refresher = RecipeRefresher(unique_user.repos.session, client)
+        assert recipe.id and recipe.org_url
+        await refresher.refresh(RecipeToRefresh(recipe.id, unique_user.group_id, recipe.org_url))
+        refresher.save_report_statuses()
+        return refresher
+
+
+def get_recipe(unique_user: TestUser, recipe: Recipe) -> Recipe:
+    unique_user.repos.session.expire_all()
+    refreshed = unique_user.repos.recipes.get_one(recipe.id, "id")
+    assert refreshed
+    return refreshed
+
+
+@pytest.mark.asyncio
+async def test_recipe_content_hash_is_stable(unique_user: TestUser, source: RecipeSource):
+    imported_recipe = await import_recipe(unique_user, source)
+
+    scraped, _ = await RecipeScraper(local_provider()).scrape(imported_recipe.org_url or "", source.html)
+    assert scraped
+
+    # the recipe parsed from the page matches the one that was saved from it
+    saved = get_recipe(unique_user, imported_recipe)
+    assert content_hash(recipe_content(scraped)) == content_hash(recipe_content(saved))
+
+
+@pytest.mark.asyncio
+async def test_refresh_updates_changed_recipe(unique_user: TestUser, source: RecipeSource):
+    imported_recipe = await import_recipe(unique_user, source)
+
+    # the first check only records the source
+    stats = (await refresh(unique_user, imported_recipe, source)).stats
+    assert stats.checked == 1 and stats.unchanged == 1
+
+    # unchanged pages aren't downloaded or parsed again
+    stats = (await refresh(unique_user, imported_recipe, source)).stats
+    assert stats.not_modified == 1
+    assert source.requests[-1].headers["If-None-Match"] == source.etag
+
+    source.update(recipe_page(imported_recipe.name or "", "A simple, crusty loaf of bread."))
+    stats = (await refresh(unique_user, imported_recipe, source)).stats
+    assert stats.updated == 1
+
+    refreshed = get_recipe(unique_user, imported_recipe)
+    assert refreshed.description == "A simple, crusty loaf of bread."
+    assert refreshed.name == imported_recipe.name
+    assert len(refreshed.recipe_ingredient) == 3
+
+    reports = unique_user.repos.group_reports.multi_query({"category": "recipe_refresh"})
+    assert reports and reports[0].status == "success"
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_edited_recipe(unique_user: TestUser, source: RecipeSource):
+    imported_recipe = await import_recipe(unique_user, source)
+
+    await refresh(unique_user, imported_recipe, source)
+
+    unique_user.repos.recipes.patch(imported_recipe.slug, {"description": "My own take on bread."})
+    source.update(recipe_page(imported_recipe.name or "", "A simple, crusty loaf of bread."))
+    stats = (await refresh(unique_user, imported_recipe, source)).stats
+    assert stats.edited == 1 and stats.updated == 0
+
+    assert get_recipe(unique_user, imported_recipe).description == "My own take on bread."
+
+
+@pytest.mark.asyncio
+async def test_edited_recipes_arent_reported_as_updated(unique_user: TestUser):
+    edited_source = RecipeSource(recipe_page(random_string(), "A simple loaf of bread."))
+    edited = await import_recipe(unique_user, edited_source)
+    failing_source = RecipeSource(recipe_page(random_string(), "A simple loaf of bread."))
+    failing = await import_recipe(unique_user, failing_source)
+    await refresh(unique_user, edited, edited_source)
+
+    unique_user.repos.recipes.patch(edited.slug, {"description": "My own take on bread."})
+    edited_source.update(recipe_page(edited.name or "", "A simple, crusty loaf of bread."))
+    failing_source.handler = lambda request: httpx.Response(404)  # type: ignore[method-assign]
+
+    earlier_reports = {
+        report.id for report in unique_user.repos.group_reports.multi_query({"category": "recipe_refresh"})
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        source = edited_source if str(request.url) == edited.org_url else failing_source
+        return source.handler(request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        refresher = RecipeRefresher(unique_user.repos.session, client)
+        for recipe in [edited, failing]:
+            assert recipe.id and recipe.org_url
+            await refresher.refresh(RecipeToRefresh(recipe.id, unique_user.group_id, recipe.org_url))
+        refresher.save_report_statuses()
+
+    assert refresher.stats.edited == 1 and refresher.stats.failed == 1 and refresher.stats.updated == 0
+
+    # nothing was updated, so the run failed rather than partially succeeded
+    reports = unique_user.repos.group_reports.multi_query({"category": "recipe_refresh"})
+    assert [report.status for report in reports if report.id not in earlier_reports] == ["failure"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_reports_unavailable_source(unique_user: TestUser, source: RecipeSource):
+    imported_recipe = await import_recipe(unique_user, source)
+
+    source.handler = lambda request: httpx.Response(404)  # type: ignore[method-assign]
+    stats = (await refresh(unique_user, imported_recipe, source)).stats
+    assert stats.failed == 1
+
+    # the recipe isn't checked again until it's due
+    due = get_recipes_to_refresh(unique_user.repos.session, timedelta(days=1), limit=10_000)
+    assert imported_recipe.id not in {item.recipe_id for item in due}
+
+
+@pytest.mark.asyncio
+async def test_refresh_retries_page_that_failed_to_parse(unique_user: TestUser, source: RecipeSource):
+    imported_recipe = await import_recipe(unique_user, source)
+
+    source.update("<html><body>Temporarily unavailable</body></html>")
+    stats = (await refresh(unique_user, imported_recipe, source)).stats
+    assert stats.failed == 1
+
+    # the page's ETag wasn't saved, so it's downloaded and parsed again rather than skipped as not modified
+    stats = (await refresh(unique_user, imported_recipe, source)).stats
+    assert stats.failed == 1 and stats.not_modified == 0
+    assert "If-None-Match" not in source.requests[-1].headers
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_keep_each_others_changes(unique_user: TestUser, monkeypatch: pytest.MonkeyPatch):
+    failing_source = RecipeSource(recipe_page(random_string(), "A simple loaf of bread."))
+    failing = await import_recipe(unique_user, failing_source)
+    slow_source = RecipeSource(recipe_page(random_string(), "A simple loaf of bread."))
+    slow = await import_recipe(unique_user, slow_source)
+    assert failing.id and failing.org_url and slow.id and slow.org_url
+
+    await refresh(unique_user, failing, failing_source)
+    failing_source.update(recipe_page(failing.name or "", "A simple, crusty loaf of bread."))
+
+    def patch(*args, **kwargs):
+        raise ValueError("unable to save recipe")
+
+    monkeypatch.setattr(type(unique_user.repos.recipes), "patch", patch)
+
+    failed = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == slow.org_url:
+            # the slow page is still being fetched while the other refresh fails and rolls back
+            await failed.wait()
+            return slow_source.handler(request)
+
+        return failing_source.handler(request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        refresher = RecipeRefresher(unique_user.repos.session, client)
+
+        async def refresh_failing() -> None:
+            await refresher.refresh(RecipeToRefresh(failing.id, unique_user.group_id, failing.org_url))
+            failed.set()
+
+        await asyncio.gather(
+            refresher.refresh(RecipeToRefresh(slow.id, unique_user.group_id, slow.org_url)),
+            refresh_failing(),
+        )
+        assert refresher.stats.failed == 1
+
+    unique_user.repos.session.expire_all()
+    due = get_recipes_to_refresh(unique_user.repos.session, timedelta(days=1), limit=10_000)
+    assert slow.id not in {item.recipe_id for item in due}
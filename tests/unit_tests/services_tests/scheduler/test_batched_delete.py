@@ -0,0 +1,65 @@
+from datetime import UTC, datetime, timedelta
+
+from mealie.db.models.recipe.shared import RecipeShareTokenModel
+from mealie.schema.recipe.recipe import Recipe
+from mealie.schema.recipe.recipe_share_token import RecipeShareTokenSave
+from mealie.services.scheduler.batched_delete import PurgeStats, delete_in_batches
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def create_share_tokens(unique_user: TestUser, count: int) -> list[str]:
+    db = unique_user.repos
+    recipe = db.recipes.create(
+        Recipe(user_id=unique_user.user_id, group_id=unique_user.group_id, name=random_string(20))
+    )
+    assert recipe and recipe.id
+
+    return [
+        str(
+            db.recipe_share_tokens.create(
+                RecipeShareTokenSave(recipe_id=recipe.id, group_id=unique_user.group_id, expires_at=datetime.now(UTC))
+            ).id
+        )
+        for _ in range(count)
+    ]
+
+
+def test_delete_in_batches(unique_user: TestUser):
+    token_ids = create_share_tokens(unique_user, 5)
+    session = unique_user.repos.session
+
+    returned_ids: list[str] = []
+    stats = delete_in_batches(
+        session,
+        RecipeShareTokenModel,
+        RecipeShareTokenModel.id.in_(token_ids),
+        stats=PurgeStats("share tokens"),
+        batch_size=2,
+        returning=[RecipeShareTokenModel.id],
+        on_batch=lambda rows: returned_ids.extend(str(id) for (id,) in rows),
+    )
+
+    assert stats.complete
+    assert stats.removed == 5
+    assert stats.batches == 3
+    assert sorted(returned_ids) == sorted(token_ids)
+    for token_id in token_ids:
+        assert not unique_user.repos.recipe_share_tokens.get_one(token_id)
+
+
+def test_delete_in_batches_stops_at_time_budget(unique_user: TestUser):
+    token_ids = create_share_tokens(unique_user, 3)
+    session = unique_user.repos.session
+
+    stats = delete_in_batches(
+        session,
+        RecipeShareTokenModel,
+        RecipeShareTokenModel.id.in_(token_ids),
+        stats=PurgeStats("share tokens", time_budget=timedelta(0)),
+    )
+
+    assert not stats.complete
+    assert stats.removed == 0
+    for token_id in token_ids:
+        assert unique_user.repos.recipe_share_tokens.get_one(token_id)
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+from datetime import timedelta
+
+import pytest
+
+from mealie.db.db_setup import session_context
+from mealie.schema.admin.scheduler import ScheduledJobStatus
+from mealie.services.scheduler.job_runner import MAX_RUN_HISTORY, JobRunner, ScheduledJobRepository
+from tests.utils.factories import random_string
+
+DAY = timedelta(days=1)
+
+
+def job_factory(fn=None):
+    """Creates a job with a unique name, since job state is shared across tests through the database"""
+
+    def job():
+        if fn:
+            fn()
+
+    job.__name__ = f"test_job_{random_string()}"
+    return job
+
+
+def get_job(name: str):
+    with session_context() as session:
+        return next(job for job in ScheduledJobRepository(session).get_jobs() if job.name == name)
+
+
+def get_runs(name: str):
+    with session_context() as session:
+        return ScheduledJobRepository(session).get_runs(name) or []
+
+
+def test_job_lease_is_exclusive_and_once_per_period():
+    name = f"test_job_{random_string()}"
+
+    with session_context() as session:
+        repo = ScheduledJobRepository(session)
+        repo.ensure(name, "daily")
+        repo.ensure(name, "daily")
+
+        assert repo.acquire(name, "worker-1", DAY)
+        assert not repo.acquire(name, "worker-2", DAY)
+
+        assert repo.renew(name, "worker-1")
+        assert not repo.renew(name, "worker-2")
+
+        repo.finish(name, "worker-1", get_job(name).last_started_at, 12.5, None)  # type: ignore
+
+        # the lease was released, but the job already ran this period
+        assert not repo.acquire(name, "worker-2", DAY)
+        assert repo.acquire(name, "worker-2", timedelta(0))
+
+    job = get_job(name)
+    assert job.running
+    assert job.locked_by == "worker-2"
+    assert job.run_count == 1
+    assert job.last_duration_ms == 12.5
+    assert job.last_status == ScheduledJobStatus.success
+
+
+@pytest.mark.asyncio
+async def test_runner_records_runs():
+    def fail():
+        raise ValueError("something went wrong")
+
+    ok_job, failing_job = job_factory(), job_factory(fail)
+    runner = JobRunner(max_concurrent=2)
+    await runner.run_jobs("daily", [ok_job, failing_job], DAY)
+
+    job = get_job(ok_job.__name__)
+    assert job.schedule == "daily"
+    assert not job.running
+    assert job.run_count == 1
+    assert job.failure_count == 0
+    assert job.last_status == ScheduledJobStatus.success
+    assert job.last_duration_ms is not None
+    assert job.average_duration_ms == job.last_duration_ms
+
+    job = get_job(failing_job.__name__)
+    assert job.failure_count == 1
+    assert job.last_status == ScheduledJobStatus.failed
+    assert job.last_error and "something went wrong" in job.last_error
+
+    [run] = get_runs(failing_job.__name__)
+    assert run.status == ScheduledJobStatus.failed
+    assert run.worker == runner.worker
+
+    # the next tick is within the same period, so nothing runs again
+    await runner.run_jobs("daily", [ok_job, failing_job], DAY)
+    assert get_job(ok_job.__name__).run_count == 1
+
+
+@pytest.mark.asyncio
+async def test_runner_runs_independent_jobs_in_parallel():
+    # each job waits for the other, so they only finish if they run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    jobs = [job_factory(barrier.wait), job_factory(barrier.wait)]
+
+    await JobRunner(max_concurrent=2).run_jobs("minutely", jobs, DAY)
+    for job in jobs:
+        assert get_job(job.__name__).last_status == ScheduledJobStatus.success
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_runs_a_job():
+    calls: list[int] = []
+    lock = threading.Lock()
+
+    def count():
+        with lock:
+            calls.append(1)
+
+    job = job_factory(count)
+    workers = [JobRunner(max_concurrent=1) for _ in range(4)]
+
+    await asyncio.gather(*(worker.run_job("hourly", job, DAY) for worker in workers))
+    assert len(calls) == 1
+    assert get_job(job.__name__).run_count == 1
+
+
+def test_run_history_is_bounded():
+    name = f"test_job_{random_string()}"
+
+    with session_context() as session:
+        repo = ScheduledJobRepository(session)
+        repo.ensure(name, "minutely")
+        for _ in range(MAX_RUN_HISTORY + 5):
+            assert repo.acquire(name, "worker", timedelta(0))
+            repo.finish(name, "worker", get_job(name).last_started_at, 1, None)  # type: ignore
+
+    assert len(get_runs(name)) == MAX_RUN_HISTORY
+    assert get_job(name).run_count == MAX_RUN_HISTORY + 5
+
+
+@pytest.mark.asyncio
+async def test_run_window_spans_from_the_previous_run():
+    job = job_factory()
+    name = job.__name__
+
+    with session_context() as session:
+        assert ScheduledJobRepository(session).get_run_window(name) == (None, None)
+
+    first, second = JobRunner(max_concurrent=1), JobRunner(max_concurrent=1)
+    assert await first.run_job("minutely", job, timedelta(0))
+    [first_run] = get_runs(name)
+
+    # runs are recorded with the job's own start time
+    assert first_run.started_at == get_job(name).last_started_at
+
+    assert await second.run_job("minutely", job, timedelta(0))
+    with session_context() as session:
+        previous, started_at = ScheduledJobRepository(session).get_run_window(name)
+
+    assert previous == first_run.started_at
+    assert started_at == get_job(name).last_started_at
+    assert started_at > previous  # type: ignore
@@ -0,0 +1,169 @@
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from mealie.services.scraper import scraper_strategies
+from mealie.services.scraper.html_cache import TRIM_RATIO, ScrapedHTMLCache, normalize_url
+from tests.utils.factories import random_string
+
+DAY = 60 * 60 * 24
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://Example.com/recipe", "https://example.com/recipe"),
+        ("https://example.com:443/recipe#step-2", "https://example.com/recipe"),
+        ("http://example.com:8080", "http://example.com:8080/"),
+        ("https://example.com/recipe?b=2&a=1", "https://example.com/recipe?a=1&b=2"),
+        ("https://example.com/recipe?utm_source=x&fbclid=y&id=3", "https://example.com/recipe?id=3"),
+    ],
+)
+def test_normalize_url(url: str, expected: str):
+    assert normalize_url(url) == expected
+
+
+def test_cache_round_trip_and_content_addressing(tmp_path: Path):
+    cache = ScrapedHTMLCache(tmp_path, max_size=1024 * 1024, ttl=DAY)
+    html = f"<html>{random_string()}</html>"
+
+    cache.set("https://example.com/recipe?utm_source=feed", html, etag='"abc"')
+    cache.set("https://www.example.com/recipe", html)
+
+    entry = cache.get("https://EXAMPLE.com/recipe")
+    assert entry and entry.html == html
+    assert entry.etag == '"abc"'
+    assert entry.is_fresh(cache.ttl)
+
+    # both urls point at the same stored page
+    assert len(cache) == 2
+    assert len(list(cache.pages_dir.glob("*/*.html.gz"))) == 1
+
+    assert cache.delete("https://example.com/recipe")
+    assert len(list(cache.pages_dir.glob("*/*.html.gz"))) == 1
+    assert cache.delete("https://www.example.com/recipe")
+    assert not list(cache.pages_dir.glob("*/*.html.gz"))
+
+
+def test_cache_expiration(tmp_path: Path):
+    cache = ScrapedHTMLCache(tmp_path, max_size=1024 * 1024, ttl=0)
+
+    cache.set("https://example.com/no-validators", "<html>a</html>")
+    cache.set("https://example.com/etag", "<html>b</html>", etag='"b"')
+    cache.set("https://example.com/last-modified", "<html>c</html>", last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+
+    # expired pages without validators can't be revalidated, so they're dropped
+    assert cache.get("https://example.com/no-validators") is None
+
+    for url in ["https://example.com/etag", "https://example.com/last-modified"]:
+        entry = cache.get(url)
+        assert entry and not entry.is_fresh(cache.ttl)
+        assert entry.validators
+
+
+def test_cache_is_size_bounded(tmp_path: Path):
+    cache = ScrapedHTMLCache(tmp_path, max_size=4096, ttl=DAY)
+
+    # random content barely compresses, so only a few pages fit
+    for i in range(10):
+        cache.set(f"https://example.com/{i}", random_string(1024), etag=str(i))
+
+    assert cache.size() <= 4096
+    assert cache.get("https://example.com/9")
+    assert cache.get("https://example.com/0") is None
+
+
+def test_cache_trims_below_max_size(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = ScrapedHTMLCache(tmp_path, max_size=16 * 1024, ttl=DAY)
+    for i in range(40):
+        cache.set(f"https://example.com/{i}", random_string(1024))
+
+    # a full cache is trimmed with room to spare, so the next page doesn't trim it again
+    assert cache.size() <= cache.max_size * TRIM_RATIO
+    trims: list[int] = []
+    monkeypatch.setattr(cache, "trim", lambda: trims.append(1))
+    cache.set("https://example.com/next", random_string(1024))
+    assert not trims
+
+
+def test_cache_recreates_removed_index(tmp_path: Path):
+    cache = ScrapedHTMLCache(tmp_path, max_size=1024 * 1024, ttl=DAY)
+    (tmp_path / "index.db").unlink()
+
+    # a thread opening its own connection finds an empty index, like after a backup restore
+    html = f"<html>{random_string()}</html>"
+    results = []
+
+    def scrape():
+        cache.set("https://example.com/recipe", html)
+        results.append(cache.get("https://example.com/recipe"))
+
+    thread = threading.Thread(target=scrape)
+    thread.start()
+    thread.join()
+
+    assert results and results[0] and results[0].html == html
+
+
+@pytest.mark.asyncio
+async def test_safe_scrape_html_uses_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = ScrapedHTMLCache(tmp_path, max_size=1024 * 1024, ttl=DAY)
+    monkeypatch.setattr(scraper_strategies, "get_scraped_html_cache", lambda: cache)
+
+    html = f"<html>{random_string()}</html>"
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+
+        return httpx.Response(200, html=html, headers={"ETag": '"v1"'})
+
+    async def scrape(url: str) -> str:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await scraper_strategies.safe_scrape_html(url, client)
+
+    url = f"https://example.com/{random_string()}"
+    assert await scrape(url) == html
+    assert await scrape(url) == html
+    assert len(requests) == 1
+
+    # once the page is stale, it's revalidated instead of downloaded again
+    cache.ttl = 0
+    assert await scrape(url) == html
+    assert len(requests) == 2
+    assert requests[-1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_scrape_page_uses_cache_off_the_event_loop(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = ScrapedHTMLCache(tmp_path, max_size=1024 * 1024, ttl=DAY)
+    monkeypatch.setattr(scraper_strategies, "get_scraped_html_cache", lambda: cache)
+    threads: list[threading.Thread] = []
+
+    for name in ["get", "set", "mark_revalidated"]:
+
+        def record(*args, _method=getattr(cache, name), **kwargs):
+            threads.append(threading.current_thread())
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(cache, name, record)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+
+        return httpx.Response(200, html="<html></html>", headers={"ETag": '"v1"'})
+
+    url = f"https://example.com/{random_string()}"
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await scraper_strategies.scrape_page(url, client)
+        cache.ttl = 0
+        await scraper_strategies.scrape_page(url, client)
+
+    # get and set on the first scrape, then get and mark_revalidated on the second
+    assert len(threads) == 4
+    assert threading.main_thread() not in threads
@@ -0,0 +1,177 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from mealie.lang.providers import local_provider
+from mealie.services.scraper import scraper_strategies
+from mealie.services.scraper.html_cache import ScrapedHTMLCache
+from mealie.services.scraper.html_stream import RecipeJsonLdDetector, is_recipe
+from mealie.services.scraper.recipe_scraper import RecipeScraper
+from mealie.services.scraper.scraper_strategies import ABCScraperStrategy, FetchedHTML, fetch_html, scrape_page
+from tests import data as test_data
+
+RECIPE = {"@context": "https://schema.org", "@type": "Recipe", "name": "Pancakes"}
+ARTICLE = {"@context": "https://schema.org", "@type": "Article", "name": "Our favorite breakfasts"}
+
+
+def page(*json_ld: dict, body: str = "") -> bytes:
+    scripts = "".join(f'<script type="application/ld+json">{json.dumps(data)}</script>' for data in json_ld)
+    return f"<html><head>{scripts}</head><body>{body}</body></html>".encode()
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (RECIPE, True),
+        (ARTICLE, False),
+        ({"@type": ["Recipe", "NewsArticle"]}, True),
+        ({"@graph": [ARTICLE, RECIPE]}, True),
+        ([ARTICLE, RECIPE], True),
+        ({"@type": "WebPage", "mainEntity": RECIPE}, True),
+        (None, False),
+    ],
+)
+def test_is_recipe(data, expected: bool):
+    assert is_recipe(data) is expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100_000])
+def test_detector_finds_recipe_across_chunks(chunk_size: int):
+    html = page(ARTICLE, RECIPE, body="x" * 1000)
+    detector = RecipeJsonLdDetector()
+
+    buffer = bytearray()
+    for i in range(0, len(html), chunk_size):
+        buffer += html[i : i + chunk_size]
+        if detector.feed(buffer):
+            break
+
+    assert detector.found
+    assert detector.end and html[: detector.end].endswith(b"</script>")
+    assert b"Pancakes" in html[: detector.end]
+    assert b"x" * 1000 not in html[: detector.end]
+
+
+def test_detector_ignores_pages_without_recipes():
+    detector = RecipeJsonLdDetector()
+    assert not detector.feed(page(ARTICLE, body="<script>var a = 1;</script>"))
+    assert not detector.found
+
+
+def test_detector_finds_recipes_in_test_pages():
+    detector = RecipeJsonLdDetector()
+    assert detector.feed(test_data.html_sous_vide_shrimp.read_bytes())
+
+
+async def fetch(content: bytes, url: str = "https://example.com/recipe", **kwargs) -> tuple[str, bool, int]:
+    """Fetches `content` from a mock site, returning the html, whether it was truncated, and the bytes sent"""
+    fetched, sent = await fetch_page(content, url, **kwargs)
+    return fetched.html, fetched.truncated, sent
+
+
+async def fetch_page(content: bytes, url: str, **kwargs) -> tuple[FetchedHTML, int]:
+    sent = 0
+
+    async def stream():
+        nonlocal sent
+        for i in range(0, len(content), 100):
+            sent += len(content[i : i + 100])
+            yield content[i : i + 100]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=stream(), headers={"Content-Type": "text/html; charset=utf-8"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        fetched = await fetch_html(url, client, **kwargs)
+
+    assert fetched
+    return fetched, sent
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_stops_at_recipe():
+    content = page(RECIPE, body="x" * 100_000)
+
+    html, truncated, sent = await fetch(content, stop_at_recipe=True)
+    assert "Pancakes" in html
+    assert not truncated
+    assert sent < 1000
+
+    html, truncated, sent = await fetch(content, stop_at_recipe=False)
+    assert html == content.decode()
+    assert sent == len(content)
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_marks_early_stops_as_partial():
+    content = page(RECIPE, body="x" * 100_000)
+
+    fetched, _ = await fetch_page(content, "https://example.com/recipe", stop_at_recipe=True)
+    assert fetched.partial
+
+    fetched, _ = await fetch_page(content, "https://example.com/recipe", stop_at_recipe=False)
+    assert not fetched.partial
+
+    # site-specific scrapers may read any part of the page, so their sites are always downloaded in full
+    fetched, sent = await fetch_page(content, "https://www.allrecipes.com/recipe/1/pancakes", stop_at_recipe=True)
+    assert not fetched.partial
+    assert sent == len(content)
+
+
+@pytest.mark.asyncio
+async def test_partial_pages_are_not_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = ScrapedHTMLCache(tmp_path, max_size=1024 * 1024, ttl=60 * 60 * 24)
+    monkeypatch.setattr(scraper_strategies, "get_scraped_html_cache", lambda: cache)
+    content = page(RECIPE, body="x" * 100_000)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=content, headers={"ETag": '"v1"'})
+
+    async def scrape(url: str, stop_at_recipe: bool) -> FetchedHTML:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await scrape_page(url, client, stop_at_recipe=stop_at_recipe)
+
+    url = "https://example.com/partial-recipe"
+    assert (await scrape(url, stop_at_recipe=True)).partial
+    assert cache.get(url) is None
+
+    assert not (await scrape(url, stop_at_recipe=False)).partial
+    cached = cache.get(url)
+    assert cached and cached.html == content.decode()
+
+
+@pytest.mark.asyncio
+async def test_scraper_downloads_the_rest_of_a_partial_page(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(scraper_strategies, "get_scraped_html_cache", lambda: None)
+    content = page(RECIPE, body="x" * 100_000)
+    seen: list[str] = []
+
+    class FullPageStrategy(ABCScraperStrategy):
+        async def get_html(self, url: str) -> str:
+            return self.raw_html or ""
+
+        async def parse(self):
+            seen.append(await self.get_html(self.url))
+            return None
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=content)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await RecipeScraper(local_provider(), [FullPageStrategy]).scrape(
+            "https://example.com/recipe", "<html>partial</html>", client, partial=True
+        )
+
+    assert result == (None, None)
+    assert seen == [content.decode()]
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_enforces_max_bytes():
+    content = page(ARTICLE, body="x" * 100_000)
+
+    html, truncated, _ = await fetch(content, max_bytes=5000, stop_at_recipe=True)
+    assert truncated
+    assert len(html) == 5000
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+
+from mealie.services.scraper.http_client import DomainLimiter, create_scraper_client
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://www.example.com/recipe/1", "example.com"),
+        ("https://Example.com:8080/recipe/1", "example.com"),
+        ("  http://recipes.example.com/a?b=c ", "recipes.example.com"),
+        ("not a url", ""),
+    ],
+)
+def test_get_domain(url: str, expected: str):
+    assert DomainLimiter.get_domain(url) == expected
+
+
+@pytest.mark.asyncio
+async def test_domain_limiter_limits_concurrency_per_domain():
+    limiter = DomainLimiter(max_per_domain=2, delay=0)
+    active: dict[str, int] = {"a.com": 0, "b.com": 0}
+    peak: dict[str, int] = {"a.com": 0, "b.com": 0}
+
+    async def fetch(domain: str):
+        async with limiter.limit(f"https://{domain}/recipe"):
+            active[domain] += 1
+            peak[domain] = max(peak[domain], active[domain])
+            await asyncio.sleep(0.01)
+            active[domain] -= 1
+
+    await asyncio.gather(*(fetch(domain) for domain in ["a.com", "b.com"] * 5))
+    assert peak == {"a.com": 2, "b.com": 2}
+
+
+@pytest.mark.asyncio
+async def test_domain_limiter_spaces_out_requests_to_the_same_domain():
+    limiter = DomainLimiter(max_per_domain=5, delay=0.05)
+    starts: dict[str, list[float]] = {"a.com": [], "b.com": []}
+
+    async def fetch(domain: str):
+        async with limiter.limit(f"https://{domain}/recipe"):
+            starts[domain].append(time.monotonic())
+
+    await asyncio.gather(*(fetch(domain) for domain in ["a.com", "b.com"] * 3))
+    for domain_starts in starts.values():
+        assert len(domain_starts) == 3
+        gaps = [b - a for a, b in zip(domain_starts, domain_starts[1:], strict=False)]
+        assert all(gap >= 0.04 for gap in gaps)
+
+    # different domains aren't delayed by each other
+    assert abs(starts["a.com"][0] - starts["b.com"][0]) < 0.04
+
+
+@pytest.mark.asyncio
+async def test_create_scraper_client():
+    async with create_scraper_client(max_connections=4) as client:
+        assert not client.is_closed
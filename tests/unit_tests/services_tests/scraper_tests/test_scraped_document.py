@@ -0,0 +1,59 @@
+import extruct
+import pytest
+
+from mealie.lang.providers import local_provider
+from mealie.services.scraper.scraped_document import ScrapedDocument
+from mealie.services.scraper.scraper_strategies import RecipeScraperOpenAI, RecipeScraperOpenGraph
+from tests import data as test_data
+
+URL = "https://www.bbc.co.uk/food/recipes/healthy_pasta_bake_60759"
+
+
+def test_document_parses_lazily_and_once():
+    html = test_data.html_healthy_pasta_bake_60759.read_text()
+    document = ScrapedDocument(URL, html)
+    assert "tree" not in document.__dict__
+
+    opengraph = document.opengraph
+    tree = document.tree
+    assert opengraph and document.opengraph is opengraph
+    assert document.json_ld
+    assert document.tree is tree
+
+    # extracting from the shared tree gives the same results as extracting from the html
+    expected = extruct.extract(html, base_url=document.base_url, syntaxes=["opengraph"], errors="log")
+    assert opengraph == expected["opengraph"]
+
+
+def test_document_reuses_recipe_scraper_soup():
+    document = ScrapedDocument(URL, test_data.html_sous_vide_shrimp.read_text())
+
+    scraper = document.recipe_scraper()
+    assert document.recipe_scraper() is scraper
+    assert document.soup is scraper.soup
+
+
+def test_document_handles_unparsable_html():
+    document = ScrapedDocument(URL, "")
+    assert document.tree is None
+    assert document.opengraph == []
+
+
+@pytest.mark.asyncio
+async def test_strategies_share_document():
+    translator = local_provider()
+    html = test_data.html_healthy_pasta_bake_60759.read_text()
+    document = ScrapedDocument(URL, html)
+
+    open_graph = RecipeScraperOpenGraph(URL, translator, raw_html=html, document=document)
+    recipe, _ = await open_graph.parse()
+    assert recipe and recipe.name
+
+    open_ai = RecipeScraperOpenAI(URL, translator, raw_html=html, document=document)
+    assert open_ai.format_html_to_text(html)
+    assert open_ai.get_document(html) is document
+    assert "opengraph" in document._metadata
+    assert document._soup is not None
+
+    # html that isn't the shared page is parsed on its own
+    assert open_ai.get_document("<html></html>") is not document
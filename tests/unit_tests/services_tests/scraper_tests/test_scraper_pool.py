@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+import pytest
+
+from mealie.core.config import get_app_settings
+from mealie.lang.providers import local_provider
+from mealie.services.scraper import recipe_scraper
+from mealie.services.scraper.recipe_scraper import RecipeScraper
+from mealie.services.scraper.scraper_pool import ScraperPool
+from mealie.services.scraper.scraper_strategies import RecipeScraperOpenAI
+from tests import data as test_data
+
+
+def worker_document_id(url: str, html: str) -> int:
+    return id(recipe_scraper._get_worker_document(url, html))
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ScraperPool(workers=1, timeout=60)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_calls_in_worker_process(pool: ScraperPool):
+    assert await pool.run(os.getpid) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_pool_interrupts_slow_calls(pool: ScraperPool):
+    pool.timeout = 0.5
+    try:
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            await pool.run(time.sleep, 30)
+        assert time.perf_counter() - start < 10
+    finally:
+        pool.timeout = 60
+
+    # the worker is still usable afterwards
+    assert await pool.run(len, "abc") == 3
+
+
+@pytest.mark.asyncio
+async def test_recipe_scraper_parses_in_pool(pool: ScraperPool, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(recipe_scraper, "get_scraper_pool", lambda: pool)
+
+    scraper = RecipeScraper(local_provider())
+    url = "https://www.bbc.co.uk/food/recipes/healthy_pasta_bake_60759"
+    recipe, _ = await scraper.scrape(url, html=test_data.html_healthy_pasta_bake_60759.read_text())
+
+    assert recipe and recipe.name
+    assert recipe.recipe_ingredient
+
+
+@pytest.mark.asyncio
+async def test_strategies_share_document_in_worker(pool: ScraperPool):
+    url = "https://example.com/recipe"
+    first = await pool.run(worker_document_id, url, "<html>one</html>")
+
+    assert await pool.run(worker_document_id, url, "<html>one</html>") == first
+    assert await pool.run(worker_document_id, url, "<html>two</html>") != first
+
+
+@pytest.mark.asyncio
+async def test_recipe_scraper_falls_back_in_pool(pool: ScraperPool, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(recipe_scraper, "get_scraper_pool", lambda: pool)
+    html = (
+        '<html><head><meta property="og:title" content="Pancakes">'
+        '<meta property="og:description" content="Fluffy pancakes"></head><body></body></html>'
+    )
+
+    # the page has no recipe schema, so it's scraped from its Open Graph data in the pool
+    recipe, _ = await RecipeScraper(local_provider()).scrape("https://example.com/pancakes", html=html)
+    assert recipe and recipe.name == "Pancakes"
+
+
+@pytest.mark.asyncio
+async def test_open_ai_parses_page_off_the_event_loop(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(type(get_app_settings()), "OPENAI_ENABLED", property(lambda _: True))
+    threads: list[threading.Thread] = []
+
+    def format_html_to_text(self, html: str) -> str:
+        threads.append(threading.current_thread())
+        raise ValueError("no text found")
+
+    monkeypatch.setattr(RecipeScraperOpenAI, "format_html_to_text", format_html_to_text)
+
+    scraper = RecipeScraperOpenAI("https://example.com/recipe", local_provider(), raw_html="<html></html>")
+    with pytest.raises(ValueError):
+        await scraper.get_html(scraper.url)
+
+    assert threads and threads[0] is not threading.main_thread()
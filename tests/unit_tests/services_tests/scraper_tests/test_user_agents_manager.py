@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from mealie.services.scraper import scraper_strategies
+from mealie.services.scraper.scraper_strategies import fetch_html
+from mealie.services.scraper.user_agents_manager import REFRESH_INTERVAL, DomainUserAgents, UserAgentsManager
+
+DAY = 60 * 60 * 24
+
+
+@pytest.fixture()
+def manager(tmp_path: Path) -> UserAgentsManager:
+    return UserAgentsManager(DomainUserAgents(tmp_path / "user-agents.db", ttl=DAY))
+
+
+def test_user_agents_for_prefers_working_and_skips_blocked(manager: UserAgentsManager):
+    first, second, third, *_ = manager.user_agents
+
+    manager.record_user_agent("https://example.com/a", first, blocked=True)
+    manager.record_user_agent("https://example.com/a", third, blocked=False)
+
+    user_agents = manager.user_agents_for("https://www.EXAMPLE.com/b")
+    assert user_agents[0] == third
+    assert first not in user_agents
+    assert second in user_agents
+
+    # other sites aren't affected
+    assert manager.user_agents_for("https://example.org/") == manager.user_agents
+
+
+def test_user_agents_for_falls_back_when_all_blocked(manager: UserAgentsManager):
+    for user_agent in manager.user_agents:
+        manager.record_user_agent("https://example.com", user_agent, blocked=True)
+
+    assert manager.user_agents_for("https://example.com") == manager.user_agents
+
+
+def test_user_agent_records_expire(tmp_path: Path):
+    manager = UserAgentsManager(DomainUserAgents(tmp_path / "user-agents.db", ttl=0))
+    manager.record_user_agent("https://example.com", manager.user_agents[0], blocked=True)
+
+    assert manager.user_agents_for("https://example.com") == manager.user_agents
+
+
+def test_user_agents_for_recreates_removed_database(manager: UserAgentsManager, tmp_path: Path):
+    assert manager.memory
+    (tmp_path / "user-agents.db").unlink()
+
+    # a thread opening its own connection finds an empty database, like after a backup restore
+    results: list[list[str]] = []
+
+    def scrape():
+        manager.record_user_agent("https://example.com", manager.user_agents[1], blocked=False)
+        results.append(manager.user_agents_for("https://example.com"))
+
+    thread = threading.Thread(target=scrape)
+    thread.start()
+    thread.join()
+
+    assert results and results[0][0] == manager.user_agents[1]
+
+
+def test_user_agents_for_survives_database_errors(manager: UserAgentsManager, monkeypatch: pytest.MonkeyPatch):
+    def get(domain: str):
+        raise sqlite3.OperationalError("database is locked")
+
+    assert manager.memory
+    monkeypatch.setattr(manager.memory, "get", get)
+    assert manager.user_agents_for("https://example.com") == manager.user_agents
+
+
+def test_unchanged_records_arent_written_again(manager: UserAgentsManager, monkeypatch: pytest.MonkeyPatch):
+    assert manager.memory
+    first, second, *_ = manager.user_agents
+    manager.record_user_agent("https://example.com", first, blocked=False)
+    manager.record_user_agent("https://example.com", second, blocked=True)
+
+    writes: list[str] = []
+    connection = manager.memory._connection
+
+    def counted_connection():
+        writes.append("write")
+        return connection()
+
+    monkeypatch.setattr(manager.memory, "_connection", counted_connection)
+    manager.record_user_agent("https://example.com/recipe", first, blocked=False)
+    manager.record_user_agent("https://example.com/recipe", second, blocked=True)
+    assert not writes
+
+    # a change is always written
+    manager.record_user_agent("https://example.com", second, blocked=False)
+    assert writes
+    assert manager.user_agents_for("https://example.com")[0] == second
+
+
+def test_expired_records_are_removed_occasionally(manager: UserAgentsManager):
+    assert manager.memory
+    conn = manager.memory._connection()
+
+    def add_expired_record() -> None:
+        conn.execute(
+            "INSERT INTO user_agents (domain, user_agent, blocked, updated) VALUES (?, ?, ?, ?)",
+            ("example.org", manager.user_agents[0], 1, 0),
+        )
+
+    def count_records() -> int:
+        return conn.execute("SELECT COUNT(*) FROM user_agents WHERE domain = 'example.org'").fetchone()[0]
+
+    add_expired_record()
+    manager.record_user_agent("https://example.com", manager.user_agents[0], blocked=True)
+    assert count_records() == 0
+
+    add_expired_record()
+    manager.record_user_agent("https://example.com", manager.user_agents[1], blocked=True)
+    assert count_records() == 1
+
+    manager.memory._cleaned_at -= REFRESH_INTERVAL
+    manager.record_user_agent("https://example.com", manager.user_agents[2], blocked=True)
+    assert count_records() == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_remembers_working_user_agent(manager: UserAgentsManager, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(scraper_strategies, "get_user_agents_manager", lambda: manager)
+    accepted = manager.user_agents[2]
+    requests: list[httpx.Request] = []
+    threads: list[threading.Thread] = []
+
+    for name in ["user_agents_for", "record_user_agent"]:
+
+        def record(*args, _method=getattr(manager, name), **kwargs):
+            threads.append(threading.current_thread())
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(manager, name, record)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers["User-Agent"] != accepted:
+            return httpx.Response(403)
+
+        return httpx.Response(200, html="<html></html>")
+
+    async def fetch(url: str) -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            fetched = await fetch_html(url, client)
+            assert fetched and fetched.status_code == 200
+
+    await fetch("https://example.com/recipe-1")
+    assert len(requests) == 3
+
+    requests.clear()
+    await fetch("https://example.com/recipe-2")
+    assert len(requests) == 1
+    assert requests[0].headers["User-Agent"] == accepted
+
+    # the records are read and written off the event loop
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from mealie.services.event_bus_service.event_types import (
+    Event,
+    EventBusMessage,
+    EventDocumentDataBase,
+    EventDocumentType,
+    EventOperation,
+    EventTypes,
+)
+from mealie.services.event_bus_service.publisher import ApprisePublisher, WebhookPublisher
+from tests.utils.factories import random_string
+
+
+def event_generator() -> Event:
+    return Event(
+        message=EventBusMessage(title=random_string(), body=random_string()),
+        event_type=EventTypes.test_message,
+        integration_id=random_string(),
+        document_data=EventDocumentDataBase(document_type=EventDocumentType.generic, operation=EventOperation.info),
+    )
+
+
+@pytest.mark.asyncio
+async def test_webhook_publisher_fans_out_concurrently():
+    event = event_generator()
+    urls = [f"https://{random_string()}.example.com/hook" for _ in range(5)]
+
+    received: dict[str, bytes] = {}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+
+        received[str(request.url)] = request.content
+        return httpx.Response(200)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await WebhookPublisher(hard_fail=True, client=client).publish_async(event, urls)
+
+    assert sorted(received) == sorted(urls)
+    assert max_in_flight == len(urls)
+
+    # every subscriber receives the same payload
+    payloads = set(received.values())
+    assert len(payloads) == 1
+    assert json.loads(payloads.pop())["message"]["body"] == event.message.body
+
+
+@pytest.mark.asyncio
+async def test_webhook_publisher_hard_fail():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500)
+
+    async def publish(hard_fail: bool):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await WebhookPublisher(hard_fail=hard_fail, client=client).publish_async(
+                event_generator(), ["https://example.com/hook"]
+            )
+
+    await publish(hard_fail=False)
+    with pytest.raises(httpx.HTTPStatusError):
+        await publish(hard_fail=True)
+
+
+def test_publish_keeps_the_threads_event_loop(monkeypatch: pytest.MonkeyPatch):
+    sent: list[str] = []
+
+    async def send(self, url: str, *args, **kwargs) -> None:
+        sent.append(url)
+
+    monkeypatch.setattr(WebhookPublisher, "send", send)
+    results: list[bool] = []
+
+    def publish():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            WebhookPublisher().publish(event_generator(), ["https://example.com/hook"])
+            results.append(asyncio.get_event_loop() is loop)
+        finally:
+            loop.close()
+
+    # publishers are called from synchronous code in threads that may have an event loop of their own
+    thread = threading.Thread(target=publish)
+    thread.start()
+    thread.join()
+
+    assert sent == ["https://example.com/hook"]
+    assert results == [True]
+
+
+def test_apprise_publisher_reuses_household_instances():
+    household_id = uuid4()
+    url = f"json://localhost/{random_string()}"
+
+    publisher = ApprisePublisher(household_id=household_id)
+    instance, tag = publisher._get_instance(url)
+    assert len(instance) == 1
+
+    # the same instance is reused by other publishers for the same household
+    other_instance, other_tag = ApprisePublisher(household_id=household_id)._get_instance(url)
+    assert other_instance is instance
+    assert other_tag == tag
+    assert len(instance) == 1
+
+    other_household_instance, _ = ApprisePublisher(household_id=uuid4())._get_instance(url)
+    assert other_household_instance is not instance
+
+
+def test_apprise_publisher_does_not_reuse_event_specific_urls():
+    household_id = uuid4()
+    url = f"json://localhost/{random_string()}?%3Aevent_id={uuid4()}"
+
+    publisher = ApprisePublisher(household_id=household_id)
+    instance, tag = publisher._get_instance(url)
+    other_instance, _ = publisher._get_instance(url)
+
+    assert tag is None
+    assert other_instance is not instance
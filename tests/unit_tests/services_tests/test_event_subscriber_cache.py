@@ -0,0 +1,146 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from mealie.db.db_setup import session_context
+from mealie.repos.all_repositories import get_repositories
+from mealie.schema.household.group_events import (
+    GroupEventNotifierOptions,
+    GroupEventNotifierOut,
+    GroupEventNotifierSave,
+)
+from mealie.services.event_bus_service.event_bus_listeners import AppriseEventListener
+from mealie.services.event_bus_service.event_bus_service import EventBusService
+from mealie.services.event_bus_service.event_types import (
+    Event,
+    EventBusMessage,
+    EventDocumentDataBase,
+    EventDocumentType,
+    EventOperation,
+    EventTypes,
+)
+from mealie.services.event_bus_service.subscriber_cache import get_subscriber_cache
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def event_generator(event_type: EventTypes = EventTypes.recipe_created) -> Event:
+    return Event(
+        message=EventBusMessage(title=random_string(), body=random_string()),
+        event_type=event_type,
+        integration_id=random_string(),
+        document_data=EventDocumentDataBase(document_type=EventDocumentType.generic, operation=EventOperation.info),
+    )
+
+
+def create_notifier(unique_user: TestUser, **options: bool) -> tuple[GroupEventNotifierOut, str]:
+    url = f"json://localhost/{random_string()}"
+    notifier = unique_user.repos.group_event_notifier.create(
+        GroupEventNotifierSave(
+            name=random_string(),
+            apprise_url=url,
+            group_id=unique_user.group_id,
+            household_id=unique_user.household_id,
+            options=GroupEventNotifierOptions(**options),
+        )
+    )
+    return notifier, url
+
+
+def get_urls(unique_user: TestUser, event_type: EventTypes) -> list[str]:
+    listener = AppriseEventListener(unique_user.group_id, unique_user.household_id)
+    urls = get_subscriber_cache().get_notifier_urls(
+        unique_user.group_id, unique_user.household_id, listener.get_notifier_urls
+    )
+    return urls.get(event_type.name, [])
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    get_subscriber_cache().clear()
+    yield
+    get_subscriber_cache().clear()
+
+
+def test_subscribers_are_cached(unique_user: TestUser, monkeypatch: pytest.MonkeyPatch):
+    _, url = create_notifier(unique_user, recipe_created=True)
+
+    listener = AppriseEventListener(unique_user.group_id, unique_user.household_id)
+    assert url in [subscriber.split("?")[0] for subscriber in listener.get_subscribers(event_generator())]
+
+    # subsequent lookups are served from the cache, without touching the database
+    loader = MagicMock()
+    monkeypatch.setattr(listener, "get_notifier_urls", loader)
+    assert listener.get_subscribers(event_generator())
+    assert listener.get_subscribers(event_generator(EventTypes.recipe_deleted)) == []
+    loader.assert_not_called()
+
+
+def test_notifier_changes_invalidate_cache(unique_user: TestUser):
+    # warm the cache before the notifier exists
+    get_urls(unique_user, EventTypes.recipe_created)
+
+    # create
+    notifier, url = create_notifier(unique_user, recipe_created=True)
+    assert url in get_urls(unique_user, EventTypes.recipe_created)
+
+    # update options only
+    notifier.options.recipe_created = False
+    notifier.options.recipe_deleted = True
+    unique_user.repos.group_event_notifier.update(notifier.id, notifier)
+    assert url not in get_urls(unique_user, EventTypes.recipe_created)
+    assert url in get_urls(unique_user, EventTypes.recipe_deleted)
+
+    # disable
+    notifier.enabled = False
+    unique_user.repos.group_event_notifier.update(notifier.id, notifier)
+    assert url not in get_urls(unique_user, EventTypes.recipe_deleted)
+
+    # delete
+    notifier.enabled = True
+    unique_user.repos.group_event_notifier.update(notifier.id, notifier)
+    assert url in get_urls(unique_user, EventTypes.recipe_deleted)
+    unique_user.repos.group_event_notifier.delete(notifier.id)
+    assert url not in get_urls(unique_user, EventTypes.recipe_deleted)
+
+
+def test_household_changes_invalidate_cache(unique_user: TestUser):
+    with session_context() as session:
+        service = EventBusService(session=session)
+        household_ids = get_subscriber_cache().get_household_ids(
+            unique_user.group_id, lambda: service._get_household_ids(unique_user.group_id)
+        )
+        assert str(unique_user.household_id) in [str(household_id) for household_id in household_ids]
+
+        repos = get_repositories(session, group_id=unique_user.group_id, household_id=None)
+        household = repos.households.create({"name": random_string(), "group_id": unique_user.group_id})
+
+        # the new household is picked up on the next lookup
+        household_ids = get_subscriber_cache().get_household_ids(
+            unique_user.group_id, lambda: service._get_household_ids(unique_user.group_id)
+        )
+        assert household.id in household_ids
+
+
+def test_dispatch_without_subscribers_skips_database(unique_user: TestUser, monkeypatch: pytest.MonkeyPatch):
+    def dispatch():
+        with session_context() as session:
+            EventBusService(session=session).dispatch(
+                integration_id=random_string(),
+                group_id=unique_user.group_id,
+                household_id=None,
+                event_type=EventTypes.recipe_created,
+                document_data=EventDocumentDataBase(
+                    document_type=EventDocumentType.generic, operation=EventOperation.info
+                ),
+            )
+
+    # warm the cache
+    dispatch()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the database shouldn't be queried")
+
+    monkeypatch.setattr(EventBusService, "_get_household_ids", fail)
+    monkeypatch.setattr(AppriseEventListener, "get_notifier_urls", fail)
+    dispatch()
@@ -0,0 +1,77 @@
+import shutil
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from mealie.services.recipe.image_processor import ImageProcessor, minify_image, process_image
+from mealie.services.recipe.recipe_data_service import RecipeDataService
+from tests import data as test_data
+
+
+@pytest.fixture()
+def processor():
+    processor = ImageProcessor(workers=1, queue_size=1)
+    yield processor
+    processor.shutdown()
+
+
+@pytest.fixture()
+def image(tmp_path: Path) -> Path:
+    image = tmp_path / "original.jpg"
+    shutil.copy(test_data.images_test_image_1, image)
+    return image
+
+
+def test_processor_minifies_in_background(processor: ImageProcessor, image: Path):
+    done = threading.Event()
+
+    assert processor.submit(minify_image, image, on_done=done.set)
+    assert done.wait(timeout=60)
+
+    assert {path.name for path in image.parent.iterdir()} == {
+        "original.webp",
+        "min-original.webp",
+        "tiny-original.webp",
+    }
+
+
+def test_processor_queue_is_bounded(processor: ImageProcessor):
+    done = threading.Event()
+
+    assert processor.submit(time.sleep, 1, on_done=done.set)
+    assert not processor.submit(time.sleep, 1)
+
+    # the queue has room again once the image is processed
+    assert done.wait(timeout=60)
+    assert processor.submit(len, "abc")
+
+
+def test_process_image_runs_inline_without_processor(image: Path):
+    done = threading.Event()
+
+    # images are processed in the request when testing, so they're ready as soon as the call returns
+    process_image(minify_image, image, on_done=done.set)
+
+    assert done.is_set()
+    assert image.parent.joinpath("min-original.webp").exists()
+
+
+@pytest.mark.asyncio
+async def test_scrape_image_processes_off_the_event_loop(monkeypatch: pytest.MonkeyPatch):
+    threads: list[threading.Thread] = []
+
+    async def fetch_image(*_) -> tuple[bytes, str]:
+        return test_data.images_test_image_1.read_bytes(), "jpg"
+
+    def write_image_in_background(*_, **__) -> None:
+        threads.append(threading.current_thread())
+
+    monkeypatch.setattr(RecipeDataService, "fetch_image", fetch_image)
+    monkeypatch.setattr(RecipeDataService, "write_image_in_background", write_image_in_background)
+
+    # the image may be minified inline when the processor is busy, which mustn't happen on the event loop
+    await RecipeDataService(uuid4()).scrape_image("https://example.com/image.jpg")
+    assert threads and threads[0] is not threading.main_thread()
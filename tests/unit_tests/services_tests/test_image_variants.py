@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from mealie.pkgs import img
+from mealie.services.recipe.image_variants import ImageVariantFormat, get_image_variant, variant_width
+
+
+@pytest.fixture()
+def image(tmp_path: Path) -> Path:
+    image = tmp_path / "original.webp"
+    Image.new("RGB", (1200, 800), (200, 120, 40)).save(image, "WEBP")
+    return image
+
+
+@pytest.fixture()
+def variant_dir(tmp_path: Path) -> Path:
+    return tmp_path / "variants"
+
+
+@pytest.mark.parametrize(
+    "width, expected",
+    [
+        (1, 160),
+        (160, 160),
+        (300, 320),
+        (1000, 1280),
+        (5000, 1920),
+    ],
+)
+def test_variant_width_rounds_up(width: int, expected: int):
+    assert variant_width(width) == expected
+
+
+def test_variant_is_resized_and_cached(image: Path, variant_dir: Path):
+    variant = get_image_variant(image, variant_dir, "original", width=300)
+
+    assert variant.parent == variant_dir
+    assert Image.open(variant).size == (320, 213)
+
+    # the cached variant is served as is
+    mtime = variant.stat().st_mtime_ns
+    assert get_image_variant(image, variant_dir, "original", width=320) == variant
+    assert variant.stat().st_mtime_ns == mtime
+
+
+def test_variant_isnt_enlarged(image: Path, variant_dir: Path):
+    assert get_image_variant(image, variant_dir, "original") == image
+    assert get_image_variant(image, variant_dir, "original", width=1920) == image
+    assert not variant_dir.exists()
+
+
+@pytest.mark.skipif(not img.is_supported(img.AVIF), reason="Pillow can't encode AVIF")
+def test_variant_converts_to_avif(image: Path, variant_dir: Path):
+    variant = get_image_variant(image, variant_dir, "original", width=640, variant_format=ImageVariantFormat.avif)
+
+    assert variant.suffix == ".avif"
+    with Image.open(variant) as converted:
+        assert converted.format == "AVIF"
+        assert converted.size == (640, 427)
+
+
+def test_new_image_replaces_stale_variant(image: Path, variant_dir: Path):
+    stale = get_image_variant(image, variant_dir, "original", width=160)
+
+    stat = image.stat()
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    variant = get_image_variant(image, variant_dir, "original", width=160)
+
+    assert variant != stale
+    assert not stale.exists()
+    assert [path.name for path in variant_dir.iterdir()] == [variant.name]
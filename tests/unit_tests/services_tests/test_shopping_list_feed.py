@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+from uuid import uuid4
+
+import pytest
+
+from mealie.routes.households.controller_shopping_lists import publish_list_item_events
+from mealie.schema.household.group_shopping_list import (
+    ShoppingListChange,
+    ShoppingListChangeType,
+    ShoppingListItemOut,
+    ShoppingListItemsCollectionOut,
+)
+from mealie.services.household_services.shopping_list_feed import ShoppingListFeed, get_shopping_list_feed
+from tests.utils.factories import random_string
+
+
+def item_factory(shopping_list_id) -> ShoppingListItemOut:
+    return ShoppingListItemOut(
+        id=uuid4(),
+        shopping_list_id=shopping_list_id,
+        group_id=uuid4(),
+        household_id=uuid4(),
+        note=random_string(),
+    )
+
+
+async def read_events(feed: ShoppingListFeed, shopping_list_id, count: int, publish) -> list[tuple[str, str]]:
+    """Subscribes to the feed, calls `publish` once it's live, and returns the next `count` events"""
+    stream = feed.stream(shopping_list_id)
+    events: list[tuple[str, str]] = []
+    try:
+        assert (await anext(stream)).startswith("event: ready")
+        publish()
+
+        while len(events) < count:
+            message = await asyncio.wait_for(anext(stream), timeout=5)
+            if message.startswith(":"):
+                continue
+
+            event, data = message.strip().split("\n")
+            events.append((event.removeprefix("event: "), data.removeprefix("data: ")))
+    finally:
+        await stream.aclose()
+
+    return events
+
+
+@pytest.mark.asyncio
+async def test_feed_streams_changes_for_subscribed_list():
+    feed = ShoppingListFeed()
+    shopping_list_id = uuid4()
+    other_list_id = uuid4()
+    items = [item_factory(shopping_list_id) for _ in range(2)]
+
+    def publish():
+        feed.publish(ShoppingListChange(shopping_list_id=other_list_id, type=ShoppingListChangeType.updated))
+        feed.publish(
+            ShoppingListChange(shopping_list_id=shopping_list_id, type=ShoppingListChangeType.created, items=items)
+        )
+
+    [(event, data)] = await read_events(feed, shopping_list_id, 1, publish)
+
+    assert event == "change"
+    change = json.loads(data)
+    assert change["shoppingListId"] == str(shopping_list_id)
+    assert change["type"] == ShoppingListChangeType.created.value
+    assert [item["id"] for item in change["items"]] == [str(item.id) for item in items]
+
+    # subscribers are removed once the client disconnects
+    assert feed.subscriber_count(shopping_list_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_feed_accepts_changes_from_other_threads():
+    feed = ShoppingListFeed()
+    shopping_list_id = uuid4()
+
+    def publish():
+        thread = threading.Thread(
+            target=feed.publish,
+            args=(ShoppingListChange(shopping_list_id=shopping_list_id, type=ShoppingListChangeType.deleted),),
+        )
+        thread.start()
+        thread.join()
+
+    [(event, data)] = await read_events(feed, shopping_list_id, 1, publish)
+    assert event == "change"
+    assert json.loads(data)["type"] == ShoppingListChangeType.deleted.value
+
+
+@pytest.mark.asyncio
+async def test_feed_resets_slow_subscribers():
+    feed = ShoppingListFeed(max_pending=2)
+    shopping_list_id = uuid4()
+
+    def publish():
+        for _ in range(5):
+            feed.publish(ShoppingListChange(shopping_list_id=shopping_list_id, type=ShoppingListChangeType.updated))
+
+    [(event, _)] = await read_events(feed, shopping_list_id, 1, publish)
+    assert event == "reset"
+
+
+@pytest.mark.asyncio
+async def test_feed_sends_heartbeats():
+    feed = ShoppingListFeed(heartbeat_interval=0.01)
+
+    stream = feed.stream(uuid4())
+    try:
+        await anext(stream)
+        assert await anext(stream) == ": keep-alive\n\n"
+    finally:
+        await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_publish_list_item_events_feeds_subscribers():
+    feed = get_shopping_list_feed()
+    shopping_list_id = uuid4()
+    collection = ShoppingListItemsCollectionOut(
+        created_items=[item_factory(shopping_list_id)],
+        updated_items=[item_factory(shopping_list_id)],
+        deleted_items=[item_factory(shopping_list_id)],
+    )
+
+    events = await read_events(
+        feed, shopping_list_id, 3, lambda: publish_list_item_events(lambda *args, **kwargs: None, collection)
+    )
+
+    changes = [json.loads(data) for _, data in events]
+    assert [change["type"] for change in changes] == ["created", "updated", "deleted"]
+    assert changes[0]["items"][0]["id"] == str(collection.created_items[0].id)
+    assert changes[2]["items"][0]["id"] == str(collection.deleted_items[0].id)
+
+
+@pytest.mark.asyncio
+async def test_feed_tells_clients_if_it_is_complete():
+    async def ready_event(feed: ShoppingListFeed) -> dict:
+        stream = feed.stream(uuid4())
+        try:
+            event, data = (await anext(stream)).strip().split("\n")
+        finally:
+            await stream.aclose()
+
+        assert event == "event: ready"
+        return json.loads(data.removeprefix("data: "))
+
+    assert await ready_event(ShoppingListFeed()) == {"complete": True}
+
+    # other workers' changes never reach this process, so clients have to keep polling
+    assert await ready_event(ShoppingListFeed(complete=False)) == {"complete": False}
@@ -7,6 +7,8 @@ admin_about_check = "/api/admin/about/check"
 """`/api/admin/about/check`"""
 admin_about_statistics = "/api/admin/about/statistics"
 """`/api/admin/about/statistics`"""
+admin_about_statistics_hasher = "/api/admin/about/statistics/hasher"
+"""`/api/admin/about/statistics/hasher`"""
 admin_backups = "/api/admin/backups"
 """`/api/admin/backups`"""
 admin_backups_upload = "/api/admin/backups/upload"
@@ -15,6 +17,10 @@ admin_debug_openai = "/api/admin/debug/openai"
 """`/api/admin/debug/openai`"""
 admin_email = "/api/admin/email"
 """`/api/admin/email`"""
+admin_events_outbox = "/api/admin/events/outbox"
+"""`/api/admin/events/outbox`"""
+admin_events_outbox_entries = "/api/admin/events/outbox/entries"
+"""`/api/admin/events/outbox/entries`"""
 admin_groups = "/api/admin/groups"
 """`/api/admin/groups`"""
 admin_households = "/api/admin/households"
@@ -29,6 +35,8 @@ admin_maintenance_clean_temp = "/api/admin/maintenance/clean/temp"
 """`/api/admin/maintenance/clean/temp`"""
 admin_maintenance_storage = "/api/admin/maintenance/storage"
 """`/api/admin/maintenance/storage`"""
+admin_scheduler_jobs = "/api/admin/scheduler/jobs"
+"""`/api/admin/scheduler/jobs`"""
 admin_users = "/api/admin/users"
 """`/api/admin/users`"""
 admin_users_password_reset_token = "/api/admin/users/password-reset-token"
@@ -213,6 +221,11 @@ def admin_backups_file_name_restore(file_name):
     return f"{prefix}/admin/backups/{file_name}/restore"
 
 
+def admin_events_outbox_item_id_retry(item_id):
+    """`/api/admin/events/outbox/{item_id}/retry`"""
+    return f"{prefix}/admin/events/outbox/{item_id}/retry"
+
+
 def admin_groups_item_id(item_id):
     """`/api/admin/groups/{item_id}`"""
     return f"{prefix}/admin/groups/{item_id}"
@@ -223,6 +236,11 @@ def admin_households_item_id(item_id):
     return f"{prefix}/admin/households/{item_id}"
 
 
+def admin_scheduler_jobs_name_runs(name):
+    """`/api/admin/scheduler/jobs/{name}/runs`"""
+    return f"{prefix}/admin/scheduler/jobs/{name}/runs"
+
+
 def admin_users_item_id(item_id):
     """`/api/admin/users/{item_id}`"""
     return f"{prefix}/admin/users/{item_id}"
@@ -383,6 +401,16 @@ def households_shopping_lists_item_id(item_id):
     return f"{prefix}/households/shopping/lists/{item_id}"
 
 
+def households_shopping_lists_item_id_changes(item_id):
+    """`/api/households/shopping/lists/{item_id}/changes`"""
+    return f"{prefix}/households/shopping/lists/{item_id}/changes"
+
+
+def households_shopping_lists_item_id_feed(item_id):
+    """`/api/households/shopping/lists/{item_id}/feed`"""
+    return f"{prefix}/households/shopping/lists/{item_id}/feed"
+
+
 def households_shopping_lists_item_id_label_settings(item_id):
     """`/api/households/shopping/lists/{item_id}/label-settings`"""
     return f"{prefix}/households/shopping/lists/{item_id}/label-settings"